@@ -0,0 +1,50 @@
+""" Benchmarks discovering new articles from the feed against the index page.
+
+Run from the project root:
+    python -m benchmarks.bench_feed_discovery
+"""
+
+import time
+from benchmarks.local_news_server import LocalNewsServer
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper
+
+NUM_ARTICLES = 50
+NUM_ROUNDS = 20
+
+
+def time_discovery(scrapper: TargetNewsScrapper) -> tuple:
+    """ Returns the seconds per poll, bytes per poll and links found.
+
+    Params:
+        scrapper: Scrapper discovering articles from its index url.
+    """
+    num_bytes = 0
+    start = time.perf_counter()
+    for _ in range(NUM_ROUNDS):
+        page = scrapper._get_page(scrapper.index_url)
+        num_bytes += len(page.content)
+        _, links, _ = scrapper._parse_headline_data(page.content)
+    seconds = (time.perf_counter() - start) / NUM_ROUNDS
+    return seconds, num_bytes / NUM_ROUNDS, links
+
+
+def main():
+    with LocalNewsServer(num_articles=NUM_ARTICLES, use_tls=False) as server:
+        index_scrapper = TargetNewsScrapper(website_url=server.url, scrapper_api_key="")
+        feed_scrapper = TargetNewsScrapper(
+            website_url=server.url,
+            scrapper_api_key="",
+            feed_url=server.url + "/feed.xml"
+        )
+        results = {}
+        for name, scrapper in [("index page", index_scrapper), ("feed", feed_scrapper)]:
+            seconds, num_bytes, results[name] = time_discovery(scrapper)
+            print(f"{name}\n"
+                  f"- ms per poll: {seconds * 1000:.2f}\n"
+                  f"- bytes per poll: {num_bytes:.0f}")
+            scrapper.close()
+    assert results["index page"] == results["feed"], "Feed and index page disagree"
+
+
+if __name__ == "__main__":
+    main()
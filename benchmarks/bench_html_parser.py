@@ -0,0 +1,53 @@
+""" Benchmarks parse throughput of each html parser backend.
+
+Run from the project root:
+    python -m benchmarks.bench_html_parser
+"""
+
+import time
+from benchmarks.local_news_server import build_index_page, build_article_page
+from news_scanner.news_scrapper.html_parser import PARSER_BACKENDS, get_html_parser
+
+NUM_INDEX_ARTICLES = 50
+NUM_ARTICLES = 50
+NUM_ROUNDS = 5
+
+
+def time_backend(backend: str, index_page: bytes, article_pages: list) -> tuple:
+    """ Returns the index and article pages parsed per second, and the output.
+
+    Params:
+        backend: Name of the parser backend.
+        index_page: Raw html of the index page.
+        article_pages: Raw html of each article page.
+    """
+    parser = get_html_parser(backend)
+    start = time.perf_counter()
+    for _ in range(NUM_ROUNDS):
+        entries = list(parser.iter_index(index_page))
+    index_rate = NUM_ROUNDS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(NUM_ROUNDS):
+        paragraphs = [parser.parse_article(page) for page in article_pages]
+    article_rate = NUM_ROUNDS * len(article_pages) / (time.perf_counter() - start)
+    return index_rate, article_rate, (entries, paragraphs)
+
+
+def main():
+    index_page = build_index_page(NUM_INDEX_ARTICLES)
+    article_pages = [build_article_page(str(i)) for i in range(NUM_ARTICLES)]
+    outputs = {}
+    for backend in PARSER_BACKENDS:
+        index_rate, article_rate, outputs[backend] = time_backend(
+            backend, index_page, article_pages
+        )
+        print(f"{backend}\n"
+              f"- index pages/s: {index_rate:.1f}\n"
+              f"- article pages/s: {article_rate:.1f}")
+    assert all(output == outputs["html.parser"] for output in outputs.values()), \
+        "Parser backends disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+""" Benchmarks full 'NewsScanner.scan_news' runs replayed from an http archive.
+
+Without arguments a scan of the local news site is recorded first. A scan
+of the real site can be recorded with the scanner's config and replayed
+later without network:
+    python -m benchmarks.bench_replay_scan --record archive.json.gz
+    python -m benchmarks.bench_replay_scan --archive archive.json.gz
+
+TD api calls are answered with placeholder stock data so runs only measure
+scrapping, processing and filtering.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+from unittest.mock import patch, MagicMock
+from benchmarks.local_news_server import LocalNewsServer
+from news_scanner.config import Config
+from news_scanner.news_scanner import NewsScanner
+from news_scanner.news_scrapper.http_archive import HttpArchiveConfig, RECORD
+from news_scanner.td_api.td_api_handle import StockData
+
+NUM_ARTICLES = 50
+NUM_SCANS = 5
+RECORDED_LATENCY = 0.05
+MODES = {
+    "single thread": {},
+    "multithreaded": {"multithreaded_on": True},
+    "asyncio": {"async_on": True},
+}
+
+
+def get_stock_data(tickers: List[str]) -> Dict[str, StockData]:
+    """ Returns placeholder stock data of each ticker. """
+    return {ticker: StockData() for ticker in tickers}
+
+
+def make_scanner(config: Config, archive_config: HttpArchiveConfig, **flags) -> NewsScanner:
+    """ Returns a scanner whose TD api calls are answered offline.
+
+    Params:
+        config: Config providing the news site url.
+        archive_config: Archive the scanner records to or replays.
+        flags: Scanner flags, ex: multithreaded_on.
+    """
+    td_api = MagicMock(get_stock_data=get_stock_data)
+    with patch("news_scanner.news_scanner.TDApiHandle", return_value=td_api):
+        return NewsScanner(config=config, http_archive_config=archive_config, **flags)
+
+
+def record(config: Config, path: Path):
+    """ Records a single scan of config's news site.
+
+    Params:
+        config: Config providing the news site url.
+        path: File the archive is saved to.
+    """
+    scanner = make_scanner(config, HttpArchiveConfig(path=path, mode=RECORD))
+    scanner.scan_news()
+    scanner.news_scrapper.close()
+    scanner.save_http_archive()
+
+
+def time_replays(config: Config, path: Path, flags: dict) -> List[float]:
+    """ Returns the runtime of each replayed scan.
+
+    Params:
+        config: Config providing the recorded news site url.
+        path: File of the archive.
+        flags: Scanner flags of the benchmarked mode.
+    """
+    runtimes = []
+    for _ in range(NUM_SCANS):
+        scanner = make_scanner(config, HttpArchiveConfig(path=path), **flags)
+        start = time.perf_counter()
+        scanner.scan_news()
+        runtimes.append(time.perf_counter() - start)
+        scanner.news_scrapper.close()
+    return runtimes
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--record", type=Path, help="Record the real site to a file.")
+    arg_parser.add_argument("--archive", type=Path, help="Replay a recorded file.")
+    args = arg_parser.parse_args()
+
+    config = Config()
+    if args.record:
+        record(config, args.record)
+        return
+
+    path = args.archive
+    if path is None:
+        path = Path(tempfile.mkdtemp()) / "archive.json.gz"
+        with LocalNewsServer(num_articles=NUM_ARTICLES, latency=RECORDED_LATENCY) as server:
+            config.website_url = server.url
+            record(config, path)
+
+    results = {}
+    for name, flags in MODES.items():
+        results[name] = time_replays(config, path, flags)
+    for name, runtimes in results.items():
+        print(f"{name}\n"
+              f"- median scan: {statistics.median(runtimes):.3f}s\n"
+              f"- min scan: {min(runtimes):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+""" Benchmarks scan latency with and without pooled keep-alive sessions.
+
+Run from the project root:
+    python -m benchmarks.bench_session_pool
+"""
+
+import statistics
+import time
+import requests
+from urllib.parse import urlencode
+from benchmarks.local_news_server import LocalNewsServer
+from news_scanner.news_scrapper.multithreaded_target_news_scrapper import MultiThreadedTargetNewsScrapper
+from news_scanner.news_scrapper.target_news_scrapper import PROXY_URL
+
+NUM_ARTICLES = 50
+NUM_SCANS = 5
+
+
+class BareRequestsScrapper(MultiThreadedTargetNewsScrapper):
+    """ Scrapper fetching with bare 'requests.get', one connection per fetch. """
+    def _request_page(
+        self,
+        link: str,
+        headers: dict = None,
+        proxy_on: bool = None
+    ) -> requests.Response:
+        if self.proxy_on if proxy_on is None else proxy_on:
+            params = {'api_key': self.scrapper_api_key, 'url': link}
+            return requests.get(PROXY_URL, params=urlencode(params), headers=headers)
+        return requests.get(url=link, headers=headers)
+
+
+def time_scans(scrapper_class: type, website_url: str) -> list:
+    """ Returns the runtime of each full scan, all articles being new.
+
+    Params:
+        scrapper_class: Scrapper class to benchmark.
+        website_url: Base url of the local news site.
+    """
+    scrapper = scrapper_class(website_url=website_url, scrapper_api_key="")
+    runtimes = []
+    for _ in range(NUM_SCANS):
+        scrapper.viewed_links.clear()
+        scrapper._index_digest = None
+        start = time.perf_counter()
+        results = scrapper.get_news()
+        runtimes.append(time.perf_counter() - start)
+        assert len(results) == NUM_ARTICLES
+    scrapper.close()
+    return runtimes
+
+
+def main():
+    with LocalNewsServer(num_articles=NUM_ARTICLES, use_tls=True) as server:
+        for name, scrapper_class in [
+            ("bare requests.get", BareRequestsScrapper),
+            ("pooled sessions", MultiThreadedTargetNewsScrapper),
+        ]:
+            runtimes = time_scans(scrapper_class, server.url)
+            print(f"{name}\n"
+                  f"- first scan: {runtimes[0]:.3f}s\n"
+                  f"- median scan: {statistics.median(runtimes):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+""" Local stand-in of the target news site used by the benchmarks.
+
+Serves a '/news' index page, an RSS feed of the same articles at
+'/feed.xml' and '/news/l_<i>' article pages with the same markup the
+scrapper expects, over HTTP/1.1 keep-alive and optionally TLS with
+a throwaway self-signed certificate.
+"""
+
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Tuple
+
+INDEX_PATH = "/news"
+FEED_PATH = "/feed.xml"
+ARTICLE_PATH = "/news/l_"
+START_DATE = datetime(2022, 10, 18)
+
+
+def build_index_page(num_articles: int) -> bytes:
+    """ Returns an index page listing 'num_articles' articles, latest first.
+
+    Params:
+        num_articles: Number of articles listed on the index page.
+    """
+    articles = []
+    for i in reversed(range(num_articles)):
+        publish_date = START_DATE + timedelta(minutes=i)
+        articles.append(
+            "<article>"
+            "<a href=\"not_target\">not_target</a>"
+            f"<a href=\"{ARTICLE_PATH}{i}\">h_{i}</a>"
+            f"<time>{publish_date.strftime('%b %d, %Y %I:%M %p')} UTC</time>"
+            "</article>"
+        )
+    page = "<html><div><section class=\"market-news__results\">" + \
+        "".join(articles) + "</section></div></html>"
+    return page.encode()
+
+
+def build_feed(num_articles: int) -> bytes:
+    """ Returns an RSS feed of the articles of the index page, latest first.
+
+    Params:
+        num_articles: Number of articles listed in the feed.
+    """
+    items = []
+    for i in reversed(range(num_articles)):
+        publish_date = START_DATE + timedelta(minutes=i)
+        items.append(
+            "<item>"
+            f"<title>h_{i}</title>"
+            f"<link>{ARTICLE_PATH}{i}</link>"
+            f"<pubDate>{publish_date.strftime('%a, %d %b %Y %H:%M:%S')} +0000</pubDate>"
+            "</item>"
+        )
+    feed = "<?xml version=\"1.0\"?><rss version=\"2.0\"><channel>" \
+        "<title>news</title>" + "".join(items) + "</channel></rss>"
+    return feed.encode()
+
+
+def build_article_page(article_id: str, num_paragraphs: int = 20) -> bytes:
+    """ Returns an article page containing a ticker code.
+
+    Params:
+        article_id: Id of the article used in its content.
+        num_paragraphs: Number of filler paragraphs in the article body.
+    """
+    ticker = "".join(chr(ord("A") + int(digit)) for digit in article_id)
+    paragraphs = [
+        f"<p class=\"mdc-article-paragraph\">Company {article_id} "
+        f"(NASDAQ:X{ticker}) announced results.</p>"
+    ]
+    paragraphs += [
+        "<p class=\"mdc-article-paragraph\">" + "lorem ipsum " * 40 + "</p>"
+    ] * num_paragraphs
+    page = "<html><head><title>article</title></head><body>" \
+        "<nav>" + "<a href=\"#\">menu</a>" * 100 + "</nav>" \
+        "<div class=\"mdc-article-body\">" + "".join(paragraphs) + \
+        "</div></body></html>"
+    return page.encode()
+
+
+class _NewsRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        if self.path == INDEX_PATH:
+            body = server.index_page
+        elif self.path == FEED_PATH:
+            body = server.feed
+        elif self.path.startswith(ARTICLE_PATH):
+            body = build_article_page(self.path[len(ARTICLE_PATH):])
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalNewsServer:
+    """ Threaded local news site, usable as a context manager.
+
+    Attrs:
+        url: Base url of the running server.
+    """
+    def __init__(
+        self,
+        num_articles: int = 50,
+        latency: float = 0.0,
+        use_tls: bool = True
+    ):
+        """
+        Params:
+            num_articles: Number of articles listed on the index page.
+            latency: Seconds each response is delayed by.
+            use_tls: Determines if the server is served over https.
+        """
+        self._server = ThreadingHTTPServer(("localhost", 0), _NewsRequestHandler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.index_page = build_index_page(num_articles)
+        self._server.feed = build_feed(num_articles)
+        self._tmp_dir = None
+        self.ca_file = None
+        scheme = "http"
+        if use_tls:
+            self._tmp_dir = tempfile.TemporaryDirectory()
+            cert_file, key_file = _make_self_signed_cert(Path(self._tmp_dir.name))
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(cert_file, key_file)
+            self._server.socket = context.wrap_socket(
+                self._server.socket, server_side=True
+            )
+            self.ca_file = str(cert_file)
+            scheme = "https"
+        self.url = f"{scheme}://localhost:{self._server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    def __enter__(self) -> "LocalNewsServer":
+        self._thread.start()
+        if self.ca_file:
+            os.environ["REQUESTS_CA_BUNDLE"] = self.ca_file
+            os.environ["SSL_CERT_FILE"] = self.ca_file
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._tmp_dir:
+            os.environ.pop("REQUESTS_CA_BUNDLE", None)
+            os.environ.pop("SSL_CERT_FILE", None)
+            self._tmp_dir.cleanup()
+
+
+def _make_self_signed_cert(directory: Path) -> Tuple[Path, Path]:
+    """ Returns paths to a self-signed certificate and key for localhost.
+
+    Params:
+        directory: Directory to write the certificate and key to.
+    """
+    cert_file = directory / "cert.pem"
+    key_file = directory / "key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", str(key_file), "-out", str(cert_file), "-days", "1",
+            "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost"
+        ],
+        check=True,
+        capture_output=True
+    )
+    return cert_file, key_file
@@ -0,0 +1,206 @@
+""" Streaming pipeline moving each article through the scan stages.
+
+Each stage runs in its own thread and hands items to the next stage through
+a bounded queue, so an article is processed, looked up, filtered and
+published as soon as its content is scrapped instead of waiting for the
+whole batch.
+"""
+
+import queue
+import threading
+from typing import Callable, List, Optional, Tuple, Any
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper, ScrappedNewsResult
+from news_scanner.news_scrapper.article_processor import process_articles
+from news_scanner.news_scrapper.near_duplicate import NearDuplicateIndex
+from news_scanner.news_scrapper.filter.article_filter import ArticleFilter
+from news_scanner.td_api.td_api_handle import TDApiHandle
+from news_scanner.stock_data_prefetcher import StockDataPrefetcher
+from news_scanner.result_object import NewsReport, NameData
+from news_scanner.logger.logger import logger
+
+DEFAULT_QUEUE_SIZE = 10
+_DONE = object()
+
+
+class StreamingNewsPipeline:
+    """ Runs one scan as the stages scrape -> process -> stock lookup -> filter
+    -> publish, connected by bounded queues.
+
+    Attrs:
+        num_processed: Number of articles of the last run that referred to a
+            single stock on an allowed exchange, without skipped near
+            duplicates.
+    """
+    def __init__(
+        self,
+        news_scrapper: TargetNewsScrapper,
+        td_api: TDApiHandle,
+        article_filter: ArticleFilter,
+        publish: Callable[[NewsReport], None],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        near_duplicate_index: NearDuplicateIndex = None,
+        stock_data_prefetcher: StockDataPrefetcher = None
+    ):
+        """
+        Params:
+            news_scrapper: Scrapper yielding articles through 'iter_news'.
+            td_api: Handle used to look up stock data per article.
+            article_filter: Filter deciding which reports are published.
+            publish: Called with each accepted report as soon as it is ready.
+            queue_size: Max number of items waiting between two stages.
+            near_duplicate_index: Enables skipping processed articles that
+                are near duplicates of recent articles.
+            stock_data_prefetcher: Enables reusing stock data prefetched
+                from headline tickers.
+        """
+        self.news_scrapper = news_scrapper
+        self.td_api = td_api
+        self.article_filter = article_filter
+        self.publish = publish
+        self.queue_size = queue_size
+        self.near_duplicate_index = near_duplicate_index
+        self.stock_data_prefetcher = stock_data_prefetcher
+        self.num_processed = 0
+
+    def run(self) -> Tuple[List[ScrappedNewsResult], List[NewsReport]]:
+        """ Runs a scan and returns the scrapped articles and published reports.
+
+        The first error raised by a stage is re-raised once all stages stop.
+        """
+        self.num_processed = 0
+        news_results = []
+        news_reports = []
+        errors = []
+
+        def scrape(_) -> None:
+            for result in self.news_scrapper.iter_news():
+                news_results.append(result)
+                scraped.put(result)
+
+        def publish(news_report: NewsReport) -> None:
+            self.publish(news_report)
+            news_reports.append(news_report)
+
+        scraped = queue.Queue(maxsize=self.queue_size)
+        processed = queue.Queue(maxsize=self.queue_size)
+        looked_up = queue.Queue(maxsize=self.queue_size)
+        accepted = queue.Queue(maxsize=self.queue_size)
+        stages = [
+            (scrape, None, scraped),
+            (self._process, scraped, processed),
+            (self._look_up, processed, looked_up),
+            (self._filter, looked_up, accepted),
+        ]
+        threads = [
+            threading.Thread(
+                target=_run_stage,
+                args=(func, in_queue, out_queue, errors),
+                name=f"pipeline_{func.__name__.strip('_')}"
+            )
+            for func, in_queue, out_queue in stages
+        ]
+        for thread in threads:
+            thread.start()
+        _run_stage(publish, accepted, None, errors)
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+        return news_results, news_reports
+
+    def _process(
+        self,
+        scrape_result: ScrappedNewsResult
+    ) -> Optional[Tuple[Any, ScrappedNewsResult, str, str]]:
+        """ Returns the processed article, or None if it is not accepted or
+        is a skipped near duplicate.
+
+        Param:
+            scrape_result: Scrapped article.
+        """
+        processed_results, scrape_results, tickers, exchanges = \
+            process_articles([scrape_result])
+        if not processed_results:
+            return None
+        if self.near_duplicate_index is not None and \
+                self.near_duplicate_index.should_skip(scrape_results[0]):
+            return None
+        self.num_processed += 1
+        return processed_results[0], scrape_results[0], tickers[0], exchanges[0]
+
+    def _look_up(self, processed: Tuple[Any, ScrappedNewsResult, str, str]) -> NewsReport:
+        """ Returns the report of a processed article with its stock data.
+
+        Param:
+            processed: Processed article, article, ticker and exchange.
+        """
+        processed_result, scrape_result, ticker, exchange = processed
+        if self.stock_data_prefetcher is not None:
+            stock_data = self.stock_data_prefetcher.get_stock_data([ticker])
+        else:
+            stock_data = self.td_api.get_stock_data([ticker])
+        return NewsReport(
+            nameData=NameData(
+                ticker=ticker,
+                exchange=exchange
+            ),
+            scrappedNewsResults=scrape_result,
+            processedNewsResults=processed_result,
+            stockData=stock_data[ticker]
+        )
+
+    def _filter(self, news_report: NewsReport) -> Optional[NewsReport]:
+        """ Returns the report if it is accepted by the article filter.
+
+        Param:
+            news_report: Report to filter.
+        """
+        if self.article_filter.within_filter(news_report):
+            return news_report
+        return None
+
+
+def _run_stage(
+    func: Callable,
+    in_queue: Optional[queue.Queue],
+    out_queue: Optional[queue.Queue],
+    errors: List[Exception]
+):
+    """ Applies func to each item of in_queue and forwards non None results.
+
+    A stage without in_queue is the source and is called once. After an
+    error the stage keeps draining in_queue so upstream stages never block.
+
+    Params:
+        func: Stage function.
+        in_queue: Queue of items to consume, ended by a done marker.
+        out_queue: Queue receiving the stage results.
+        errors: Shared list collecting errors raised by stages.
+    """
+    failed = False
+    try:
+        if in_queue is None:
+            func(None)
+        else:
+            while True:
+                item = in_queue.get()
+                if item is _DONE:
+                    break
+                if failed:
+                    continue
+                try:
+                    result = func(item)
+                except Exception as e:
+                    logger.error(f"Pipeline stage '{func.__name__}' failed: {e}")
+                    errors.append(e)
+                    failed = True
+                    continue
+                if result is not None and out_queue is not None:
+                    out_queue.put(result)
+    except Exception as e:
+        logger.error(f"Pipeline stage '{func.__name__}' failed: {e}")
+        errors.append(e)
+    finally:
+        if out_queue is not None:
+            out_queue.put(_DONE)
@@ -1,17 +1,48 @@
 """ Main module to orchestrate system flow.
 
 Note:
-    - Latest article of a scan is always read first.
+    - Latest article of a scan is read first, or the highest scored
+      headline when headline_priority_config is set.
 """
 
 import time
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, List, Tuple, Dict
 import warnings
 from pathlib import Path
-from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper
+from news_scanner.news_scrapper.target_news_scrapper import (
+    TargetNewsScrapper,
+    ScrappedNewsResult,
+    HEDGE_MAX_WORKERS
+)
 from news_scanner.news_scrapper.multithreaded_target_news_scrapper import MultiThreadedTargetNewsScrapper
+from news_scanner.news_scrapper.async_target_news_scrapper import AsyncTargetNewsScrapper
+from news_scanner.news_scrapper.concurrency_controller import ConcurrencyConfig
+from news_scanner.news_scrapper.rate_limiter import HostRateLimiter, RateLimitConfig
+from news_scanner.news_scrapper.resilience import ResilienceConfig
+from news_scanner.news_scrapper.hedging import HedgeConfig
+from news_scanner.news_scrapper.html_parser import DEFAULT_PARSER_BACKEND
+from news_scanner.news_scrapper.parse_pool import ParsePool, ParsePoolConfig
+from news_scanner.news_scrapper.page_cache import PageCacheConfig
+from news_scanner.news_scrapper.catch_up import CatchUpConfig
+from news_scanner.news_scrapper.seen_links import SeenLinkConfig
+from news_scanner.news_scrapper.seen_link_index import SeenLinkIndexConfig
+from news_scanner.news_scrapper.headline_classifier import HeadlinePriorityConfig
+from news_scanner.stock_data_prefetcher import StockDataPrefetcher, StockDataPrefetchConfig
+from news_scanner.news_scrapper.http_archive import (
+    HttpArchiveConfig,
+    open_http_archive,
+    get_http_archive_transport,
+    RECORD
+)
+from news_scanner.news_scrapper.multi_source_news_scrapper import NewsSource, MultiSourceNewsScrapper
+from news_scanner.news_scrapper.near_duplicate import NearDuplicateConfig, NearDuplicateIndex
 from news_scanner.news_scrapper.article_processor import process_articles
-from news_scanner.td_api.td_api_handle import TDApiHandle
+from news_scanner.news_pipeline import StreamingNewsPipeline
+from news_scanner.poll_scheduler import PollScheduler, PollScheduleConfig
+from news_scanner.warm_up import WarmUpConfig, WarmUpSchedule
+from news_scanner.news_scrapper.dns_cache import DnsCache
+from news_scanner.td_api.td_api_handle import TDApiHandle, StockData
 from news_scanner.logger.logger import logger
 from news_scanner.twitter_handle.twitter_handle import TwitterHandle
 from news_scanner.database.database_handles.power_switch_handle import PowerSwitchHandle
@@ -22,6 +53,10 @@ from news_scanner.news_scrapper.filter.article_filter import ArticleFilter, Filt
 from news_scanner.output_display_util import output_run_report
 from news_scanner.database.table_handles.base_table_handle import DB_DIR
 
+DEFAULT_SOURCE_NAME = "default"
+# max seconds between power switch checks while waiting for the next scan
+POWER_CHECK_INTERVAL = 5.0
+
 
 class NewsScanner:
     """ Class to scrape, store and alert on stock news. """
@@ -32,6 +67,27 @@ class NewsScanner:
         twitter_on: bool = False,
         database_on: bool = False,
         multithreaded_on: bool = False,
+        async_on: bool = False,
+        streaming_on: bool = False,
+        num_threads: int = 5,
+        concurrency_config: ConcurrencyConfig = None,
+        rate_limit_config: RateLimitConfig = None,
+        resilience_config: ResilienceConfig = ResilienceConfig(),
+        hedge_config: HedgeConfig = None,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        max_look_back: int = None,
+        parse_pool_config: ParsePoolConfig = None,
+        page_cache_config: PageCacheConfig = None,
+        http_archive_config: HttpArchiveConfig = None,
+        near_duplicate_config: NearDuplicateConfig = None,
+        news_sources: List[NewsSource] = None,
+        poll_schedule_config: PollScheduleConfig = None,
+        warm_up_config: WarmUpConfig = None,
+        catch_up_config: CatchUpConfig = None,
+        seen_link_config: SeenLinkConfig = SeenLinkConfig(),
+        seen_link_index_config: SeenLinkIndexConfig = None,
+        headline_priority_config: HeadlinePriorityConfig = None,
+        stock_data_prefetch_config: StockDataPrefetchConfig = None,
         keep_alive: Union[bool, int] = 1,
         ignore_warnings: bool = False,
         config: Config = Config(),  # None,
@@ -46,6 +102,72 @@ class NewsScanner:
             twitter_on: Determines is alerts should be sent to twitter.
             database_on:
             multithreaded_on:
+            async_on: Determines if articles are scrapped by the asyncio
+                scrapper. Takes precedence over multithreaded_on.
+            streaming_on: Determines if each article is processed, looked up,
+                filtered and published as soon as it is scrapped instead of
+                once the whole scan is scrapped.
+            num_threads: Number of articles the multithreaded or asyncio
+                scrapper fetches at once.
+            concurrency_config: Enables adaptive concurrency for the
+                multithreaded or asyncio scrapper, raising and lowering the
+                fetches in flight within the config's floor and ceiling
+                from observed latency, errors and 429s.
+            rate_limit_config: Enables a token bucket rate limit of fetches
+                per host, the proxy host being limited on its own.
+            resilience_config: Timeouts, retries with backoff and per host
+                circuit breaking of fetches.
+            hedge_config: Enables hedging of article fetches, a fetch slower
+                than a percentile of recent fetches gets a duplicate request.
+                The asyncio scrapper takes the first response, threaded ones
+                take the duplicate's if the fetch fails.
+            parser_backend: Html parser backend of scrapped pages, "lxml",
+                "strainer" (html.parser building only the scrapped section)
+                or "html.parser". "lxml" needs the lxml extra and falls back
+                to "html.parser" without it.
+            max_look_back: Max number of index page entries read per scan,
+                entries beyond it are never scrapped. Reading always stops
+                at the latest viewed link.
+            parse_pool_config: Enables parsing article pages in a pool of
+                worker processes, one per core by default, while threads or
+                tasks only download pages. Sources share the pool.
+            page_cache_config: Enables a compressed on-disk cache of fetched
+                pages, under the databases dir by default, so pages are not
+                downloaded again after a restart. Index pages are cached for
+                seconds and articles for days.
+            http_archive_config: Records every http response of the
+                scrapper to an archive file, saved once the scanner stops,
+                or replays an archive with its recorded latency instead of
+                using the network.
+            near_duplicate_config: Enables SimHash fingerprinting of
+                processed articles, an article whose body is within a
+                Hamming distance of a recent article is skipped before the
+                stock lookup, or only logged.
+            news_sources: News sites scanned concurrently, each with its own
+                page selectors and viewed links, their articles merged into
+                one stream. Defaults to the config's website url. With
+                several sources the page cache is split per source.
+            poll_schedule_config: Enables pacing of scans by 'run', the
+                interval to the next scan is chosen from the market session
+                and the recent rate of new articles. Scans run back to back
+                by default.
+            warm_up_config: Enables caching dns resolutions and warming up
+                connections to the news site or proxy and the TD api at set
+                market times, while 'run' waits for the next scan.
+            catch_up_config: Enables reading later index pages, a few at
+                once, when every entry of the first page is new so articles
+                pushed off it after downtime or a burst are not missed.
+            seen_link_config: Max number and age of the viewed links each
+                scrapper keeps, bounding memory of long running scans.
+            seen_link_index_config: Enables an on-disk index of seen link
+                hashes, so articles scrapped before a restart are not
+                scrapped, stored and posted again.
+            headline_priority_config: Enables fetching new articles by the
+                score of their headline, ex: tickers and keywords like "FDA
+                approval", so likely actionable articles are alerted first.
+            stock_data_prefetch_config: Enables requesting the stock data of
+                tickers named in headlines once the index is read, reused
+                when the article body confirms the ticker.
             keep_alive: Indicates how many iterations the news scanner should
                 scrape for news. Passing bool 'True' causes the scanner to run
                 until it is manually shut off. Passing an int causes the scanner
@@ -60,28 +182,124 @@ class NewsScanner:
         #     config = Config()
         self.article_filter = ArticleFilter(filter_criteria=filter_criteria)
         self.td_api = TDApiHandle(config=config.tda_config)
+        self.stock_data_prefetcher = None
+        on_new_headlines = None
+        if stock_data_prefetch_config is not None:
+            self.stock_data_prefetcher = StockDataPrefetcher(
+                td_api=self.td_api, config=stock_data_prefetch_config
+            )
+            on_new_headlines = self.stock_data_prefetcher.prefetch
+        self.near_duplicate_index = None
+        if near_duplicate_config is not None:
+            self.near_duplicate_index = NearDuplicateIndex(near_duplicate_config)
         if database_on:
             self.powerswitch_handle = PowerSwitchHandle(db_dir=database_dir)
             self.database_handle = NewsReportDatabaseHandle(db_dir=database_dir)
         if twitter_on:
             self.twitter_handle = TwitterHandle(config=config.twitter_config)
-        if multithreaded_on:
-            self.news_scrapper = MultiThreadedTargetNewsScrapper(
-                website_url=config.website_url,
+        rate_limiter = None
+        if rate_limit_config is not None:
+            rate_limiter = HostRateLimiter(default_config=rate_limit_config)
+        self.http_archive_config = http_archive_config
+        self.http_archive = None
+        adapter = None
+        if http_archive_config is not None:
+            self.http_archive, adapter, _ = open_http_archive(
+                http_archive_config
+            )
+        if news_sources is None:
+            news_sources = [NewsSource(name=DEFAULT_SOURCE_NAME, website_url=config.website_url)]
+        if len({source.name for source in news_sources}) != len(news_sources):
+            raise ValueError("News source names must be unique")
+        # parse processes and hedge threads are shared by every source
+        self.parse_pool = None
+        if parse_pool_config is not None:
+            self.parse_pool = ParsePool(config=parse_pool_config, backend=parser_backend)
+        self.hedge_executor = None
+        if hedge_config is not None and not async_on:
+            self.hedge_executor = ThreadPoolExecutor(
+                max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="hedge"
+            )
+        scrappers = {}
+        for source in news_sources:
+            source_page_cache_config = page_cache_config
+            if page_cache_config is not None and len(news_sources) > 1:
+                source_page_cache_config = page_cache_config._replace(
+                    cache_dir=Path(page_cache_config.cache_dir) / source.name
+                )
+            source_seen_link_index_config = seen_link_index_config
+            if seen_link_index_config is not None and len(news_sources) > 1:
+                source_seen_link_index_config = seen_link_index_config._replace(
+                    index_dir=Path(seen_link_index_config.index_dir) / source.name
+                )
+            scrapper_kwargs = dict(
+                website_url=source.website_url,
                 proxy_on=proxy_on,
                 scrapper_api_key=config.scrapper_api_key,
-                num_threads=5
+                rate_limiter=rate_limiter,
+                resilience_config=resilience_config,
+                hedge_config=hedge_config,
+                parser_backend=parser_backend,
+                max_look_back=max_look_back,
+                parse_pool=self.parse_pool,
+                page_cache_config=source_page_cache_config,
+                selectors=source.selectors,
+                index_path=source.index_path,
+                time_format=source.time_format,
+                feed_url=source.feed_url,
+                catch_up_config=catch_up_config,
+                seen_link_config=seen_link_config,
+                seen_link_index_config=source_seen_link_index_config,
+                headline_priority_config=headline_priority_config,
+                on_new_headlines=on_new_headlines
             )
+            if async_on:
+                source_transport = None
+                if self.http_archive is not None:
+                    source_transport = get_http_archive_transport(
+                        self.http_archive, http_archive_config
+                    )
+                scrappers[source.name] = AsyncTargetNewsScrapper(
+                    max_concurrency=num_threads,
+                    concurrency_config=concurrency_config,
+                    transport=source_transport,
+                    **scrapper_kwargs
+                )
+            elif multithreaded_on:
+                scrappers[source.name] = MultiThreadedTargetNewsScrapper(
+                    num_threads=num_threads,
+                    concurrency_config=concurrency_config,
+                    adapter=adapter,
+                    hedge_executor=self.hedge_executor,
+                    **scrapper_kwargs
+                )
+            else:
+                scrappers[source.name] = TargetNewsScrapper(
+                    adapter=adapter,
+                    hedge_executor=self.hedge_executor,
+                    **scrapper_kwargs
+                )
+        self.scrappers = scrappers
+        if len(scrappers) == 1:
+            self.news_scrapper = scrappers[news_sources[0].name]
         else:
-            self.news_scrapper = TargetNewsScrapper(
-                website_url=config.website_url,
-                proxy_on=proxy_on,
-                scrapper_api_key=config.scrapper_api_key
-            )
+            self.news_scrapper = MultiSourceNewsScrapper(scrappers)
         self.database_on = database_on
         self.twitter_on = twitter_on
         self.multithreaded_on = multithreaded_on
+        self.async_on = async_on
+        self.streaming_on = streaming_on
         self.keep_alive = keep_alive
+        self.poll_scheduler = None
+        if poll_schedule_config is not None:
+            self.poll_scheduler = PollScheduler(poll_schedule_config)
+        self.warm_up_config = warm_up_config
+        self.warm_up_schedule = None
+        self.dns_cache = None
+        if warm_up_config is not None:
+            self.warm_up_schedule = WarmUpSchedule(warm_up_config.times)
+            # installed while 'run' runs
+            self.dns_cache = DnsCache(ttl=warm_up_config.dns_ttl)
 
         if ignore_warnings:
             warnings.filterwarnings("ignore")
@@ -94,27 +312,136 @@ class NewsScanner:
                       f"- twitter_on: {self.twitter_on }\n"
                       f"- database_on: {self.database_on}\n"
                       f"- multithreaded_on: {self.multithreaded_on}\n"
+                      f"- async_on: {self.async_on}\n"
+                      f"- streaming_on: {self.streaming_on}\n"
+                      f"- adaptive_concurrency: {concurrency_config is not None}\n"
+                      f"- rate_limit: {rate_limit_config}\n"
+                      f"- hedging: {hedge_config}\n"
+                      f"- parser_backend: {self.news_scrapper.html_parser.name}\n"
+                      f"- max_look_back: {max_look_back}\n"
+                      f"- parse_pool: {parse_pool_config}\n"
+                      f"- page_cache: {page_cache_config}\n"
+                      f"- http_archive: {http_archive_config}\n"
+                      f"- near_duplicates: {near_duplicate_config}\n"
+                      f"- news_sources: {list(self.scrappers)}\n"
+                      f"- poll_schedule: {poll_schedule_config}\n"
+                      f"- warm_up: {warm_up_config}\n"
+                      f"- catch_up: {catch_up_config}\n"
+                      f"- seen_links: {seen_link_config}\n"
+                      f"- seen_link_index: {seen_link_index_config}\n"
+                      f"- headline_priority: {headline_priority_config}\n"
+                      f"- stock_data_prefetch: {stock_data_prefetch_config}\n"
                       f"- keep_alive: {self.keep_alive}\n")
 
     def run(self):
-        """ Main run method to run system. """
-        # run until manually shut off
-        if isinstance(self.keep_alive, bool) and self.keep_alive:
-            self.powerswitch_handle.set_power(True)
-            while self.powerswitch_handle.power_on():
-                self.scan_news()
-        # run set number of times
-        else:
-            for i in range(0, self.keep_alive):
-                self.scan_news()
+        """ Main run method to run system.
+
+        The scrapper's worker threads and connections are released once the
+        scanner is powered off or finishes its set number of scans, and the
+        http archive is saved when recording one. Scans are paced by the
+        poll scheduler when one is set. The dns cache of warm ups is only
+        installed while running.
+        """
+        if self.dns_cache is not None:
+            self.dns_cache.install()
+        try:
+            # run until manually shut off
+            if isinstance(self.keep_alive, bool) and self.keep_alive:
+                self.powerswitch_handle.set_power(True)
+                while self.powerswitch_handle.power_on():
+                    self._scan_paced(until_powered_off=True)
+            # run set number of times
+            else:
+                for i in range(0, self.keep_alive):
+                    self._scan_paced(last_scan=i == self.keep_alive - 1)
+        finally:
+            self.news_scrapper.close()
+            if self.parse_pool is not None:
+                self.parse_pool.close()
+            if self.hedge_executor is not None:
+                self.hedge_executor.shutdown(wait=False)
+            if self.stock_data_prefetcher is not None:
+                self.stock_data_prefetcher.close()
+            if self.dns_cache is not None:
+                self.dns_cache.uninstall()
+            self.save_http_archive()
+
+    def _scan_paced(self, last_scan: bool = False, until_powered_off: bool = False):
+        """ Scans news, then waits for the interval chosen by the poll
+        scheduler, measured from the start of the scan. Warm ups due while
+        waiting are run.
+
+        Without a poll scheduler scans follow each other, a warm up due is
+        run before the next scan.
+
+        Params:
+            last_scan: Determines if no scan follows, so nothing is waited.
+            until_powered_off: Determines if waiting stops once the power
+                switch is turned off.
+        """
+        self._warm_up_if_due()
+        start = time.time()
+        self.scan_news()
+        if self.poll_scheduler is None or last_scan:
+            return
+        self.poll_scheduler.record_scan(self.news_scrapper.num_new_links)
+        interval = self.poll_scheduler.next_interval()
+        wait = max(interval.seconds - (time.time() - start), 0)
+        print_and_log(f"Next scan in {wait:.1f}s\n"
+                      f"- session: {interval.session}\n"
+                      f"- interval: {interval.seconds:.1f}s\n"
+                      f"- reason: {interval.reason}\n")
+        deadline = time.time() + wait
+        while time.time() < deadline:
+            if until_powered_off and not self.powerswitch_handle.power_on():
+                return
+            self._warm_up_if_due()
+            time.sleep(max(min(POWER_CHECK_INTERVAL, deadline - time.time()), 0))
+
+    def _warm_up_if_due(self):
+        """ Warms up when a warm up time passed since the last check. """
+        if self.warm_up_schedule is not None and self.warm_up_schedule.is_due():
+            self.warm_up()
+
+    def warm_up(self):
+        """ Opens connections to the news sites or proxy and warms up the TD
+        api client, caching the dns resolutions on the way. """
+        start = time.time()
+        num_connections = sum(
+            scrapper.warm_up() for scrapper in self.scrappers.values()
+        )
+        refresh_td_token = self.warm_up_config is None or \
+            self.warm_up_config.refresh_td_token
+        td_api_warm = refresh_td_token and self.td_api.warm_up()
+        print_and_log(f"Warm up\n"
+                      f"- num_connections: {num_connections}\n"
+                      f"- td_api: {td_api_warm}\n"
+                      f"- runtime: {time.time() - start:.3f}s\n")
+
+    def save_http_archive(self):
+        """ Saves the recorded http responses when recording an archive. """
+        if self.http_archive_config is not None and \
+                self.http_archive_config.mode == RECORD:
+            self.http_archive.save(self.http_archive_config.path)
+            print_and_log(f"Saved {len(self.http_archive)} http responses to: "
+                          f"{self.http_archive_config.path}")
 
     def scan_news(self):
         """ Scans and processes news and outputs results. """
+        if self.streaming_on:
+            return self._stream_news()
+
         start = time.time()
         print_and_log("Getting news")
         news_results = self.news_scrapper.get_news()
+        if not self.news_scrapper.index_changed and not news_results:
+            print_and_log("News index unchanged, skipping scan\n")
+            return news_results, []
         print_and_log("Processing news")
         processed_results, scrape_results, tickers, exchanges = process_articles(news_results)
+        if self.near_duplicate_index is not None:
+            processed_results, scrape_results, tickers, exchanges = \
+                self._drop_near_duplicates(processed_results, scrape_results, tickers, exchanges)
 
         len_processed_results = len(processed_results)
         print_and_log(f"Processed results\n"
@@ -126,7 +453,7 @@ class NewsScanner:
         news_reports = []
         if tickers:
             print_and_log("Getting stock data for processed results")
-            stock_data = self.td_api.get_stock_data(tickers)
+            stock_data = self._get_stock_data(tickers)
             print_and_log("Filtering stocks")
             for (processed_result, scrape_result, ticker, exchange) in zip(
                     processed_results, scrape_results, tickers, exchanges
@@ -150,25 +477,164 @@ class NewsScanner:
                 news_reports=news_reports
             )
 
-            # post results to twitter
-            if self.twitter_on:
-                self.twitter_handle.publish_findings(news_reports)
-
-            # store to database
-            if self.database_on:
-                print("Inserting into Database")
-                self.database_handle.insert(news_reports)
+            self._publish(news_reports)
 
             # store to runtime memory
             if self.retain_results:
                 self.results.append(news_reports)
 
+        self._log_fetch_stats()
         end = time.time()
         print_and_log(f"Runtime: {end - start}\n")
 
         # return used for testing
         return news_results, news_reports
 
+    def _stream_news(self):
+        """ Scans news, publishing each accepted article once it is ready. """
+        start = time.time()
+        print_and_log("Streaming news")
+        pipeline = StreamingNewsPipeline(
+            news_scrapper=self.news_scrapper,
+            td_api=self.td_api,
+            article_filter=self.article_filter,
+            publish=lambda news_report: self._publish([news_report]),
+            near_duplicate_index=self.near_duplicate_index,
+            stock_data_prefetcher=self.stock_data_prefetcher
+        )
+        news_results, news_reports = pipeline.run()
+        if not self.news_scrapper.index_changed and not news_results:
+            print_and_log("News index unchanged, skipping scan\n")
+            return news_results, news_reports
+
+        print_and_log(f"Processed results\n"
+                      f"- num_links_found: {self.news_scrapper.num_links_found}\n"
+                      f"- num_links_accepted: {self.news_scrapper.num_new_links}\n"
+                      f"- num_links_processed: {pipeline.num_processed}")
+        if pipeline.num_processed:
+            output_run_report(
+                logger=logger,
+                len_processed_results=pipeline.num_processed,
+                news_reports=news_reports
+            )
+            if self.retain_results:
+                self.results.append(news_reports)
+
+        self._log_fetch_stats()
+        end = time.time()
+        print_and_log(f"Runtime: {end - start}\n")
+        return news_results, news_reports
+
+    def _drop_near_duplicates(
+        self,
+        processed_results: list,
+        scrape_results: List[ScrappedNewsResult],
+        tickers: List[str],
+        exchanges: List[str]
+    ) -> Tuple[list, List[ScrappedNewsResult], List[str], List[str]]:
+        """ Returns the processed articles without skipped near duplicates.
+
+        Params:
+            processed_results: Processed articles.
+            scrape_results: Scrapped articles of the processed articles.
+            tickers: Ticker of each processed article.
+            exchanges: Exchange of each processed article.
+        """
+        kept = [
+            processed for processed in zip(processed_results, scrape_results, tickers, exchanges)
+            if not self.near_duplicate_index.should_skip(processed[1])
+        ]
+        if not kept:
+            return [], [], [], []
+        return tuple(list(values) for values in zip(*kept))
+
+    def _get_stock_data(self, tickers: List[str]) -> Dict[str, StockData]:
+        """ Returns the stock data of tickers, reusing prefetched data when
+        a prefetcher is set.
+
+        Param:
+            tickers: Tickers of the processed articles.
+        """
+        if self.stock_data_prefetcher is not None:
+            return self.stock_data_prefetcher.get_stock_data(tickers)
+        return self.td_api.get_stock_data(tickers)
+
+    def _log_fetch_stats(self):
+        """ Logs how fetching was throttled since the scanner started. """
+        rate_limiter = self.news_scrapper.rate_limiter
+        if rate_limiter is not None:
+            for host, stats in rate_limiter.stats().items():
+                print_and_log(f"Rate limit waits: {host}\n"
+                              f"- num_requests: {stats.num_requests}\n"
+                              f"- num_waited: {stats.num_waited}\n"
+                              f"- total_wait: {stats.total_wait:.3f}s\n"
+                              f"- max_wait: {stats.max_wait:.3f}s")
+        for name, scrapper in self.scrappers.items():
+            source = f": {name}" if len(self.scrappers) > 1 else ""
+            hedger = scrapper.hedger
+            if hedger is not None:
+                stats = hedger.stats()
+                print_and_log(f"Hedged fetches{source}\n"
+                              f"- num_requests: {stats.num_requests}\n"
+                              f"- num_hedges: {stats.num_hedges}\n"
+                              f"- num_hedge_wins: {stats.num_hedge_wins}\n"
+                              f"- hedge_ratio: {stats.hedge_ratio:.3f}")
+            page_cache = scrapper.page_cache
+            if page_cache is not None:
+                stats = page_cache.stats()
+                print_and_log(f"Page cache{source}\n"
+                              f"- hits: {stats.hits}\n"
+                              f"- misses: {stats.misses}\n"
+                              f"- evictions: {stats.evictions}\n"
+                              f"- num_pages: {stats.num_pages}\n"
+                              f"- size_bytes: {stats.size_bytes}")
+            stats = scrapper.viewed_links.stats()
+            print_and_log(f"Seen links{source}\n"
+                          f"- num_entries: {stats.num_entries}\n"
+                          f"- num_added: {stats.num_added}\n"
+                          f"- num_expired: {stats.num_expired}\n"
+                          f"- num_evicted: {stats.num_evicted}")
+            seen_link_index = scrapper.seen_link_index
+            if seen_link_index is not None:
+                stats = seen_link_index.stats()
+                print_and_log(f"Seen link index{source}\n"
+                              f"- num_links: {stats.num_links}\n"
+                              f"- num_lookups: {stats.num_lookups}\n"
+                              f"- num_bloom_skips: {stats.num_bloom_skips}\n"
+                              f"- num_pruned: {stats.num_pruned}")
+        if self.dns_cache is not None:
+            stats = self.dns_cache.stats()
+            print_and_log(f"Dns cache\n"
+                          f"- hits: {stats.hits}\n"
+                          f"- misses: {stats.misses}\n"
+                          f"- num_entries: {stats.num_entries}")
+        if self.near_duplicate_index is not None:
+            stats = self.near_duplicate_index.stats()
+            print_and_log(f"Near duplicates\n"
+                          f"- num_checked: {stats.num_checked}\n"
+                          f"- num_duplicates: {stats.num_duplicates}")
+        if self.stock_data_prefetcher is not None:
+            stats = self.stock_data_prefetcher.stats()
+            print_and_log(f"Stock data prefetch\n"
+                          f"- num_prefetched: {stats.num_prefetched}\n"
+                          f"- hits: {stats.hits}\n"
+                          f"- misses: {stats.misses}")
+
+    def _publish(self, news_reports: List[NewsReport]):
+        """ Posts reports to twitter and stores them to the database.
+
+        Params:
+            news_reports: Reports accepted by the article filter.
+        """
+        # post results to twitter
+        if self.twitter_on:
+            self.twitter_handle.publish_findings(news_reports)
+
+        # store to database
+        if self.database_on:
+            print("Inserting into Database")
+            self.database_handle.insert(news_reports)
+
 
 def print_and_log(text: str):
     print(text)
@@ -69,6 +69,21 @@ def process_articles(
     return processed_results, valid_scrape_results, tickers, exchanges
 
 
+def find_headline_tickers(headline: str) -> List[str]:
+    """ Returns the tickers of allowed exchanges a headline refers to.
+
+    Param:
+        headline: Headline of an article,
+            ex: "ABC Receives FDA Approval (NASDAQ: ABC)".
+    """
+    tickers = []
+    for ticker_code in _find_ticker_codes(headline):
+        exchange, ticker = _process_ticker_code(re.sub(r"[\[\]]", "", ticker_code))
+        if exchange in ALLOWED_EXCHANGES and ticker not in tickers:
+            tickers.append(ticker)
+    return tickers
+
+
 def _process_ticker_code(ticker_code: str) -> Tuple[str, str]:
     """ Returns the exchange and ticker from a ticker_code.
 
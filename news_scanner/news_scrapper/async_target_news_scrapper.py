@@ -0,0 +1,546 @@
+""" Asyncio news scrapper. """
+
+import asyncio
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, AsyncIterator, Iterator, Callable
+from urllib.parse import urlparse
+import httpx
+
+from news_scanner.news_scrapper.target_news_scrapper import (
+    TargetNewsScrapper,
+    ScrappedNewsResult,
+    HeadlineData,
+    PROXY_URL,
+    INDEX_PATH,
+    TIME_FORMAT,
+    _CatchUp,
+    _join_paragraphs,
+    _log_article_error,
+    _log_catch_up_error,
+    _log_index_error
+)
+from news_scanner.news_scrapper.catch_up import get_index_page_url
+from news_scanner.news_scrapper.session_pool import DEFAULT_POOL_SIZE
+from news_scanner.logger.logger import logger
+from news_scanner.news_scrapper.rate_limiter import HostRateLimiter
+from news_scanner.news_scrapper.hedging import HedgeConfig
+from news_scanner.news_scrapper.html_parser import PageSelectors, DEFAULT_PARSER_BACKEND
+from news_scanner.news_scrapper.parse_pool import ParsePool, ParsePoolConfig, POOL_ERRORS
+from news_scanner.news_scrapper.page_cache import PageCacheConfig
+from news_scanner.news_scrapper.catch_up import CatchUpConfig
+from news_scanner.news_scrapper.seen_links import SeenLinkConfig
+from news_scanner.news_scrapper.seen_link_index import SeenLinkIndexConfig
+from news_scanner.news_scrapper.headline_classifier import HeadlinePriorityConfig
+from news_scanner.news_scrapper.concurrency_controller import (
+    AdaptiveConcurrencyController,
+    AsyncConcurrencyLimiter,
+    ConcurrencyConfig
+)
+from news_scanner.news_scrapper.resilience import (
+    ResilienceConfig,
+    TransientFetchError,
+    CircuitOpenError,
+    RETRY_STATUS_CODES,
+    get_backoff_delay
+)
+
+DEFAULT_MAX_CONCURRENCY = 10
+# errors after which an asyncio fetch is retried
+ASYNC_TRANSIENT_ERRORS = (httpx.TransportError, TransientFetchError)
+_DONE = object()
+
+
+class AsyncTargetNewsScrapper(TargetNewsScrapper):
+    """ Scrapes and tracks stock news data with a single asyncio event loop.
+
+    Articles are fetched concurrently by tasks bounded by a semaphore instead
+    of by OS threads. The event loop and http client live as long as the
+    scrapper, so kept-alive connections are reused between scans.
+    """
+    def __init__(
+        self,
+        website_url: str,
+        scrapper_api_key: str,
+        proxy_on: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        transport: httpx.AsyncBaseTransport = None,
+        concurrency_config: ConcurrencyConfig = None,
+        rate_limiter: HostRateLimiter = None,
+        resilience_config: ResilienceConfig = ResilienceConfig(),
+        hedge_config: HedgeConfig = None,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        max_look_back: int = None,
+        parse_pool_config: ParsePoolConfig = None,
+        parse_pool: ParsePool = None,
+        page_cache_config: PageCacheConfig = None,
+        selectors: PageSelectors = PageSelectors(),
+        index_path: str = INDEX_PATH,
+        time_format: str = TIME_FORMAT,
+        feed_url: str = None,
+        catch_up_config: CatchUpConfig = None,
+        seen_link_config: SeenLinkConfig = SeenLinkConfig(),
+        seen_link_index_config: SeenLinkIndexConfig = None,
+        headline_priority_config: HeadlinePriorityConfig = None,
+        on_new_headlines: Callable[[List[HeadlineData]], None] = None
+    ):
+        """ Initializes scrapper state, its event loop and http client.
+
+        Params:
+            max_concurrency: Max number of articles fetched at once.
+            pool_size: Max number of kept-alive connections.
+            transport: Optional httpx transport used instead of the network.
+            concurrency_config: Enables adaptive concurrency, fetches in
+                flight follow the controller's limit instead of
+                max_concurrency.
+            rate_limiter: Optional limiter shared by every task.
+            parse_pool_config: Enables parsing article pages in a pool of
+                worker processes instead of on the event loop.
+
+        Other params are those of 'TargetNewsScrapper'.
+        """
+        super().__init__(
+            website_url=website_url,
+            scrapper_api_key=scrapper_api_key,
+            proxy_on=proxy_on,
+            pool_size=pool_size,
+            rate_limiter=rate_limiter,
+            resilience_config=resilience_config,
+            hedge_config=hedge_config,
+            parser_backend=parser_backend,
+            max_look_back=max_look_back,
+            parse_pool_config=parse_pool_config,
+            parse_pool=parse_pool,
+            page_cache_config=page_cache_config,
+            selectors=selectors,
+            index_path=index_path,
+            time_format=time_format,
+            feed_url=feed_url,
+            catch_up_config=catch_up_config,
+            seen_link_config=seen_link_config,
+            seen_link_index_config=seen_link_index_config,
+            headline_priority_config=headline_priority_config,
+            on_new_headlines=on_new_headlines
+        )
+        self.max_concurrency = max_concurrency
+        self._concurrency_limiter = None
+        if concurrency_config is not None:
+            self.concurrency_controller = AdaptiveConcurrencyController(
+                config=concurrency_config
+            )
+            self._concurrency_limiter = AsyncConcurrencyLimiter(
+                self.concurrency_controller
+            )
+            max_concurrency = concurrency_config.ceiling
+        self._loop = asyncio.new_event_loop()
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                resilience_config.read_timeout,
+                connect=resilience_config.connect_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=max(pool_size, max_concurrency),
+                max_keepalive_connections=pool_size
+            ),
+            transport=transport
+        )
+
+    def get_news(self) -> List[ScrappedNewsResult]:
+        """ Returns the headline, link and content of a each article.
+
+        Note: [0] of return result is latest link.
+        """
+        return self._loop.run_until_complete(self._get_news())
+
+    def iter_news(self) -> Iterator[ScrappedNewsResult]:
+        """ Yields each new article in the order its fetch completes.
+
+        The event loop runs in a background thread while articles are
+        yielded to the calling thread.
+        """
+        completed = queue.Queue()
+        thread = threading.Thread(
+            target=self._loop.run_until_complete,
+            args=(self._queue_news(completed),)
+        )
+        thread.start()
+        try:
+            while True:
+                result = completed.get()
+                if result is _DONE:
+                    break
+                if isinstance(result, Exception):
+                    raise result
+                yield result
+        finally:
+            thread.join()
+
+    def warm_up(self) -> int:
+        """ Opens as many kept-alive connections as articles fetched at once,
+        up to the pool size, so the next scan skips dns, tcp and tls setup.
+
+        Returns the number of connections opened, failures are logged.
+        """
+        return self._loop.run_until_complete(self._async_warm_up())
+
+    def close(self):
+        """ Closes the http client and event loop. """
+        super().close()
+        if not self._loop.is_closed():
+            self._loop.run_until_complete(self._client.aclose())
+            self._loop.close()
+
+    async def _async_warm_up(self) -> int:
+        """ Sends concurrent warm up requests, each opening a connection. """
+        url = self._get_warm_up_url()
+        num_connections = min(self.max_concurrency, self.session_pool.pool_size)
+        responses = await asyncio.gather(
+            *[self._client.head(url) for _ in range(num_connections)],
+            return_exceptions=True
+        )
+        num_opened = 0
+        for response in responses:
+            if isinstance(response, Exception):
+                logger.warning(f"Warm up request failed: {response}\n- url: {url}")
+            else:
+                num_opened += 1
+        return num_opened
+
+    async def _get_news(self) -> List[ScrappedNewsResult]:
+        """ Collects every new article and sorts them latest first. """
+        results = [result async for result in self.aiter_news()]
+        results.sort(key=lambda x: x.publish_date, reverse=True)
+        return results
+
+    async def _queue_news(self, completed: queue.Queue):
+        """ Queues each new article, then a done marker or the raised error.
+
+        Param:
+            completed: Queue receiving each scrapped article.
+        """
+        try:
+            async for result in self.aiter_news():
+                completed.put(result)
+        except Exception as e:
+            completed.put(e)
+        completed.put(_DONE)
+
+    async def aiter_news(self) -> AsyncIterator[ScrappedNewsResult]:
+        """ Yields each new article in the order its fetch completes.
+
+        Later index pages are caught up on while the first page's articles
+        are fetched, their articles are queued behind. Tracking attributes
+        are updated once every article was yielded.
+        """
+        self.num_links_found = 0
+        self.num_new_links = 0
+
+        try:
+            page = await self._async_get_page_with_retries(
+                self.index_url,
+                headers=self._get_index_request_headers()
+            )
+        except (*ASYNC_TRANSIENT_ERRORS, CircuitOpenError) as e:
+            # treated as an unchanged index, no article is fetched
+            _log_index_error(e)
+            self.index_changed = False
+            return
+        if self._index_has_changed(page):
+            headlines, links, publish_dates = self._parse_headline_data(page.content)
+            self._store_index_page(page)
+        elif self._has_failed_fetches():
+            headlines, links, publish_dates = [], [], []
+        else:
+            return
+        needs_catch_up = self._needs_catch_up(links)
+        headline_data = self._get_headline_data_to_scrape(
+            headlines, links, publish_dates
+        )
+
+        gate = self._concurrency_limiter or asyncio.Semaphore(self.max_concurrency)
+        pending = {
+            asyncio.ensure_future(self._async_get_news(hl_data, gate))
+            for hl_data in headline_data
+        }
+        catch_up = None
+        if needs_catch_up:
+            catch_up = asyncio.ensure_future(
+                self._async_get_catch_up_data_to_scrape(links, publish_dates[0])
+            )
+            pending.add(catch_up)
+        num_links_found = len(links)
+        num_results = 0
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task is catch_up:
+                    # entries caught up on, gated behind the queued fetches
+                    num_links_found += len(task.result())
+                    pending.update(
+                        asyncio.ensure_future(self._async_get_news(hl_data, gate))
+                        for hl_data in task.result()
+                    )
+                    continue
+                result = task.result()
+                if self._defer_failed_fetch(
+                    HeadlineData(result.headline, result.link, result.publish_date)
+                ):
+                    continue
+                self.viewed_links.add(result.link)
+                num_results += 1
+                yield result
+
+        self.num_links_found = num_links_found
+        self.num_new_links = num_results
+
+    async def _async_get_catch_up_data_to_scrape(
+        self,
+        links: List[str],
+        latest_publish_date: datetime
+    ) -> List[HeadlineData]:
+        """ Asyncio counterpart of '_get_catch_up_data_to_scrape', empty if
+        the crawl failed.
+
+        Params:
+            links: New links of the first index page.
+            latest_publish_date: Publish date of the latest entry.
+        """
+        try:
+            return self._prioritize_headline_data(
+                await self._async_catch_up(links, latest_publish_date)
+            )
+        except Exception as e:
+            _log_catch_up_error(e)
+            return []
+
+    async def _async_catch_up(
+        self,
+        links: List[str],
+        latest_publish_date: datetime
+    ) -> List[HeadlineData]:
+        """ Returns the new entries of later index pages, latest first.
+
+        Params:
+            links: New links of the first index page.
+            latest_publish_date: Publish date of the latest entry.
+        """
+        config = self.catch_up_config
+        catch_up = _CatchUp(self, links, latest_publish_date)
+        for page_numbers in catch_up.iter_page_batches():
+            pages = await asyncio.gather(
+                *[
+                    self._async_get_page_with_retries(
+                        get_index_page_url(self.index_url, page_number, config.page_param)
+                    )
+                    for page_number in page_numbers
+                ],
+                return_exceptions=True
+            )
+            for i, page in enumerate(pages):
+                if isinstance(page, Exception):
+                    _log_catch_up_error(page)
+                    pages[i] = None
+            if not catch_up.read_pages(pages):
+                break
+        return catch_up.finish()
+
+    async def _async_get_news(
+        self,
+        hl_data: HeadlineData,
+        gate
+    ) -> ScrappedNewsResult:
+        """ Returns the scrapped article of an index page entry.
+
+        Params:
+            hl_data: Index page entry of the article.
+            gate: Semaphore or limiter bounding the articles fetched at once.
+        """
+        body = ""
+        async with gate:
+            try:
+                page = await self._async_get_page_with_retries(
+                    hl_data.link, hedged=True
+                )
+                body = await self._async_parse_article_content(page.content)
+            except (*ASYNC_TRANSIENT_ERRORS, CircuitOpenError) as e:
+                _log_article_error(e, hl_data.link)
+                self._mark_failed_fetch(hl_data.link)
+            except Exception as e:
+                _log_article_error(e, hl_data.link)
+
+        return ScrappedNewsResult(
+            headline=hl_data.headline,
+            link=hl_data.link,
+            publish_date=hl_data.publish_date,
+            content=body
+        )
+
+    async def _async_parse_article_content(self, content: bytes) -> str:
+        """ Returns the paragraphs of an article joined as a str.
+
+        Parsing is awaited on the parse pool when one is set, so the event
+        loop keeps fetching meanwhile. Pages hitting a failure of the pool
+        are parsed in process instead.
+
+        Param:
+            content: Raw html of an article page.
+        """
+        if self.parse_pool is None:
+            return self._parse_article_content(content)
+        try:
+            paragraphs = await asyncio.wrap_future(
+                self.parse_pool.submit_article(content, self.html_parser)
+            )
+        except POOL_ERRORS:
+            paragraphs = self.parse_pool.parse_in_process(content, self.html_parser)
+        return _join_paragraphs(paragraphs)
+
+    async def _async_get_page_with_retries(
+        self,
+        link: str,
+        headers: Dict[str, str] = None,
+        hedged: bool = False
+    ) -> httpx.Response:
+        """ Returns the http response of a webpage, retrying transient failures.
+
+        Asyncio counterpart of '_get_page_with_retries', sharing its circuit
+        breakers and page cache.
+
+        Param:
+            link: url to a webpage.
+            headers: Optional request headers, forwarded by the proxy.
+            hedged: Determines if attempts are hedged when hedging is on.
+        """
+        cached_page = self._get_cached_page(link)
+        if cached_page is not None:
+            return cached_page
+        host = urlparse(link).netloc
+        breaker = self.circuit_breakers.get(host)
+        max_retries = self.resilience_config.max_retries
+        for attempt in range(max_retries + 1):
+            breaker.before_request(host)
+            try:
+                if hedged and self.hedger is not None:
+                    page = await self._async_get_hedged_page(link, headers)
+                else:
+                    page = await self._async_get_page(link, headers)
+                if page.status_code in RETRY_STATUS_CODES:
+                    raise TransientFetchError(page.status_code, link)
+            except ASYNC_TRANSIENT_ERRORS:
+                breaker.record_failure()
+                if attempt == max_retries:
+                    raise
+                await asyncio.sleep(
+                    get_backoff_delay(attempt, self.resilience_config)
+                )
+                continue
+            breaker.record_success()
+            self._cache_page(link, page)
+            return page
+
+    async def _async_get_hedged_page(
+        self,
+        link: str,
+        headers: Dict[str, str] = None
+    ) -> httpx.Response:
+        """ Returns the first response of a fetch and its hedge, if one is sent.
+
+        Asyncio counterpart of '_get_hedged_page', the losing fetch is
+        cancelled.
+
+        Param:
+            link: url to a webpage.
+            headers: Optional request headers, forwarded by the proxy.
+        """
+        hedger = self.hedger
+        delay = hedger.start_request()
+        start = time.perf_counter()
+        if delay is None:
+            page = await self._async_get_page(link, headers)
+            hedger.record_latency(time.perf_counter() - start)
+            return page
+
+        primary = asyncio.ensure_future(self._async_get_page(link, headers))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not hedger.acquire_hedge():
+            page = await primary
+            hedger.record_latency(time.perf_counter() - start)
+            return page
+
+        hedge = asyncio.ensure_future(
+            self._async_get_page(link, headers, self._get_hedge_proxy_on())
+        )
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            successes = [task for task in done if task.exception() is None]
+            if successes:
+                winner = successes[0]
+                for task in pending:
+                    task.cancel()
+                if winner is hedge:
+                    hedger.record_hedge_win()
+                hedger.record_latency(time.perf_counter() - start)
+                return winner.result()
+        # both failed, raising the fetch's error
+        return primary.result()
+
+    async def _async_get_page(
+        self,
+        link: str,
+        headers: Dict[str, str] = None,
+        proxy_on: bool = None
+    ) -> httpx.Response:
+        """ Returns the http response of a webpage.
+
+        Waits for the rate limiter when one is set, then reports the latency
+        and status of the fetch to the concurrency controller when one is
+        set.
+
+        Param:
+            link: url to a webpage.
+            headers: Optional request headers, forwarded by the proxy.
+            proxy_on: Overrides whether the request goes through the proxy.
+        """
+        if self.rate_limiter is not None:
+            await self.rate_limiter.async_wait(self._get_request_url(link, proxy_on))
+        controller = self.concurrency_controller
+        if controller is None:
+            return await self._async_request_page(link, headers, proxy_on)
+        start = time.perf_counter()
+        status_code = None
+        try:
+            page = await self._async_request_page(link, headers, proxy_on)
+            status_code = page.status_code
+            return page
+        finally:
+            controller.record(time.perf_counter() - start, status_code)
+
+    async def _async_request_page(
+        self,
+        link: str,
+        headers: Dict[str, str] = None,
+        proxy_on: bool = None
+    ) -> httpx.Response:
+        """ Sends the request for a webpage, directly or through the proxy.
+
+        Param:
+            link: url to a webpage.
+            headers: Optional request headers, forwarded by the proxy.
+            proxy_on: Overrides whether the request goes through the proxy.
+        """
+        if proxy_on is None:
+            proxy_on = self.proxy_on
+        if proxy_on:
+            params = {'api_key': self.scrapper_api_key, 'url': link}
+            if headers:
+                params['keep_headers'] = 'true'
+            return await self._client.get(PROXY_URL, params=params, headers=headers)
+        return await self._client.get(link, headers=headers)
@@ -0,0 +1,39 @@
+""" Catch up crawl of deeper index pages after a gap in scans.
+
+When every entry of the first index page is new, articles published
+between the last scan and the oldest entry of the page were pushed to
+later pages, ex: after downtime or a burst of news. The catch up reads
+later pages, a few at once, until it reaches a viewed link, an entry older
+than a cutoff, or a max number of pages.
+"""
+
+from typing import NamedTuple
+from urllib.parse import urlencode
+
+
+class CatchUpConfig(NamedTuple):
+    """ Extent of catch up crawls.
+
+    Attrs:
+        max_pages: Last index page read, the first page included.
+        max_age: Seconds before the latest entry of the first page past
+            which older entries are not caught up on.
+        concurrency: Number of index pages fetched at once.
+        page_param: Query parameter numbering the index pages.
+    """
+    max_pages: int = 5
+    max_age: float = 6 * 60 * 60
+    concurrency: int = 2
+    page_param: str = "page"
+
+
+def get_index_page_url(index_url: str, page_number: int, page_param: str = "page") -> str:
+    """ Returns the url of a numbered index page.
+
+    Params:
+        index_url: url of the first index page.
+        page_number: Number of the page, the first page is 1.
+        page_param: Query parameter numbering the index pages.
+    """
+    separator = "&" if "?" in index_url else "?"
+    return index_url + separator + urlencode({page_param: page_number})
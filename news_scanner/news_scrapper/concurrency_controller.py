@@ -0,0 +1,162 @@
+""" Adaptive (AIMD) control of the number of article fetches in flight. """
+
+import asyncio
+import threading
+from typing import NamedTuple, Optional, List
+
+THROTTLED_STATUS_CODES = [429]
+
+
+class ConcurrencyConfig(NamedTuple):
+    """ Bounds and tuning of the adaptive concurrency controller.
+
+    Attrs:
+        floor: Min number of fetches in flight.
+        ceiling: Max number of fetches in flight.
+        initial: Number of fetches in flight before any feedback.
+        latency_target: Mean fetch latency in seconds above which
+            concurrency is lowered.
+        increase_step: Fetches added to the limit after a healthy window.
+        decrease_factor: Factor the limit is multiplied by on throttling,
+            errors or high latency.
+        window: Number of successful fetches between latency checks.
+    """
+    floor: int = 2
+    ceiling: int = 20
+    initial: int = 5
+    latency_target: float = 2.0
+    increase_step: int = 1
+    decrease_factor: float = 0.5
+    window: int = 10
+
+
+class AdaptiveConcurrencyController:
+    """ Raises or lowers the fetch concurrency limit from observed fetches.
+
+    The limit grows additively after every window of fast, successful
+    fetches and shrinks multiplicatively on 429s, 5xx, errors or slow
+    windows. Shrinking happens at most once per round of in-flight fetches
+    so a single burst of failures does not collapse the limit to the floor.
+    Thread safe, fetching threads gate themselves with 'with controller:'.
+
+    Attrs:
+        limit: Current max number of fetches in flight.
+        in_flight: Number of fetches currently holding the gate.
+        num_increases: Number of times the limit was raised.
+        num_decreases: Number of times the limit was lowered.
+    """
+    def __init__(self, config: ConcurrencyConfig = ConcurrencyConfig()):
+        """
+        Params:
+            config: Bounds and tuning of the controller.
+        """
+        self.config = config
+        self.limit = min(max(config.initial, config.floor), config.ceiling)
+        self.in_flight = 0
+        self.num_increases = 0
+        self.num_decreases = 0
+        self._latencies: List[float] = []
+        self._samples_since_decrease = self.limit
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def acquire(self):
+        """ Blocks until a fetch is allowed under the current limit. """
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        """ Frees the slot of a finished fetch. """
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def record(self, latency: float, status_code: Optional[int]):
+        """ Adjusts the limit from the outcome of a fetch.
+
+        Params:
+            latency: Seconds the fetch took.
+            status_code: Http status of the response, None if it failed.
+        """
+        with self._condition:
+            self._samples_since_decrease += 1
+            if _is_throttled(status_code):
+                self._latencies = []
+                self._decrease()
+                return
+
+            self._latencies.append(latency)
+            if len(self._latencies) < self.config.window:
+                return
+            mean_latency = sum(self._latencies) / len(self._latencies)
+            self._latencies = []
+            if mean_latency > self.config.latency_target:
+                self._decrease()
+            else:
+                self._increase()
+
+    def _increase(self):
+        """ Raises the limit additively up to the ceiling. """
+        limit = min(self.limit + self.config.increase_step, self.config.ceiling)
+        if limit != self.limit:
+            self.limit = limit
+            self.num_increases += 1
+            self._condition.notify_all()
+
+    def _decrease(self):
+        """ Lowers the limit multiplicatively down to the floor. """
+        if self._samples_since_decrease < self.limit:
+            return
+        limit = max(int(self.limit * self.config.decrease_factor), self.config.floor)
+        self._samples_since_decrease = 0
+        if limit != self.limit:
+            self.limit = limit
+            self.num_decreases += 1
+
+
+class AsyncConcurrencyLimiter:
+    """ Gates asyncio fetches with the limit of an adaptive controller.
+
+    Used as 'async with limiter:' by tasks of a single event loop.
+    """
+    def __init__(self, controller: AdaptiveConcurrencyController):
+        """
+        Params:
+            controller: Controller providing the current limit.
+        """
+        self.controller = controller
+        self.in_flight = 0
+        self._condition = None
+
+    async def __aenter__(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.in_flight < self.controller.limit
+            )
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+def _is_throttled(status_code: Optional[int]) -> bool:
+    """ Returns whether a fetch outcome signals the site is overloaded.
+
+    Params:
+        status_code: Http status of the response, None if it failed.
+    """
+    return status_code is None or status_code in THROTTLED_STATUS_CODES \
+        or status_code >= 500
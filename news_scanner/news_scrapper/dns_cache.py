@@ -0,0 +1,95 @@
+""" Process wide cache of dns resolutions.
+
+Installing the cache wraps 'socket.getaddrinfo', which both requests and
+httpx resolve hosts through, so a host resolved by a warm up is not
+resolved again by the next scan until its entry expires.
+"""
+
+import socket
+import threading
+import time
+from typing import NamedTuple, Dict, Tuple, List, Callable, Optional
+
+DEFAULT_DNS_TTL = 900.0
+
+
+class DnsCacheStats(NamedTuple):
+    """ Lookups served by a dns cache.
+
+    Attrs:
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups resolved by the system resolver.
+        num_entries: Number of cached resolutions.
+    """
+    hits: int = 0
+    misses: int = 0
+    num_entries: int = 0
+
+
+class DnsCache:
+    """ Caches the results of 'socket.getaddrinfo' for a ttl, thread safe.
+
+    Failed lookups are not cached.
+    """
+    def __init__(
+        self,
+        ttl: float = DEFAULT_DNS_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Params:
+            ttl: Seconds a resolution is served from the cache.
+            clock: Returns the current time in seconds.
+        """
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: Dict[tuple, Tuple[float, List[tuple]]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        self._getaddrinfo: Optional[Callable] = None
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0) -> List[tuple]:
+        """ Returns the cached resolution of a host, resolving it on a miss.
+
+        Takes the arguments of 'socket.getaddrinfo'.
+        """
+        key = (host, port, family, type, proto, flags)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._hits += 1
+                return list(entry[1])
+            self._misses += 1
+        getaddrinfo = self._getaddrinfo or socket.getaddrinfo
+        addresses = getaddrinfo(host, port, family, type, proto, flags)
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+        return list(addresses)
+
+    def install(self):
+        """ Routes every 'socket.getaddrinfo' call of the process through the
+        cache. """
+        with self._lock:
+            if self._getaddrinfo is not None:
+                return
+            self._getaddrinfo = socket.getaddrinfo
+        socket.getaddrinfo = self.getaddrinfo
+
+    def uninstall(self):
+        """ Restores the 'socket.getaddrinfo' replaced by 'install'. """
+        with self._lock:
+            getaddrinfo = self._getaddrinfo
+            self._getaddrinfo = None
+        if getaddrinfo is not None and socket.getaddrinfo == self.getaddrinfo:
+            socket.getaddrinfo = getaddrinfo
+
+    def stats(self) -> DnsCacheStats:
+        """ Returns the lookups served so far. """
+        with self._lock:
+            return DnsCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                num_entries=len(self._entries)
+            )
@@ -0,0 +1,100 @@
+""" Streaming parsing of RSS and Atom feeds listing a site's articles.
+
+A feed lists the same headlines, links and publish times as the index
+page in a fraction of its size. Items are parsed one at a time as the
+document is read, so reading can stop at the first viewed link.
+"""
+
+import io
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterator, Optional
+from news_scanner.news_scrapper.html_parser import IndexEntry, PageStructureError
+
+# tags of an article entry, rss 2.0 and atom
+_ITEM_TAGS = {"item", "entry"}
+_DATE_TAGS = ("pubDate", "published", "updated", "date")
+
+
+def iter_feed_entries(content: bytes) -> Iterator[IndexEntry]:
+    """ Yields the link, headline and publish time of each feed item, in
+    document order.
+
+    Raises 'PageStructureError' if content is not a well formed feed.
+
+    Param:
+        content: Raw xml of an RSS or Atom feed.
+    """
+    try:
+        for _, element in ElementTree.iterparse(io.BytesIO(content), events=("end",)):
+            if _local_name(element.tag) not in _ITEM_TAGS:
+                continue
+            entry = _to_index_entry(element)
+            element.clear()
+            if entry is not None:
+                yield entry
+    except ElementTree.ParseError as e:
+        raise PageStructureError(f"Feed is not well formed: {e}") from e
+
+
+def parse_feed_date(time_text: str, utc_offset: int = 6) -> Optional[datetime]:
+    """ Returns the publish time of a feed item as a naive datetime in the
+    specified timezone, default cst, like the index page's publish times.
+
+    Returns None if the item is undated, rss dates are optional, or its date
+    cannot be parsed.
+
+    Params:
+        time_text: RFC 822 (rss) or ISO 8601 (atom) date time, times without
+            a timezone are read as utc.
+        utc_offset: Number of hours to subtract from utc time.
+    """
+    if not time_text:
+        return None
+    try:
+        publish_date = parsedate_to_datetime(time_text)
+    except (TypeError, ValueError):
+        try:
+            publish_date = datetime.fromisoformat(time_text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if publish_date.tzinfo is not None:
+        publish_date = publish_date.astimezone(timezone.utc).replace(tzinfo=None)
+    return publish_date - timedelta(hours=utc_offset)
+
+
+def _to_index_entry(item: ElementTree.Element) -> Optional[IndexEntry]:
+    """ Returns the fields of a feed item, None if it has no link.
+
+    Param:
+        item: 'item' (rss) or 'entry' (atom) element.
+    """
+    headline = ""
+    href = None
+    time_text = ""
+    for child in item:
+        name = _local_name(child.tag)
+        if name == "title":
+            headline = (child.text or "").strip()
+        elif name == "link":
+            # atom links are attributes, the alternate link is the article
+            if child.get("href") is not None:
+                if child.get("rel", "alternate") == "alternate":
+                    href = child.get("href")
+            elif child.text:
+                href = child.text.strip()
+        elif name in _DATE_TAGS and not time_text:
+            time_text = (child.text or "").strip()
+    if href is None:
+        return None
+    return IndexEntry(href=href, headline=headline, time_text=time_text)
+
+
+def _local_name(tag: str) -> str:
+    """ Returns an xml tag without its namespace.
+
+    Param:
+        tag: Tag of an element, ex: '{http://www.w3.org/2005/Atom}entry'.
+    """
+    return tag.rsplit("}", 1)[-1]
@@ -0,0 +1,100 @@
+""" Scoring of index headlines, so likely actionable articles are fetched
+first.
+
+The score of a headline adds the weights of the keywords it contains, a
+weight for a ticker, ex: "(NASDAQ: ABC)" or "$ABC", and a recency weight
+halving every half life before the latest entry of the scan. Scoring only
+reads the headline, so it costs far less than the fetch it orders.
+"""
+
+import re
+from datetime import datetime
+from typing import NamedTuple, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from news_scanner.news_scrapper.target_news_scrapper import HeadlineData
+
+DEFAULT_KEYWORD_WEIGHTS = (
+    ("fda approval", 3.0),
+    ("fda", 2.0),
+    ("merger", 3.0),
+    ("acquisition", 3.0),
+    ("to acquire", 3.0),
+    ("buyout", 3.0),
+    ("definitive agreement", 2.0),
+    ("phase 3", 2.0),
+    ("topline", 2.0),
+    ("clinical trial", 1.5),
+    ("partnership", 1.5),
+    ("contract", 1.5),
+    ("guidance", 1.0),
+    ("earnings", 1.0),
+)
+TICKER_PATTERN = re.compile(r"[(\[][A-Z]+ *: *[A-Z.]+[)\]]|\$[A-Z]{1,5}\b")
+
+
+class HeadlinePriorityConfig(NamedTuple):
+    """ Weights of the headline score.
+
+    Attrs:
+        keyword_weights: Pairs of a lowercase keyword and the weight added
+            when a headline contains it.
+        ticker_weight: Weight added when a headline contains a ticker.
+        recency_weight: Weight of the latest entry of a scan.
+        recency_half_life: Seconds before the latest entry over which the
+            recency weight halves.
+    """
+    keyword_weights: Tuple[Tuple[str, float], ...] = DEFAULT_KEYWORD_WEIGHTS
+    ticker_weight: float = 2.0
+    recency_weight: float = 1.0
+    recency_half_life: float = 10 * 60
+
+
+class HeadlineClassifier:
+    """ Orders index entries by the score of their headline. """
+    def __init__(self, config: HeadlinePriorityConfig = HeadlinePriorityConfig()):
+        """
+        Param:
+            config: Weights of the headline score.
+        """
+        self.config = config
+
+    def score(
+        self,
+        headline: str,
+        publish_date: datetime,
+        latest_publish_date: datetime
+    ) -> float:
+        """ Returns the score of a headline, higher is fetched first.
+
+        Params:
+            headline: Headline of an index entry.
+            publish_date: Publish date of the entry.
+            latest_publish_date: Publish date of the latest entry of the scan.
+        """
+        config = self.config
+        text = headline.lower()
+        score = sum(weight for keyword, weight in config.keyword_weights if keyword in text)
+        if TICKER_PATTERN.search(headline):
+            score += config.ticker_weight
+        age = max((latest_publish_date - publish_date).total_seconds(), 0)
+        score += config.recency_weight * 0.5 ** (age / config.recency_half_life)
+        return score
+
+    def prioritize(self, headline_data: List["HeadlineData"]) -> List["HeadlineData"]:
+        """ Returns index entries from the highest score to the lowest, entries
+        of equal score keep their order.
+
+        Param:
+            headline_data: Index entries to fetch.
+        """
+        if not headline_data:
+            return headline_data
+        latest_publish_date = max(hl_data.publish_date for hl_data in headline_data)
+        return sorted(
+            headline_data,
+            key=lambda hl_data: self.score(
+                hl_data.headline, hl_data.publish_date, latest_publish_date
+            ),
+            reverse=True
+        )
@@ -0,0 +1,110 @@
+""" Hedged requests cutting the tail latency of article fetches.
+
+A fetch still running after a percentile of recent fetch latencies gets a
+duplicate request. The asyncio scrapper takes the first response. Threaded
+scrappers keep the fetch on the calling thread's pooled session and take
+the hedge's response if the fetch fails. Hedges are capped to a ratio of
+all fetches so a slow site is not flooded.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import NamedTuple, Optional
+
+
+class HedgeConfig(NamedTuple):
+    """ When and how often fetches are hedged.
+
+    Attrs:
+        percentile: Percentile of recent latencies after which a fetch
+            still running is hedged.
+        min_samples: Number of latencies to observe before hedging.
+        window: Number of recent latencies the percentile is taken over.
+        max_hedge_ratio: Max hedges sent per fetch.
+        min_delay: Min seconds to wait before hedging.
+        via_proxy: Determines if hedges of direct fetches are sent through
+            the scrapper proxy instead of directly.
+    """
+    percentile: float = 95.0
+    min_samples: int = 20
+    window: int = 200
+    max_hedge_ratio: float = 0.1
+    min_delay: float = 0.05
+    via_proxy: bool = False
+
+
+class HedgeStats(NamedTuple):
+    """ Hedging activity of a scrapper.
+
+    Attrs:
+        num_requests: Number of fetches that could be hedged.
+        num_hedges: Number of hedges sent.
+        num_hedge_wins: Number of hedges whose response was used.
+        hedge_ratio: num_hedges / num_requests.
+    """
+    num_requests: int = 0
+    num_hedges: int = 0
+    num_hedge_wins: int = 0
+    hedge_ratio: float = 0.0
+
+
+class RequestHedger:
+    """ Tracks recent fetch latencies and the hedge budget, thread safe. """
+    def __init__(self, config: HedgeConfig = HedgeConfig()):
+        """
+        Params:
+            config: When and how often fetches are hedged.
+        """
+        self.config = config
+        self._latencies = deque(maxlen=config.window)
+        self._num_requests = 0
+        self._num_hedges = 0
+        self._num_hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def start_request(self) -> Optional[float]:
+        """ Counts a fetch and returns the seconds after which to hedge it.
+
+        Returns None while too few latencies were observed to hedge.
+        """
+        with self._lock:
+            self._num_requests += 1
+            if len(self._latencies) < self.config.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        index = math.ceil(self.config.percentile / 100 * len(latencies)) - 1
+        return max(latencies[max(index, 0)], self.config.min_delay)
+
+    def acquire_hedge(self) -> bool:
+        """ Returns whether a hedge may be sent, counting it if so. """
+        with self._lock:
+            if self._num_hedges + 1 > self.config.max_hedge_ratio * self._num_requests:
+                return False
+            self._num_hedges += 1
+            return True
+
+    def record_latency(self, latency: float):
+        """ Adds the latency of a completed fetch.
+
+        Params:
+            latency: Seconds from the fetch start to its first response.
+        """
+        with self._lock:
+            self._latencies.append(latency)
+
+    def record_hedge_win(self):
+        """ Counts a hedge answered before its fetch. """
+        with self._lock:
+            self._num_hedge_wins += 1
+
+    def stats(self) -> HedgeStats:
+        """ Returns the hedging activity so far. """
+        with self._lock:
+            return HedgeStats(
+                num_requests=self._num_requests,
+                num_hedges=self._num_hedges,
+                num_hedge_wins=self._num_hedge_wins,
+                hedge_ratio=self._num_hedges / self._num_requests
+                if self._num_requests else 0.0
+            )
@@ -0,0 +1,291 @@
+""" Html parser backends extracting index entries and article paragraphs.
+
+Backends:
+    - "html.parser": BeautifulSoup tree of the whole page, pure python.
+    - "strainer": BeautifulSoup tree of only the target section, built with
+      a 'SoupStrainer'.
+    - "lxml": lxml tree queried with xpath, needs the optional lxml package.
+
+Every backend returns the same entries and paragraphs for a page.
+"""
+
+from abc import ABC, abstractmethod
+from typing import NamedTuple, List, Iterator, Dict, Type, Callable, Union
+import bs4
+from news_scanner.logger.logger import logger
+
+try:
+    import lxml.html
+except ImportError:  # optional dependency
+    lxml = None
+
+HTML_PARSER = "html.parser"
+STRAINER = "strainer"
+LXML = "lxml"
+DEFAULT_PARSER_BACKEND = STRAINER
+
+
+class PageSelectors(NamedTuple):
+    """ Css classes locating the scrapped data of the target site.
+
+    Attrs:
+        index_section_class: Class of the index page section listing
+            articles.
+        article_body_class: Class of the article page div holding the body.
+        paragraph_class: Class of the paragraphs of an article body.
+        headline_link_position: Position of the headline link among the
+            links of an index entry.
+    """
+    index_section_class: str = "market-news__results"
+    article_body_class: str = "mdc-article-body"
+    paragraph_class: str = "mdc-article-paragraph"
+    headline_link_position: int = 1
+
+
+class IndexEntry(NamedTuple):
+    """ Raw fields of an article entry on the index page.
+
+    Attrs:
+        href: Path of the article as linked.
+        headline: Headline of the article.
+        time_text: Publish time as displayed, ex: "Oct 18, 2022 09:30 AM CDT".
+    """
+    href: str
+    headline: str
+    time_text: str
+
+
+class PageStructureError(ValueError):
+    """ Raised when a page lacks the section a parser looks for. """
+
+
+class HtmlParser(ABC):
+    """ Base of the parser backends, a backend missing a method cannot be
+    created.
+
+    Attrs:
+        name: Name the backend is selected by.
+    """
+    name = ""
+
+    def __init__(self, selectors: PageSelectors = PageSelectors()):
+        """
+        Params:
+            selectors: Css classes locating the scrapped data.
+        """
+        self.selectors = selectors
+
+    @abstractmethod
+    def iter_index(self, content: bytes) -> Iterator[IndexEntry]:
+        """ Yields each article entry of the index page, in page order.
+
+        Params:
+            content: Raw html of the news index page.
+        """
+
+    @abstractmethod
+    def parse_article(self, content: bytes) -> List[str]:
+        """ Returns the text of each paragraph of an article body.
+
+        Params:
+            content: Raw html of an article page.
+        """
+
+
+class SoupParser(HtmlParser):
+    """ Builds the whole page with BeautifulSoup's html.parser. """
+    name = HTML_PARSER
+
+    def iter_index(self, content: bytes) -> Iterator[IndexEntry]:
+        soup = bs4.BeautifulSoup(content, features="html.parser")
+        section = soup.find(
+            "section", attrs={"class": self.selectors.index_section_class}
+        )
+        return self._iter_entries(section)
+
+    def parse_article(self, content: bytes) -> List[str]:
+        soup = bs4.BeautifulSoup(content, features="html.parser")
+        body = soup.find("div", attrs={"class": self.selectors.article_body_class})
+        return self._get_paragraphs(body)
+
+    def _iter_entries(self, section: bs4.Tag) -> Iterator[IndexEntry]:
+        """ Yields the entries of the index section.
+
+        Params:
+            section: Index section listing articles.
+        """
+        if section is None:
+            raise PageStructureError(
+                f"Index section not found: {self.selectors.index_section_class}"
+            )
+        for article in section.find_all("article"):
+            headline = article.find_all("a")[self.selectors.headline_link_position]
+            yield IndexEntry(
+                href=headline.get("href"),
+                headline=headline.get_text(),
+                time_text=article.find("time").get_text()
+            )
+
+    def _get_paragraphs(self, body: bs4.Tag) -> List[str]:
+        """ Returns the text of each paragraph of an article body.
+
+        Params:
+            body: Div holding the article body.
+        """
+        if body is None:
+            raise PageStructureError(
+                f"Article body not found: {self.selectors.article_body_class}"
+            )
+        paragraphs = body.find_all(
+            "p", attrs={"class": self.selectors.paragraph_class}
+        )
+        return [paragraph.get_text() for paragraph in paragraphs]
+
+
+class StrainedSoupParser(SoupParser):
+    """ Builds only the index section or article body with BeautifulSoup.
+
+    Everything outside the 'SoupStrainer' target is skipped while parsing,
+    so no tree is built for navigation, ads and scripts.
+    """
+    name = STRAINER
+
+    def __init__(self, selectors: PageSelectors = PageSelectors()):
+        super().__init__(selectors)
+        self._index_strainer = bs4.SoupStrainer(
+            "section", attrs={"class": _class_matcher(selectors.index_section_class)}
+        )
+        self._article_strainer = bs4.SoupStrainer(
+            "div", attrs={"class": _class_matcher(selectors.article_body_class)}
+        )
+
+    def iter_index(self, content: bytes) -> Iterator[IndexEntry]:
+        soup = bs4.BeautifulSoup(
+            content, features="html.parser", parse_only=self._index_strainer
+        )
+        return self._iter_entries(soup.find("section"))
+
+    def parse_article(self, content: bytes) -> List[str]:
+        soup = bs4.BeautifulSoup(
+            content, features="html.parser", parse_only=self._article_strainer
+        )
+        return self._get_paragraphs(soup.find("div"))
+
+
+class LxmlParser(HtmlParser):
+    """ Parses pages with lxml's C html parser and xpath queries. """
+    name = LXML
+
+    def __init__(
+        self,
+        selectors: PageSelectors = PageSelectors(),
+        encoding: str = "utf-8"
+    ):
+        """
+        Params:
+            selectors: Css classes locating the scrapped data.
+            encoding: Encoding of pages not declaring one.
+        """
+        super().__init__(selectors)
+        self._parser = lxml.html.HTMLParser(encoding=encoding)
+        self._index_xpath = f"//section[{_has_class(selectors.index_section_class)}]"
+        self._body_xpath = f"//div[{_has_class(selectors.article_body_class)}]"
+        self._paragraph_xpath = f".//p[{_has_class(selectors.paragraph_class)}]"
+
+    def iter_index(self, content: bytes) -> Iterator[IndexEntry]:
+        sections = self._parse(content).xpath(self._index_xpath)
+        if not sections:
+            raise PageStructureError(
+                f"Index section not found: {self.selectors.index_section_class}"
+            )
+        return self._iter_entries(sections[0])
+
+    def parse_article(self, content: bytes) -> List[str]:
+        bodies = self._parse(content).xpath(self._body_xpath)
+        if not bodies:
+            raise PageStructureError(
+                f"Article body not found: {self.selectors.article_body_class}"
+            )
+        return [
+            paragraph.text_content()
+            for paragraph in bodies[0].xpath(self._paragraph_xpath)
+        ]
+
+    def _iter_entries(self, section) -> Iterator[IndexEntry]:
+        """ Yields the entries of the index section.
+
+        Params:
+            section: lxml element of the index section.
+        """
+        for article in section.iter("article"):
+            headline = list(article.iter("a"))[self.selectors.headline_link_position]
+            yield IndexEntry(
+                href=headline.get("href"),
+                headline=headline.text_content(),
+                time_text=next(article.iter("time")).text_content()
+            )
+
+    def _parse(self, content: bytes):
+        """ Returns the lxml document of a page.
+
+        Params:
+            content: Raw html of a page.
+        """
+        return lxml.html.document_fromstring(content, parser=self._parser)
+
+
+PARSER_BACKENDS: Dict[str, Type[HtmlParser]] = {
+    HTML_PARSER: SoupParser,
+    STRAINER: StrainedSoupParser,
+    LXML: LxmlParser,
+}
+
+
+def get_html_parser(
+    backend: str = DEFAULT_PARSER_BACKEND,
+    selectors: PageSelectors = PageSelectors()
+) -> HtmlParser:
+    """ Returns the parser of a backend.
+
+    Falls back to the "html.parser" backend when lxml is requested but not
+    installed, ex: without the "lxml" extra.
+
+    Params:
+        backend: Name of the backend, one of 'PARSER_BACKENDS'.
+        selectors: Css classes locating the scrapped data.
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend: {backend}, "
+            f"expected one of {list(PARSER_BACKENDS)}"
+        )
+    if backend == LXML and lxml is None:
+        logger.warning("lxml is not installed, parsing with html.parser")
+        backend = HTML_PARSER
+    return PARSER_BACKENDS[backend](selectors=selectors)
+
+
+def _class_matcher(css_class: str) -> Callable[[Union[str, List[str]]], bool]:
+    """ Returns a 'SoupStrainer' attribute matcher of elements having a class.
+
+    Strainers can see the class attribute before it is split into a list, so
+    a plain string would only match elements having that single class.
+
+    Params:
+        css_class: Class name the element's class attribute must contain.
+    """
+    def matches(value: Union[str, List[str]]) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return css_class in classes
+    return matches
+
+
+def _has_class(css_class: str) -> str:
+    """ Returns an xpath predicate matching elements having a css class.
+
+    Params:
+        css_class: Class name the element's class attribute must contain.
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')"
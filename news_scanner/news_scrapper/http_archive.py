@@ -0,0 +1,381 @@
+""" Recording and replay of http responses for offline scrapper runs.
+
+A recording adapter (requests) or transport (httpx) captures the status,
+headers, body and latency of every response into an 'HttpArchive'. The
+replay adapter and transport answer from the archive instead of the
+network, sleeping the recorded latency so runs can be profiled and
+benchmarked deterministically without the news site.
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Dict, List, Tuple, Optional
+from urllib.parse import urlparse, parse_qs
+import httpx
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+RECORD = "record"
+REPLAY = "replay"
+ARCHIVE_VERSION = 1
+# headers describing the body on the wire, bodies are archived decoded
+_WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class HttpArchiveConfig(NamedTuple):
+    """ Location and mode of an http archive.
+
+    Attrs:
+        path: File the archive is saved to or loaded from.
+        mode: "record" to capture network responses, "replay" to answer
+            from the archive without the network.
+        latency_scale: Factor applied to recorded latencies on replay, 0
+            replays without sleeping.
+    """
+    path: Path
+    mode: str = REPLAY
+    latency_scale: float = 1.0
+
+
+class ArchivedResponse(NamedTuple):
+    """ Recorded http response.
+
+    Attrs:
+        url: url of the requested page, the target url for proxied requests.
+        status_code: Http status of the response.
+        headers: Response headers, without wire encoding headers.
+        body: Decoded response body.
+        latency: Seconds from sending the request to reading the body.
+    """
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    latency: float
+
+
+class HttpArchive:
+    """ Responses recorded per url, replayed in the order they were recorded.
+
+    A url fetched several times, like the index page once per scan, replays
+    its responses in order and then keeps replaying the last one. Thread
+    safe.
+    """
+    def __init__(self, responses: List[ArchivedResponse] = None):
+        """
+        Params:
+            responses: Recorded responses, in the order they were recorded.
+        """
+        self._responses: Dict[str, List[ArchivedResponse]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for response in responses or []:
+            self.record(response)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(responses) for responses in self._responses.values())
+
+    def record(self, response: ArchivedResponse):
+        """ Adds a response to the archive.
+
+        Params:
+            response: Recorded response.
+        """
+        key = get_archive_key(response.url)
+        with self._lock:
+            self._responses.setdefault(key, []).append(response)
+
+    def replay(self, url: str) -> Optional[ArchivedResponse]:
+        """ Returns the next recorded response of url, None if never recorded.
+
+        Params:
+            url: Requested url, proxied requests are matched on their target.
+        """
+        key = get_archive_key(url)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                return None
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            return responses[min(cursor, len(responses) - 1)]
+
+    def rewind(self):
+        """ Replays every url from its first response again. """
+        with self._lock:
+            self._cursors = {}
+
+    def save(self, path: Path):
+        """ Writes the archive to a gzipped json file.
+
+        Params:
+            path: File to write.
+        """
+        with self._lock:
+            entries = [
+                {
+                    "url": response.url,
+                    "status_code": response.status_code,
+                    "headers": response.headers,
+                    "body": base64.b64encode(response.body).decode("ascii"),
+                    "latency": response.latency,
+                }
+                for responses in self._responses.values()
+                for response in responses
+            ]
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            json.dump({"version": ARCHIVE_VERSION, "entries": entries}, file)
+
+    @classmethod
+    def load(cls, path: Path) -> "HttpArchive":
+        """ Returns the archive saved to a file.
+
+        Params:
+            path: File written by 'save'.
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported http archive version: {data.get('version')}")
+        return cls([
+            ArchivedResponse(
+                url=entry["url"],
+                status_code=entry["status_code"],
+                headers=entry["headers"],
+                body=base64.b64decode(entry["body"]),
+                latency=entry["latency"]
+            )
+            for entry in data["entries"]
+        ])
+
+
+class RecordingAdapter(HTTPAdapter):
+    """ Pooling requests adapter recording every response it receives. """
+    def __init__(self, archive: HttpArchive, **kwargs):
+        """
+        Params:
+            archive: Archive receiving the responses.
+            kwargs: Passed to 'HTTPAdapter', ex: pool_maxsize.
+        """
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        body = response.content
+        self.archive.record(_to_archived_response(
+            request.url, response.status_code, response.headers, body,
+            time.perf_counter() - start
+        ))
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """ Requests adapter answering from an archive instead of the network.
+
+    Urls missing from the archive are answered with a 404.
+    """
+    def __init__(self, archive: HttpArchive, latency_scale: float = 1.0):
+        """
+        Params:
+            archive: Archive of recorded responses.
+            latency_scale: Factor applied to recorded latencies.
+        """
+        super().__init__()
+        self.archive = archive
+        self.latency_scale = latency_scale
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        status_code, headers, body, latency = _get_replay(
+            self.archive, request.url, self.latency_scale
+        )
+        if latency > 0:
+            time.sleep(latency)
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """ httpx transport recording every response of an inner transport. """
+    def __init__(
+        self,
+        archive: HttpArchive,
+        transport: httpx.AsyncBaseTransport = None
+    ):
+        """
+        Params:
+            archive: Archive receiving the responses.
+            transport: Transport sending the requests, defaults to the
+                network.
+        """
+        self.archive = archive
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        archived = _to_archived_response(
+            str(request.url), response.status_code, response.headers, body,
+            time.perf_counter() - start
+        )
+        self.archive.record(archived)
+        return httpx.Response(
+            archived.status_code, headers=archived.headers, content=body
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """ httpx transport answering from an archive instead of the network.
+
+    Urls missing from the archive are answered with a 404.
+    """
+    def __init__(self, archive: HttpArchive, latency_scale: float = 1.0):
+        """
+        Params:
+            archive: Archive of recorded responses.
+            latency_scale: Factor applied to recorded latencies.
+        """
+        self.archive = archive
+        self.latency_scale = latency_scale
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        status_code, headers, body, latency = _get_replay(
+            self.archive, str(request.url), self.latency_scale
+        )
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return httpx.Response(status_code, headers=headers, content=body)
+
+
+def open_http_archive(
+    config: HttpArchiveConfig
+) -> Tuple[HttpArchive, BaseAdapter, httpx.AsyncBaseTransport]:
+    """ Returns the archive of a config with the requests adapter and httpx
+    transport recording to it or replaying it.
+
+    Params:
+        config: Location and mode of the archive.
+    """
+    if config.mode == RECORD:
+        archive = HttpArchive()
+        adapter = RecordingAdapter(archive)
+    elif config.mode == REPLAY:
+        archive = HttpArchive.load(config.path)
+        adapter = ReplayAdapter(archive, config.latency_scale)
+    else:
+        raise ValueError(f"Unknown http archive mode: {config.mode}")
+    return archive, adapter, get_http_archive_transport(archive, config)
+
+
+def get_http_archive_transport(
+    archive: HttpArchive,
+    config: HttpArchiveConfig
+) -> httpx.AsyncBaseTransport:
+    """ Returns a new httpx transport recording to or replaying an archive.
+
+    A recording transport holds connections bound to one event loop, so
+    each asyncio scrapper needs its own transport.
+
+    Params:
+        archive: Archive recorded to or replayed.
+        config: Location and mode of the archive.
+    """
+    if config.mode == RECORD:
+        return RecordingTransport(archive)
+    return ReplayTransport(archive, config.latency_scale)
+
+
+def get_archive_key(url: str) -> str:
+    """ Returns the url a request is archived under.
+
+    Proxied requests are archived under their target url so the proxy api
+    key is not stored and recordings replay with the proxy on or off. Urls
+    without a path get the "/" requests adds when sending them.
+
+    Params:
+        url: Requested url.
+    """
+    parsed_url = urlparse(url)
+    query = parse_qs(parsed_url.query)
+    if "url" in query and "api_key" in query:
+        parsed_url = urlparse(query["url"][0])
+    if not parsed_url.path:
+        parsed_url = parsed_url._replace(path="/")
+    return parsed_url.geturl()
+
+
+def _to_archived_response(
+    url: str,
+    status_code: int,
+    headers,
+    body: bytes,
+    latency: float
+) -> ArchivedResponse:
+    """ Returns the archived form of a response.
+
+    Params:
+        url: Requested url.
+        status_code: Http status of the response.
+        headers: Response headers.
+        body: Decoded response body.
+        latency: Seconds from sending the request to reading the body.
+    """
+    return ArchivedResponse(
+        url=get_archive_key(url),
+        status_code=status_code,
+        headers={
+            name: value for name, value in headers.items()
+            if name.lower() not in _WIRE_HEADERS
+        },
+        body=body,
+        latency=latency
+    )
+
+
+def _get_replay(
+    archive: HttpArchive,
+    url: str,
+    latency_scale: float
+) -> Tuple[int, Dict[str, str], bytes, float]:
+    """ Returns the status, headers, body and latency to replay for url.
+
+    Params:
+        archive: Archive of recorded responses.
+        url: Requested url.
+        latency_scale: Factor applied to the recorded latency.
+    """
+    response = archive.replay(url)
+    if response is None:
+        return 404, {}, b"", 0.0
+    return (
+        response.status_code,
+        response.headers,
+        response.body,
+        response.latency * latency_scale
+    )
@@ -0,0 +1,140 @@
+""" News scrapper polling several news sources concurrently. """
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import NamedTuple, List, Dict, Iterator
+from news_scanner.news_scrapper.target_news_scrapper import (
+    TargetNewsScrapper,
+    ScrappedNewsResult,
+    INDEX_PATH,
+    TIME_FORMAT
+)
+from news_scanner.news_scrapper.html_parser import PageSelectors
+from news_scanner.logger.logger import logger
+
+# format of the publish dates yielded by the single threaded scrapper
+PUBLISH_DATE_FORMAT = "%b %d %Y %I:%M %p"
+_DONE = object()
+
+
+class NewsSource(NamedTuple):
+    """ News site and the layout of its pages.
+
+    Attrs:
+        name: Unique name of the source, used in logs and cache paths.
+        website_url: Base url of the news site.
+        index_path: Path of the site's news index page.
+        selectors: Css classes locating the scrapped data.
+        time_format: Format of the publish times of the index page.
+        feed_url: Optional RSS or Atom feed new articles are discovered
+            from instead of the index page.
+    """
+    name: str
+    website_url: str
+    index_path: str = INDEX_PATH
+    selectors: PageSelectors = PageSelectors()
+    time_format: str = TIME_FORMAT
+    feed_url: str = None
+
+
+class MultiSourceNewsScrapper:
+    """ Merges the articles of one scrapper per news source into one stream.
+
+    Every scan polls each source in its own thread. Sources keep their own
+    viewed links, index change detection and fetch stats, and a source
+    failing to scan is logged without stopping the others.
+
+    Attrs:
+        scrappers: Scrapper of each source, by source name.
+        index_changed: Determines if the index of any source changed in the
+            last scan.
+        num_links_found: Number of index entries read over all sources.
+        num_new_links: Number of articles scrapped over all sources.
+    """
+    def __init__(self, scrappers: Dict[str, TargetNewsScrapper]):
+        """
+        Params:
+            scrappers: Scrapper of each source, by source name.
+        """
+        if not scrappers:
+            raise ValueError("At least one news source scrapper is required")
+        self.scrappers = scrappers
+        first_scrapper = next(iter(scrappers.values()))
+        self.html_parser = first_scrapper.html_parser
+        self.rate_limiter = first_scrapper.rate_limiter
+        self.index_changed = True
+        self.num_links_found = 0
+        self.num_new_links = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(scrappers), thread_name_prefix="source"
+        )
+
+    def get_news(self) -> List[ScrappedNewsResult]:
+        """ Returns the new articles of every source.
+
+        Note: [0] of return result is latest link.
+        """
+        return sorted(self.iter_news(), key=_get_publish_datetime, reverse=True)
+
+    def iter_news(self) -> Iterator[ScrappedNewsResult]:
+        """ Yields the new articles of every source as soon as they are
+        scrapped.
+
+        Tracking attributes are updated once every source was scanned.
+        """
+        self.num_links_found = 0
+        self.num_new_links = 0
+        results = queue.Queue()
+        for name, scrapper in self.scrappers.items():
+            self._executor.submit(_scan_source, name, scrapper, results)
+
+        num_running = len(self.scrappers)
+        while num_running:
+            result = results.get()
+            if result is _DONE:
+                num_running -= 1
+                continue
+            yield result
+
+        scrappers = self.scrappers.values()
+        self.index_changed = any(scrapper.index_changed for scrapper in scrappers)
+        self.num_links_found = sum(scrapper.num_links_found for scrapper in scrappers)
+        self.num_new_links = sum(scrapper.num_new_links for scrapper in scrappers)
+
+    def close(self):
+        """ Stops the polling threads and closes every source's scrapper. """
+        self._executor.shutdown(wait=True)
+        for scrapper in self.scrappers.values():
+            scrapper.close()
+
+
+def _scan_source(name: str, scrapper: TargetNewsScrapper, results: queue.Queue):
+    """ Puts the new articles of a source in results, followed by a done
+    marker.
+
+    Params:
+        name: Name of the source.
+        scrapper: Scrapper of the source.
+        results: Queue receiving the articles.
+    """
+    try:
+        for result in scrapper.iter_news():
+            results.put(result)
+    except Exception as e:
+        print(f"Error scanning news source: {name}")
+        logger.error(f"Error scanning news source: {name}\n- error: {e}")
+    finally:
+        results.put(_DONE)
+
+
+def _get_publish_datetime(result: ScrappedNewsResult) -> datetime:
+    """ Returns the publish date of an article as a datetime.
+
+    Param:
+        result: Scrapped article, its publish date is a datetime or a str
+            formatted by the single threaded scrapper.
+    """
+    if isinstance(result.publish_date, datetime):
+        return result.publish_date
+    return datetime.strptime(result.publish_date, PUBLISH_DATE_FORMAT)
@@ -1,124 +1,291 @@
 """ Multithreaded news scrapper. """
 
-import os
+import math
+import queue
 import threading
-from typing import NamedTuple, List, Dict
-from numpy import array_split
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Iterator, Callable
+from datetime import datetime
+from requests.adapters import BaseAdapter
 
 
 from news_scanner.news_scrapper.target_news_scrapper import (
     TargetNewsScrapper,
     ScrappedNewsResult,
-    _get_latest_link_index
+    HeadlineData,
+    INDEX_PATH,
+    TIME_FORMAT,
+    _log_catch_up_error
+)
+from news_scanner.news_scrapper.resilience import ResilienceConfig
+from news_scanner.news_scrapper.session_pool import DEFAULT_POOL_SIZE
+from news_scanner.news_scrapper.rate_limiter import HostRateLimiter
+from news_scanner.news_scrapper.hedging import HedgeConfig
+from news_scanner.news_scrapper.html_parser import PageSelectors, DEFAULT_PARSER_BACKEND
+from news_scanner.news_scrapper.parse_pool import ParsePool, ParsePoolConfig
+from news_scanner.news_scrapper.page_cache import PageCacheConfig
+from news_scanner.news_scrapper.catch_up import CatchUpConfig
+from news_scanner.news_scrapper.seen_links import SeenLinkConfig
+from news_scanner.news_scrapper.seen_link_index import SeenLinkIndexConfig
+from news_scanner.news_scrapper.headline_classifier import HeadlinePriorityConfig
+from news_scanner.news_scrapper.worker_pool import WorkerPool, WorkerPoolStats
+from news_scanner.news_scrapper.concurrency_controller import (
+    AdaptiveConcurrencyController,
+    ConcurrencyConfig
 )
 
-
-class HeadlineData(NamedTuple):
-    headline: str
-    link: str
-    publish_date: datetime
+DEFAULT_LINKS_PER_THREAD = 5
+# max seconds warm up tasks wait for every worker to take one
+WARM_UP_TIMEOUT = 10.0
 
 
 class MultiThreadedTargetNewsScrapper(TargetNewsScrapper):
-    """ Scrapes and tracks stock news data."""
+    """ Scrapes and tracks stock news data.
+
+    Threads of a worker pool owned by the scrapper pull links from a shared
+    work queue, so a slow article only holds up the thread fetching it. The
+    pool lives across scans until 'close' is called.
+    """
     def __init__(
         self,
         website_url: str,
         scrapper_api_key: str,
         proxy_on: bool = False,
-        num_threads: int = 5
+        num_threads: int = 5,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_threads: int = None,
+        links_per_thread: int = DEFAULT_LINKS_PER_THREAD,
+        concurrency_config: ConcurrencyConfig = None,
+        rate_limiter: HostRateLimiter = None,
+        resilience_config: ResilienceConfig = ResilienceConfig(),
+        hedge_config: HedgeConfig = None,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        max_look_back: int = None,
+        parse_pool_config: ParsePoolConfig = None,
+        parse_pool: ParsePool = None,
+        hedge_executor: ThreadPoolExecutor = None,
+        page_cache_config: PageCacheConfig = None,
+        adapter: BaseAdapter = None,
+        selectors: PageSelectors = PageSelectors(),
+        index_path: str = INDEX_PATH,
+        time_format: str = TIME_FORMAT,
+        feed_url: str = None,
+        catch_up_config: CatchUpConfig = None,
+        seen_link_config: SeenLinkConfig = SeenLinkConfig(),
+        seen_link_index_config: SeenLinkIndexConfig = None,
+        headline_priority_config: HeadlinePriorityConfig = None,
+        on_new_headlines: Callable[[List[HeadlineData]], None] = None
     ):
+        """ Initializes scrapper state.
+
+        Params:
+            num_threads: Number of pooled threads scrapping articles.
+            max_threads: Max number of threads a burst of new links can grow
+                the scan to, defaults to num_threads.
+            links_per_thread: Number of new links per thread beyond which
+                more threads are started, up to max_threads.
+            concurrency_config: Enables adaptive concurrency, the pool is
+                sized to the config's ceiling and fetches in flight follow
+                the controller's limit instead of num_threads.
+            rate_limiter: Optional limiter shared by every thread.
+
+        Other params are those of 'TargetNewsScrapper'.
+        """
         super().__init__(
             website_url=website_url,
             scrapper_api_key=scrapper_api_key,
-            proxy_on=proxy_on
+            proxy_on=proxy_on,
+            pool_size=pool_size,
+            rate_limiter=rate_limiter,
+            resilience_config=resilience_config,
+            hedge_config=hedge_config,
+            parser_backend=parser_backend,
+            max_look_back=max_look_back,
+            parse_pool_config=parse_pool_config,
+            parse_pool=parse_pool,
+            hedge_executor=hedge_executor,
+            page_cache_config=page_cache_config,
+            adapter=adapter,
+            selectors=selectors,
+            index_path=index_path,
+            time_format=time_format,
+            feed_url=feed_url,
+            catch_up_config=catch_up_config,
+            seen_link_config=seen_link_config,
+            seen_link_index_config=seen_link_index_config,
+            headline_priority_config=headline_priority_config,
+            on_new_headlines=on_new_headlines
         )
         self.num_threads = num_threads
-        self.viewed_links: Dict[str, datetime] = {}
-        self.write_lock = threading.Lock()
+        self.max_threads = max(max_threads or num_threads, num_threads)
+        self.links_per_thread = links_per_thread
+        if concurrency_config is not None:
+            self.concurrency_controller = AdaptiveConcurrencyController(
+                config=concurrency_config
+            )
+        # stopped workers close their session, so bursts do not leak them
+        self.worker_pool = WorkerPool(
+            num_workers=num_threads,
+            name="t",
+            on_worker_exit=self.session_pool.release_session
+        )
 
         # resets each run of 'get_news'
-        self.results_queue = []  # shared data structure
+        self.results_queue = []
         self.num_links_found = 0
         self.num_new_links = 0
 
     def get_news(self) -> List[ScrappedNewsResult]:
         """ Returns the headline, link and content of a each article.
 
+        """
+        self.results_queue = list(self.iter_news())
+
+        # sorting results by publish date
+        # reverse=True: [0] is latest article
+        self.results_queue.sort(key=lambda x: x.publish_date, reverse=True)
+        return self.results_queue
+
+    def iter_news(self) -> Iterator[ScrappedNewsResult]:
+        """ Yields each new article in the order its fetch completes.
+
+        Later index pages are caught up on while the first page's articles
+        are fetched, their articles are queued behind.
         """
         # resetting tracking attributes each run
-        self.results_queue = []
         self.num_links_found = 0
         self.num_new_links = 0
 
         # getting data (links to be scrapped)
         headlines, links, publish_dates = self._get_headline_data()
-        headline_data = []
-        for headline, link, publish_date in zip(
+        if self._skips_scan():
+            return
+        needs_catch_up = self._needs_catch_up(links)
+        # queueing links for pooled threads, assumes links[0] is latest
+        headline_data = self._get_headline_data_to_scrape(
             headlines, links, publish_dates
-        ):
-            headline_data.append(
-                HeadlineData(
-                    headline=headline,
-                    link=link,
-                    publish_date=publish_date
-                )
-            )
+        )
+        self.num_links_found = len(links)
+        self.worker_pool.resize(self._get_num_threads(len(headline_data)))
 
-        # splitting found links for threads, assumes links[0] is latest
-        latest_index = _get_latest_link_index(links, self.viewed_links)
-        latest_headline_data = headline_data[0:latest_index]
-        split_latest_headline_data = array_split(latest_headline_data, self.num_threads)
-
-        # multi-threaded scrapping
-        threads = []
-        for split_headline_data, i in zip(
-                split_latest_headline_data,
-                range(self.num_threads)
-        ):
-            _split_headline_data = [HeadlineData(*data) for data in split_headline_data]
-            t = threading.Thread(
-                target=self._get_news,
-                args=(_split_headline_data,),
-                name=f"t{i}"
+        # multi-threaded scrapping, each result is queued once scrapped
+        completed = queue.Queue()
+        for hl_data in headline_data:
+            self.worker_pool.submit(self._get_news, hl_data, completed)
+        num_pending = len(headline_data)
+        if needs_catch_up:
+            self._get_catch_up_executor().submit(
+                self._queue_catch_up, links, publish_dates[0], completed
             )
-            threads.append(t)
-        for thread in threads:
-            thread.start()
-        for thread in threads:
-            thread.join()
+            num_pending += 1
 
-        # sorting results by publish date
-        # reverse=True: [0] is latest article
-        self.results_queue.sort(key=lambda x: x.publish_date, reverse=True)
-        self.num_links_found = len(links)
-        self.num_new_links = len(self.results_queue)
+        # adding new links to viewed links tracker as they are yielded
+        while num_pending > 0:
+            result = completed.get()
+            num_pending -= 1
+            if isinstance(result, list):
+                # entries caught up on, scrapped after the queued ones
+                self.num_links_found += len(result)
+                self.worker_pool.resize(
+                    self._get_num_threads(len(headline_data) + len(result))
+                )
+                for hl_data in result:
+                    self.worker_pool.submit(self._get_news, hl_data, completed)
+                num_pending += len(result)
+                continue
+            if self._defer_failed_fetch(
+                HeadlineData(result.headline, result.link, result.publish_date)
+            ):
+                continue
+            self.viewed_links.add(result.link)
+            self.num_new_links += 1
+            yield result
 
-        # adding new links to viewed links tracker
-        for result in self.results_queue:
-            if result.link not in self.viewed_links:
-                self.viewed_links[result.link] = result.publish_date
+    @property
+    def pool_stats(self) -> WorkerPoolStats:
+        """ Utilization of the scrapper's worker pool. """
+        return self.worker_pool.stats()
 
-        return self.results_queue
+    def warm_up(self) -> int:
+        """ Opens a kept-alive connection in the session of each worker
+        thread, so the next scan skips dns, tcp and tls setup.
 
-    def _get_news(self, headline_data: List[HeadlineData]):
-        """ """
-        _links = []
-        for hl_data in headline_data:
-            _links.append(hl_data.link)
+        Each warm up task waits for the others to start, so every worker
+        runs one. Returns the number of connections opened.
+        """
+        num_workers = self.worker_pool.stats().num_workers
+        barrier = threading.Barrier(num_workers)
+        completed = queue.Queue()
 
-        contents = self._get_article_content(_links)
+        def warm_up_worker():
+            opened = False
+            try:
+                barrier.wait(timeout=WARM_UP_TIMEOUT)
+            except threading.BrokenBarrierError:
+                pass
+            try:
+                opened = self._warm_up_connection()
+            finally:
+                completed.put(opened)
 
-        results = []
-        for hl_data, content in zip(headline_data, contents):
-            result = ScrappedNewsResult(
-                headline=hl_data.headline,
-                link=hl_data.link,
-                publish_date=hl_data.publish_date,  #.strftime('%b %d %Y %I:%M %p'),
-                content=content
-            )
-            results.append(result)
+        for _ in range(num_workers):
+            self.worker_pool.submit(warm_up_worker)
+        return sum(completed.get() for _ in range(num_workers))
+
+    def close(self):
+        """ Stops the worker pool and closes kept-alive connections. """
+        self.worker_pool.shutdown()
+        super().close()
+
+    def _get_num_threads(self, num_links: int) -> int:
+        """ Returns the number of threads to scrape num_links with.
 
-        with self.write_lock:
-            self.results_queue.extend(results)
+        Param:
+            num_links: Number of new links to scrape.
+        """
+        if self.concurrency_controller is not None:
+            return self.concurrency_controller.config.ceiling
+        num_threads = math.ceil(num_links / self.links_per_thread)
+        return min(max(num_threads, self.num_threads), self.max_threads)
+
+    def _queue_catch_up(
+        self,
+        links: List[str],
+        latest_publish_date: datetime,
+        completed: queue.Queue
+    ):
+        """ Catches up on later index pages and queues the list of entries
+        to scrape, empty if the crawl failed.
+
+        Params:
+            links: New links of the first index page.
+            latest_publish_date: Publish date of the latest entry.
+            completed: Queue receiving the entries.
+        """
+        catch_up_data = []
+        try:
+            catch_up_data = self._get_catch_up_data_to_scrape(links, latest_publish_date)
+        except Exception as e:
+            _log_catch_up_error(e)
+        finally:
+            completed.put(catch_up_data)
+
+    def _get_news(self, hl_data: HeadlineData, completed: queue.Queue):
+        """ Scrapes an article and queues its result once scrapped.
+
+        Params:
+            hl_data: Index page entry of the article to scrape.
+            completed: Queue receiving the scrapped article.
+        """
+        content = ""
+        try:
+            content = self._get_article_content([hl_data.link])[0]
+        finally:
+            completed.put(
+                ScrappedNewsResult(
+                    headline=hl_data.headline,
+                    link=hl_data.link,
+                    publish_date=hl_data.publish_date,  #.strftime('%b %d %Y %I:%M %p'),
+                    content=content
+                )
+            )
@@ -0,0 +1,143 @@
+""" SimHash fingerprints detecting press releases republished under new links.
+
+Articles whose body fingerprint is within a Hamming distance of a recent
+article's fingerprint are near duplicates, they can be skipped before the
+stock lookup so a release is looked up, stored and alerted once.
+"""
+
+import hashlib
+import re
+import threading
+from collections import deque
+from typing import NamedTuple, Optional, List
+from news_scanner.news_scrapper.target_news_scrapper import ScrappedNewsResult
+from news_scanner.logger.logger import logger
+
+FINGERPRINT_BITS = 64
+
+
+class NearDuplicateConfig(NamedTuple):
+    """ Detection and handling of near duplicate articles.
+
+    Attrs:
+        max_distance: Max Hamming distance between the fingerprints of near
+            duplicates, out of 64 bits.
+        max_entries: Number of recent fingerprints kept.
+        shingle_size: Number of consecutive words hashed together.
+        skip_duplicates: Determines if near duplicates are skipped, they are
+            only logged otherwise.
+    """
+    max_distance: int = 3
+    max_entries: int = 1000
+    shingle_size: int = 3
+    skip_duplicates: bool = True
+
+
+class NearDuplicateStats(NamedTuple):
+    """ Near duplicates found by an index.
+
+    Attrs:
+        num_checked: Number of articles checked.
+        num_duplicates: Number of near duplicates found.
+    """
+    num_checked: int = 0
+    num_duplicates: int = 0
+
+
+class NearDuplicateIndex:
+    """ Bounded index of the fingerprints of recent articles, thread safe. """
+    def __init__(self, config: NearDuplicateConfig = NearDuplicateConfig()):
+        """
+        Params:
+            config: Detection and handling of near duplicates.
+        """
+        self.config = config
+        self._fingerprints = deque(maxlen=config.max_entries)
+        self._num_checked = 0
+        self._num_duplicates = 0
+        self._lock = threading.Lock()
+
+    def check(self, text: str, link: str) -> Optional[str]:
+        """ Returns the link of a recent near duplicate of text, None if the
+        text is new, new texts are added to the index.
+
+        Params:
+            text: Article body.
+            link: Link of the article.
+        """
+        fingerprint = simhash(text, self.config.shingle_size)
+        if fingerprint is None:
+            return None
+        with self._lock:
+            self._num_checked += 1
+            for other_fingerprint, other_link in self._fingerprints:
+                if hamming_distance(fingerprint, other_fingerprint) <= \
+                        self.config.max_distance:
+                    self._num_duplicates += 1
+                    return other_link
+            self._fingerprints.append((fingerprint, link))
+        return None
+
+    def should_skip(self, scrape_result: ScrappedNewsResult) -> bool:
+        """ Returns whether an article is a near duplicate to skip, logging
+        near duplicates.
+
+        Params:
+            scrape_result: Scrapped article.
+        """
+        duplicate_of = self.check(scrape_result.content, scrape_result.link)
+        if duplicate_of is None:
+            return False
+        logger.info(f"Near duplicate article: {scrape_result.link}\n"
+                    f"- duplicate of: {duplicate_of}")
+        return self.config.skip_duplicates
+
+    def stats(self) -> NearDuplicateStats:
+        """ Returns the near duplicates found so far. """
+        with self._lock:
+            return NearDuplicateStats(
+                num_checked=self._num_checked,
+                num_duplicates=self._num_duplicates
+            )
+
+
+def simhash(text: str, shingle_size: int = 3) -> Optional[int]:
+    """ Returns the 64 bit SimHash of the word shingles of text, None if text
+    has no words.
+
+    Each bit is the sign of the sum over shingles of +1 or -1, as set in the
+    shingle's hash, so similar texts differ in few bits.
+
+    Params:
+        text: Text to fingerprint.
+        shingle_size: Number of consecutive words hashed together.
+    """
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return None
+    shingles = [
+        " ".join(words[i:i + shingle_size])
+        for i in range(max(len(words) - shingle_size + 1, 1))
+    ]
+    weights: List[int] = [0] * FINGERPRINT_BITS
+    for shingle in shingles:
+        shingle_hash = int.from_bytes(
+            hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big"
+        )
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if shingle_hash >> bit & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(fingerprint: int, other_fingerprint: int) -> int:
+    """ Returns the number of bits two fingerprints differ in.
+
+    Params:
+        fingerprint: SimHash fingerprint.
+        other_fingerprint: SimHash fingerprint.
+    """
+    return bin(fingerprint ^ other_fingerprint).count("1")
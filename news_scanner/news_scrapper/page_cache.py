@@ -0,0 +1,233 @@
+""" Compressed on-disk cache of fetched pages, kept across restarts.
+
+Page bodies are stored once per content digest as zlib compressed blobs,
+an sqlite index maps each url to its blob, the time it was stored and the
+time it was last read.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import NamedTuple, Optional, Dict, Callable
+from news_scanner.database.constants import DB_DIR
+from news_scanner.logger.logger import logger
+
+INDEX_FILE_NAME = "index.db"
+
+
+class PageCacheConfig(NamedTuple):
+    """ Location, lifetime and size of the page cache.
+
+    Attrs:
+        cache_dir: Directory of the cache index and blobs.
+        index_ttl: Seconds a cached index page is served.
+        article_ttl: Seconds a cached article page is served.
+        max_bytes: Max compressed bytes of cached blobs, least recently read
+            pages are evicted beyond it.
+        compression_level: zlib compression level of blobs.
+    """
+    cache_dir: Path = DB_DIR / "html_cache"
+    index_ttl: float = 30.0
+    article_ttl: float = 3 * 24 * 60 * 60
+    max_bytes: int = 256 * 1024 * 1024
+    compression_level: int = 6
+
+
+class PageCacheStats(NamedTuple):
+    """ Activity and size of the page cache.
+
+    Attrs:
+        hits: Number of reads served from the cache.
+        misses: Number of reads of missing or expired pages.
+        evictions: Number of pages evicted to stay under max_bytes.
+        num_pages: Number of cached pages.
+        size_bytes: Compressed bytes of cached blobs.
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    num_pages: int = 0
+    size_bytes: int = 0
+
+
+class CachedPage(NamedTuple):
+    """ Cached page standing in for the http response it was fetched with.
+
+    Attrs:
+        content: Raw body of the page.
+        status_code: Http status, only successful responses are cached.
+        headers: Response headers, not cached.
+    """
+    content: bytes
+    status_code: int = 200
+    headers: Dict[str, str] = {}
+
+
+class PageCache:
+    """ Url keyed, content addressed cache of page bodies, thread safe. """
+    def __init__(
+        self,
+        config: PageCacheConfig = PageCacheConfig(),
+        clock: Callable[[], float] = time.time
+    ):
+        """ Opens the cache, creating its directory if needed.
+
+        Params:
+            config: Location, lifetime and size of the cache.
+            clock: Wall clock in seconds, cached pages outlive the process.
+        """
+        self.config = config
+        self._clock = clock
+        self._blob_dir = Path(config.cache_dir) / "blobs"
+        self._blob_dir.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(
+            Path(config.cache_dir) / INDEX_FILE_NAME, check_same_thread=False
+        )
+        self._con.executescript(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, digest TEXT, stored_at REAL, accessed_at REAL);"
+            "CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);"
+            "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER);"
+        )
+        self._size = self._con.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs"
+        ).fetchone()[0]
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, ttl: float) -> Optional[bytes]:
+        """ Returns the cached body of url, None if missing or older than ttl.
+
+        Params:
+            url: url the page was fetched from.
+            ttl: Max age in seconds of the cached page.
+        """
+        with self._lock:
+            row = self._con.execute(
+                "SELECT digest, stored_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None or self._clock() - row[1] > ttl:
+                self._misses += 1
+                return None
+            digest = row[0]
+            try:
+                content = zlib.decompress(self._get_blob_path(digest).read_bytes())
+            except (OSError, zlib.error) as e:
+                logger.error(f"Dropping unreadable cached page: {e}\n- url: {url}")
+                self._delete_page(url, digest)
+                self._con.commit()
+                self._misses += 1
+                return None
+            self._con.execute(
+                "UPDATE pages SET accessed_at = ? WHERE url = ?", (self._clock(), url)
+            )
+            self._con.commit()
+            self._hits += 1
+            return content
+
+    def put(self, url: str, content: bytes):
+        """ Caches the body of url, evicting least recently read pages if the
+        cache grows past max_bytes.
+
+        Params:
+            url: url the page was fetched from.
+            content: Raw body of the page.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            if self._con.execute(
+                "SELECT 1 FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone() is None:
+                blob = zlib.compress(content, self.config.compression_level)
+                path = self._get_blob_path(digest)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_bytes(blob)
+                os.replace(tmp_path, path)
+                self._con.execute(
+                    "INSERT INTO blobs (digest, size) VALUES (?, ?)", (digest, len(blob))
+                )
+                self._size += len(blob)
+
+            row = self._con.execute(
+                "SELECT digest FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            now = self._clock()
+            self._con.execute(
+                "INSERT OR REPLACE INTO pages (url, digest, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)", (url, digest, now, now)
+            )
+            if row is not None and row[0] != digest:
+                self._delete_unused_blob(row[0])
+            self._evict()
+            self._con.commit()
+
+    def stats(self) -> PageCacheStats:
+        """ Returns the activity and size of the cache. """
+        with self._lock:
+            num_pages = self._con.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            return PageCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                num_pages=num_pages,
+                size_bytes=self._size
+            )
+
+    def close(self):
+        """ Closes the cache index. """
+        with self._lock:
+            self._con.close()
+
+    def _evict(self):
+        """ Deletes least recently read pages until blobs fit in max_bytes. """
+        while self._size > self.config.max_bytes:
+            row = self._con.execute(
+                "SELECT url, digest FROM pages ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return
+            self._delete_page(*row)
+            self._evictions += 1
+
+    def _delete_page(self, url: str, digest: str):
+        """ Deletes a cached page and its blob if no other page uses it.
+
+        Params:
+            url: url of the cached page.
+            digest: Digest of the page's blob.
+        """
+        self._con.execute("DELETE FROM pages WHERE url = ?", (url,))
+        self._delete_unused_blob(digest)
+
+    def _delete_unused_blob(self, digest: str):
+        """ Deletes a blob no cached page uses anymore.
+
+        Params:
+            digest: Digest of the blob.
+        """
+        if self._con.execute(
+            "SELECT 1 FROM pages WHERE digest = ?", (digest,)
+        ).fetchone() is not None:
+            return
+        row = self._con.execute(
+            "SELECT size FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        if row is None:
+            return
+        self._con.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        self._size -= row[0]
+        self._get_blob_path(digest).unlink(missing_ok=True)
+
+    def _get_blob_path(self, digest: str) -> Path:
+        """ Returns the file of a blob.
+
+        Params:
+            digest: Digest of the blob's page body.
+        """
+        return self._blob_dir / f"{digest}.zz"
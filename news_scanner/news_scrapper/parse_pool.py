@@ -0,0 +1,212 @@
+""" Process pool parsing article pages off the fetching threads.
+
+Parsing is CPU bound and holds the GIL, so fetching threads or tasks hand
+downloaded pages to worker processes and only wait on the result. Only the
+part of a page from the article body onward is sent to a worker.
+"""
+
+import functools
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple, List, Dict, Tuple, Set
+from news_scanner.news_scrapper.html_parser import (
+    HtmlParser,
+    PageSelectors,
+    get_html_parser,
+    DEFAULT_PARSER_BACKEND
+)
+
+# failures of the pool rather than of the page, the page is parsed in process
+POOL_ERRORS = (BrokenProcessPool, pickle.PicklingError)
+# parsers of a worker process, built on first use
+_worker_parsers: Dict[Tuple[str, PageSelectors], HtmlParser] = {}
+
+
+class ParsePoolConfig(NamedTuple):
+    """ Size of the parse pool and of the pages sent to it.
+
+    Attrs:
+        num_workers: Number of parser processes, defaults to the number of
+            cores.
+        max_payload_bytes: Max bytes of a page sent to a worker, larger pages
+            are parsed by the calling thread.
+        start_method: multiprocessing start method of the workers, spawned
+            workers do not inherit the scrapper's threads.
+    """
+    num_workers: int = None
+    max_payload_bytes: int = 1024 * 1024
+    start_method: str = "spawn"
+
+
+class ParsePool:
+    """ Parses article pages in a pool of worker processes.
+
+    Workers are started once and reused across scans until 'close' is called.
+    A pool can be shared by the scrappers of several sites, each passing its
+    own parser with the pages it submits. A pool broken by a worker dying,
+    ex: killed when out of memory, is replaced by a new one.
+    """
+    def __init__(
+        self,
+        config: ParsePoolConfig = ParsePoolConfig(),
+        backend: str = DEFAULT_PARSER_BACKEND,
+        selectors: PageSelectors = PageSelectors()
+    ):
+        """
+        Params:
+            config: Size of the pool and of the pages sent to it.
+            backend: Html parser backend the workers parse with.
+            selectors: Css classes locating the scrapped data.
+        """
+        self.config = config
+        self.num_workers = config.num_workers or os.cpu_count() or 1
+        self.backend = backend
+        self.selectors = selectors
+        self.num_parsed_in_process = 0
+        self.num_restarts = 0
+        self._local_parser = get_html_parser(backend, selectors)
+        self._executor = self._new_executor()
+        # submitted parses not done yet, cancelled on close
+        self._pending: Set[Future] = set()
+        self._pending_lock = threading.Lock()
+
+    def submit_article(self, content: bytes, parser: HtmlParser = None) -> Future:
+        """ Returns a future of the paragraphs of an article page.
+
+        Params:
+            content: Raw html of an article page.
+            parser: Parser of the page's site, its backend and selectors are
+                used by the workers. Defaults to the pool's.
+        """
+        if parser is None:
+            parser = self._local_parser
+        payload = _slice_article_region(content, parser.selectors)
+        if len(payload) > self.config.max_payload_bytes:
+            future = Future()
+            try:
+                future.set_result(self.parse_in_process(content, parser))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        executor = self._executor
+        try:
+            future = executor.submit(
+                _parse_article, parser.name, parser.selectors, payload
+            )
+        except BrokenProcessPool as e:
+            self._replace_executor(executor)
+            future = Future()
+            future.set_exception(e)
+            return future
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(functools.partial(self._on_parse_done, executor))
+        return future
+
+    def parse_article(self, content: bytes, parser: HtmlParser = None) -> List[str]:
+        """ Returns the paragraphs of an article page, blocking until parsed.
+
+        Pages hitting a failure of the pool, see 'POOL_ERRORS', are parsed
+        in process instead.
+
+        Params:
+            content: Raw html of an article page.
+            parser: Parser of the page's site, defaults to the pool's.
+        """
+        try:
+            return self.submit_article(content, parser).result()
+        except POOL_ERRORS:
+            return self.parse_in_process(content, parser)
+
+    def parse_in_process(self, content: bytes, parser: HtmlParser = None) -> List[str]:
+        """ Returns the paragraphs of an article page parsed by the calling
+        thread.
+
+        Params:
+            content: Raw html of an article page.
+            parser: Parser of the page's site, defaults to the pool's.
+        """
+        self.num_parsed_in_process += 1
+        return (parser or self._local_parser).parse_article(content)
+
+    def close(self):
+        """ Cancels parses not started yet and stops the worker processes. """
+        with self._pending_lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        """ Returns a process pool of num_workers workers. """
+        return ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context(self.config.start_method)
+        )
+
+    def _replace_executor(self, executor: ProcessPoolExecutor):
+        """ Replaces a broken process pool, unless it was already replaced.
+
+        Param:
+            executor: Process pool found broken.
+        """
+        with self._pending_lock:
+            if self._executor is not executor:
+                return
+            self._executor = self._new_executor()
+            self.num_restarts += 1
+        executor.shutdown(wait=False)
+
+    def _on_parse_done(self, executor: ProcessPoolExecutor, future: Future):
+        """ Forgets a done parse, replacing the pool if it broke.
+
+        Params:
+            executor: Process pool the parse was submitted to.
+            future: Future returned by 'submit_article'.
+        """
+        with self._pending_lock:
+            self._pending.discard(future)
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._replace_executor(executor)
+
+
+def _slice_article_region(content: bytes, selectors: PageSelectors) -> bytes:
+    """ Returns the page from the tag opening the article body onward.
+
+    The body is located by byte search so no parsing is done. Starting at an
+    earlier div is harmless, the whole page is returned if no div precedes
+    the body class.
+
+    Params:
+        content: Raw html of an article page.
+        selectors: Css classes locating the article body.
+    """
+    body_class = selectors.article_body_class.encode()
+    class_start = content.find(body_class)
+    while class_start != -1:
+        tag_start = content.rfind(b"<div", 0, class_start)
+        if tag_start != -1:
+            return content[tag_start:]
+        # class named outside a div, ex: in a style sheet of the head
+        class_start = content.find(body_class, class_start + len(body_class))
+    return content
+
+
+def _parse_article(backend: str, selectors: PageSelectors, content: bytes) -> List[str]:
+    """ Returns the paragraphs of an article page, run in a worker process.
+
+    Params:
+        backend: Html parser backend to parse with.
+        selectors: Css classes locating the scrapped data.
+        content: Html of the article page, from the article body onward.
+    """
+    key = (backend, selectors)
+    parser = _worker_parsers.get(key)
+    if parser is None:
+        parser = get_html_parser(backend, selectors)
+        _worker_parsers[key] = parser
+    return parser.parse_article(content)
@@ -0,0 +1,160 @@
+""" Token bucket rate limiting of fetches, keyed per host. """
+
+import asyncio
+import threading
+import time
+from typing import NamedTuple, Dict, Callable
+from urllib.parse import urlparse
+
+
+class RateLimitConfig(NamedTuple):
+    """ Sustained rate and burst size of a token bucket.
+
+    Attrs:
+        rate: Requests per second allowed on average.
+        burst: Requests allowed at once after an idle period.
+    """
+    rate: float = 5.0
+    burst: int = 10
+
+
+class RateLimiterStats(NamedTuple):
+    """ Waiting caused by the rate limit of a host.
+
+    Attrs:
+        num_requests: Number of requests that went through the limiter.
+        num_waited: Number of requests that had to wait.
+        total_wait: Total seconds requests waited.
+        max_wait: Longest wait of a single request in seconds.
+    """
+    num_requests: int = 0
+    num_waited: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class TokenBucket:
+    """ Thread safe token bucket handing out reservations.
+
+    A reservation takes a token right away and returns how long the caller
+    must wait before using it, so callers are served in the order they ask
+    and waiting can be done with either 'time.sleep' or 'asyncio.sleep'.
+    """
+    def __init__(
+        self,
+        config: RateLimitConfig,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Params:
+            config: Sustained rate and burst size of the bucket.
+            clock: Monotonic clock in seconds.
+        """
+        self.config = config
+        self._clock = clock
+        self._tokens = float(config.burst)
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """ Takes a token and returns the seconds to wait before using it. """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self._tokens + (now - self._last_refill) * self.config.rate,
+                self.config.burst
+            )
+            self._last_refill = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.config.rate
+
+
+class HostRateLimiter:
+    """ Rate limits requests with one token bucket per host.
+
+    Requests through the scrapper proxy are keyed by the proxy host, so the
+    proxy account limit and the news site are limited separately. One
+    limiter is meant to be shared by every thread or task of a scrapper.
+    """
+    def __init__(
+        self,
+        default_config: RateLimitConfig = RateLimitConfig(),
+        host_configs: Dict[str, RateLimitConfig] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Params:
+            default_config: Rate limit of hosts without their own config.
+            host_configs: Rate limit per host name, ex: "api.scraperapi.com".
+            clock: Monotonic clock in seconds.
+        """
+        self.default_config = default_config
+        self.host_configs = host_configs or {}
+        self._clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, RateLimiterStats] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url: str) -> float:
+        """ Reserves a request to url's host, returns seconds to wait.
+
+        Params:
+            url: url about to be requested.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(
+                    self.host_configs.get(host, self.default_config),
+                    clock=self._clock
+                )
+                self._buckets[host] = bucket
+        delay = bucket.reserve()
+        self._record(host, delay)
+        return delay
+
+    def wait(self, url: str) -> float:
+        """ Blocks until a request to url's host is allowed, returns the wait.
+
+        Params:
+            url: url about to be requested.
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def async_wait(self, url: str) -> float:
+        """ Waits without blocking the event loop, returns the wait.
+
+        Params:
+            url: url about to be requested.
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict[str, RateLimiterStats]:
+        """ Returns the waiting caused by the limiter per host. """
+        with self._lock:
+            return dict(self._stats)
+
+    def _record(self, host: str, delay: float):
+        """ Adds a request's wait to the stats of its host.
+
+        Params:
+            host: Host the request is sent to.
+            delay: Seconds the request waits.
+        """
+        with self._lock:
+            stats = self._stats.get(host, RateLimiterStats())
+            self._stats[host] = RateLimiterStats(
+                num_requests=stats.num_requests + 1,
+                num_waited=stats.num_waited + (delay > 0),
+                total_wait=stats.total_wait + delay,
+                max_wait=max(stats.max_wait, delay)
+            )
@@ -0,0 +1,161 @@
+""" Timeouts, retries and circuit breaking of page fetches. """
+
+import random
+import threading
+import time
+from typing import NamedTuple, Dict, Callable
+
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ResilienceConfig(NamedTuple):
+    """ Timeouts, retries and circuit breaking of fetches.
+
+    Attrs:
+        connect_timeout: Seconds to wait for a connection to be opened.
+        read_timeout: Seconds to wait between bytes of a response.
+        max_retries: Retries of a fetch after a transient failure.
+        backoff_base: Seconds of the first backoff, doubled per retry.
+        backoff_max: Max seconds of a single backoff.
+        failure_threshold: Consecutive failures of a host opening its circuit.
+        reset_timeout: Seconds an open circuit fails fast before a trial
+            fetch is let through.
+        max_scan_attempts: Number of scans an article failing transiently is
+            attempted in before it is given up on.
+    """
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    max_retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    max_scan_attempts: int = 3
+
+
+class TransientFetchError(Exception):
+    """ Raised when a fetch got a response worth retrying, ex: 429 or 503. """
+    def __init__(self, status_code: int, url: str):
+        super().__init__(f"Transient http status {status_code}: {url}")
+        self.status_code = status_code
+
+
+class CircuitOpenError(Exception):
+    """ Raised instead of fetching while a host's circuit is open. """
+
+
+class CircuitBreaker:
+    """ Fails fetches to a host fast once it keeps failing.
+
+    Closed: fetches go through. Open: after failure_threshold consecutive
+    failures, fetches raise 'CircuitOpenError' for reset_timeout seconds.
+    Half open: a single trial fetch is let through, its outcome closes or
+    reopens the circuit.
+    """
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Params:
+            failure_threshold: Consecutive failures opening the circuit.
+            reset_timeout: Seconds the circuit stays open.
+            clock: Monotonic clock in seconds.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._clock = clock
+        self._num_failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self, host: str = ""):
+        """ Raises 'CircuitOpenError' if the fetch should not be sent.
+
+        Params:
+            host: Host of the fetch, used in the error message.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and \
+                    self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                return
+            raise CircuitOpenError(f"Circuit open for host: {host}")
+
+    def record_success(self):
+        """ Closes the circuit after a successful fetch. """
+        with self._lock:
+            self._num_failures = 0
+            self.state = CLOSED
+
+    def record_failure(self):
+        """ Counts a failed fetch, opening the circuit at the threshold. """
+        with self._lock:
+            self._num_failures += 1
+            if self.state == HALF_OPEN or \
+                    self._num_failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = self._clock()
+
+
+class HostCircuitBreakers:
+    """ One 'CircuitBreaker' per host, shared by every thread or task. """
+    def __init__(
+        self,
+        config: ResilienceConfig,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Params:
+            config: Provides the threshold and reset timeout of the breakers.
+            clock: Monotonic clock in seconds.
+        """
+        self.config = config
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        """ Returns the breaker of a host, creating it if needed.
+
+        Params:
+            host: Host name of fetched urls.
+        """
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    failure_threshold=self.config.failure_threshold,
+                    reset_timeout=self.config.reset_timeout,
+                    clock=self._clock
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+
+def get_backoff_delay(
+    attempt: int,
+    config: ResilienceConfig,
+    rand: Callable[[], float] = random.random
+) -> float:
+    """ Returns the seconds to wait before retry number attempt + 1.
+
+    Uses full jitter, a random delay up to the exponential backoff, so
+    retrying threads do not hit the host in lockstep.
+
+    Params:
+        attempt: Number of the failed attempt, starting at 0.
+        config: Provides the backoff base and max.
+        rand: Random float in [0, 1).
+    """
+    backoff = min(config.backoff_max, config.backoff_base * 2 ** attempt)
+    return backoff * rand()
@@ -0,0 +1,237 @@
+""" Persistent index of seen links, kept across restarts.
+
+Each link is stored as a fixed size 64 bit hash with the time it was seen,
+in an sqlite table keyed by the hash. Opening the index reads no links, so
+startup stays fast however many links were seen. An optional bloom filter
+in front of the table answers most lookups of unseen links from memory, it
+is saved to the index when closed and reloaded with the links seen since.
+
+Note: distinct links sharing a 64 bit hash are treated as the same link,
+which is unlikely below billions of links.
+"""
+
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional, Callable, Iterable
+from news_scanner.database.constants import DB_DIR
+
+INDEX_FILE_NAME = "seen_links.db"
+# links read per query when filling the bloom filter
+_LOAD_BATCH_SIZE = 10000
+
+
+class SeenLinkIndexConfig(NamedTuple):
+    """ Location, lifetime and bloom filter of the seen link index.
+
+    Attrs:
+        index_dir: Directory of the index file.
+        max_age: Seconds a link is kept after it was seen, older links are
+            pruned when the index is opened.
+        bloom_capacity: Enables a bloom filter sized for this number of
+            links in front of the index.
+        bloom_error_rate: False positive rate of the bloom filter at its
+            capacity, false positives are settled by the index.
+    """
+    index_dir: Path = DB_DIR / "seen_links"
+    max_age: float = 30 * 24 * 60 * 60
+    bloom_capacity: Optional[int] = None
+    bloom_error_rate: float = 0.001
+
+
+class SeenLinkIndexStats(NamedTuple):
+    """ Size and lookups of the seen link index.
+
+    Attrs:
+        num_links: Number of links in the index.
+        num_lookups: Number of links looked up.
+        num_bloom_skips: Number of lookups answered by the bloom filter
+            without reading the index.
+        num_pruned: Number of links pruned for their age when opened.
+    """
+    num_links: int = 0
+    num_lookups: int = 0
+    num_bloom_skips: int = 0
+    num_pruned: int = 0
+
+
+class BloomFilter:
+    """ Fixed size set of hashes answering 'maybe seen' or 'never seen'. """
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Params:
+            capacity: Number of hashes the filter is sized for.
+            error_rate: False positive rate at capacity.
+        """
+        self.num_bits = max(
+            int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8
+        )
+        self.num_hashes = max(round(self.num_bits / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def add(self, link_hash: int):
+        """ Adds a 64 bit link hash to the filter.
+
+        Param:
+            link_hash: Hash returned by 'hash_link'.
+        """
+        for bit in self._get_bits(link_hash):
+            self.bits[bit >> 3] |= 1 << (bit & 7)
+
+    def __contains__(self, link_hash: int) -> bool:
+        return all(
+            self.bits[bit >> 3] & (1 << (bit & 7))
+            for bit in self._get_bits(link_hash)
+        )
+
+    def _get_bits(self, link_hash: int) -> Iterable[int]:
+        """ Returns the bit positions of a hash, by double hashing its halves.
+
+        Param:
+            link_hash: Hash returned by 'hash_link'.
+        """
+        link_hash &= 0xFFFFFFFFFFFFFFFF
+        h1 = link_hash & 0xFFFFFFFF
+        h2 = (link_hash >> 32) | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+
+class SeenLinkIndex:
+    """ Sqlite table of seen link hashes, thread safe. """
+    def __init__(
+        self,
+        config: SeenLinkIndexConfig = SeenLinkIndexConfig(),
+        clock: Callable[[], float] = time.time
+    ):
+        """ Opens the index, creating its directory if needed, and prunes
+        links older than the max age.
+
+        Params:
+            config: Location, lifetime and bloom filter of the index.
+            clock: Wall clock in seconds, seen links outlive the process.
+        """
+        self.config = config
+        self._clock = clock
+        index_dir = Path(config.index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(index_dir / INDEX_FILE_NAME, check_same_thread=False)
+        self._con.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "CREATE TABLE IF NOT EXISTS seen_links ("
+            "hash INTEGER PRIMARY KEY, seen_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS seen_links_seen_at ON seen_links (seen_at);"
+            "CREATE TABLE IF NOT EXISTS bloom_filter ("
+            "num_bits INTEGER, num_hashes INTEGER, saved_at REAL, bits BLOB);"
+        )
+        with self._con:
+            self._num_pruned = self._con.execute(
+                "DELETE FROM seen_links WHERE seen_at < ?",
+                (self._clock() - config.max_age,)
+            ).rowcount
+        self._num_links = self._con.execute(
+            "SELECT COUNT(*) FROM seen_links"
+        ).fetchone()[0]
+        self._num_lookups = 0
+        self._num_bloom_skips = 0
+        self._lock = threading.Lock()
+        self.bloom_filter = None
+        if config.bloom_capacity is not None:
+            self.bloom_filter = self._load_bloom_filter()
+
+    def add(self, link: str):
+        """ Marks a link as seen, a link seen again keeps its first time.
+
+        Param:
+            link: url of an article.
+        """
+        link_hash = hash_link(link)
+        with self._lock:
+            with self._con:
+                inserted = self._con.execute(
+                    "INSERT OR IGNORE INTO seen_links (hash, seen_at) VALUES (?, ?)",
+                    (link_hash, self._clock())
+                ).rowcount
+            self._num_links += inserted
+            if self.bloom_filter is not None:
+                self.bloom_filter.add(link_hash)
+
+    def stats(self) -> SeenLinkIndexStats:
+        """ Returns the size and lookups of the index. """
+        with self._lock:
+            return SeenLinkIndexStats(
+                num_links=self._num_links,
+                num_lookups=self._num_lookups,
+                num_bloom_skips=self._num_bloom_skips,
+                num_pruned=self._num_pruned
+            )
+
+    def close(self):
+        """ Saves the bloom filter and closes the index file. """
+        with self._lock:
+            if self.bloom_filter is not None:
+                with self._con:
+                    self._con.execute("DELETE FROM bloom_filter")
+                    self._con.execute(
+                        "INSERT INTO bloom_filter VALUES (?, ?, ?, ?)",
+                        (self.bloom_filter.num_bits, self.bloom_filter.num_hashes,
+                         self._clock(), bytes(self.bloom_filter.bits))
+                    )
+            self._con.close()
+
+    def _load_bloom_filter(self) -> BloomFilter:
+        """ Returns the bloom filter saved by the last close, with the links
+        seen since, or a filter of every link when none of its size was
+        saved.
+
+        Pruned links are left in a saved filter, the index settles them.
+        """
+        bloom_filter = BloomFilter(
+            capacity=self.config.bloom_capacity, error_rate=self.config.bloom_error_rate
+        )
+        saved_at = None
+        row = self._con.execute(
+            "SELECT num_bits, num_hashes, saved_at, bits FROM bloom_filter"
+        ).fetchone()
+        if row is not None and tuple(row[:2]) == (bloom_filter.num_bits, bloom_filter.num_hashes):
+            saved_at = row[2]
+            bloom_filter.bits = bytearray(row[3])
+        if saved_at is None:
+            cursor = self._con.execute("SELECT hash FROM seen_links")
+        else:
+            # links added after the save, ex: when the process was killed
+            cursor = self._con.execute(
+                "SELECT hash FROM seen_links WHERE seen_at >= ?", (saved_at,)
+            )
+        for rows in iter(lambda: cursor.fetchmany(_LOAD_BATCH_SIZE), []):
+            for (link_hash,) in rows:
+                bloom_filter.add(link_hash)
+        return bloom_filter
+
+    def __contains__(self, link: str) -> bool:
+        link_hash = hash_link(link)
+        with self._lock:
+            self._num_lookups += 1
+            if self.bloom_filter is not None and link_hash not in self.bloom_filter:
+                self._num_bloom_skips += 1
+                return False
+            return self._con.execute(
+                "SELECT 1 FROM seen_links WHERE hash = ?", (link_hash,)
+            ).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._num_links
+
+
+def hash_link(link: str) -> int:
+    """ Returns the signed 64 bit hash a link is stored as.
+
+    Param:
+        link: url of an article.
+    """
+    digest = hashlib.blake2b(link.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
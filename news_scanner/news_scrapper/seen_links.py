@@ -0,0 +1,145 @@
+""" Bounded store of the article links a scrapper has seen.
+
+Links are kept in the order they were seen, so links older than a max age
+and links past a max number of entries are evicted from the front in
+constant time. Long running scanners keep a steady memory footprint while
+each lookup stays O(1).
+
+A persistent 'SeenLinkIndex' can back the store, so links seen before a
+restart are not scrapped again.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Callable, Iterator, Optional
+from news_scanner.news_scrapper.seen_link_index import SeenLinkIndex
+
+DEFAULT_MAX_SEEN_LINKS = 50000
+DEFAULT_SEEN_LINK_MAX_AGE = 7 * 24 * 60 * 60.0
+
+
+class SeenLinkConfig(NamedTuple):
+    """ Bounds of a seen link store, None disables a bound.
+
+    Links must be kept at least as long as they are listed on the index
+    page, or they are scrapped again.
+
+    Attrs:
+        max_entries: Max number of links kept, the oldest are evicted first.
+        max_age: Seconds a link is kept after it was seen.
+    """
+    max_entries: Optional[int] = DEFAULT_MAX_SEEN_LINKS
+    max_age: Optional[float] = DEFAULT_SEEN_LINK_MAX_AGE
+
+
+class SeenLinkStats(NamedTuple):
+    """ Size and evictions of a seen link store.
+
+    Attrs:
+        num_entries: Number of links kept.
+        num_added: Number of links added.
+        num_expired: Number of links evicted for their age.
+        num_evicted: Number of links evicted for the max number of entries.
+    """
+    num_entries: int = 0
+    num_added: int = 0
+    num_expired: int = 0
+    num_evicted: int = 0
+
+
+class SeenLinkStore:
+    """ Set of seen links evicting by age and number of entries, thread safe. """
+    def __init__(
+        self,
+        config: SeenLinkConfig = SeenLinkConfig(),
+        clock: Callable[[], float] = time.monotonic,
+        index: SeenLinkIndex = None
+    ):
+        """
+        Params:
+            config: Bounds of the store.
+            clock: Returns the current time in seconds.
+            index: Optional persistent index links are also added to and
+                looked up in, the store's bounds do not apply to it.
+        """
+        self.config = config
+        self.clock = clock
+        self.index = index
+        # link -> time seen, oldest first
+        self._links: OrderedDict[str, float] = OrderedDict()
+        self._num_added = 0
+        self._num_expired = 0
+        self._num_evicted = 0
+        self._lock = threading.Lock()
+
+    def add(self, link: str):
+        """ Marks a link as seen, a link seen again keeps its first time.
+
+        Param:
+            link: url of an article.
+        """
+        if self.index is not None:
+            self.index.add(link)
+        with self._lock:
+            self._expire()
+            if link in self._links:
+                return
+            self._links[link] = self.clock()
+            self._num_added += 1
+            max_entries = self.config.max_entries
+            while max_entries is not None and len(self._links) > max_entries:
+                self._links.popitem(last=False)
+                self._num_evicted += 1
+
+    def clear(self):
+        """ Forgets every seen link kept in memory. """
+        with self._lock:
+            self._links.clear()
+
+    def stats(self) -> SeenLinkStats:
+        """ Returns the size and evictions of the store. """
+        with self._lock:
+            self._expire()
+            return SeenLinkStats(
+                num_entries=len(self._links),
+                num_added=self._num_added,
+                num_expired=self._num_expired,
+                num_evicted=self._num_evicted
+            )
+
+    def __contains__(self, link: str) -> bool:
+        with self._lock:
+            self._expire()
+            if link in self._links:
+                return True
+        return self.index is not None and link in self.index
+
+    def __bool__(self) -> bool:
+        """ Returns whether any link was seen, including links of previous
+        runs kept by the index. """
+        return len(self) > 0 or (self.index is not None and len(self.index) > 0)
+
+    def __len__(self) -> int:
+        """ Returns the number of links kept in memory. """
+        with self._lock:
+            self._expire()
+            return len(self._links)
+
+    def __iter__(self) -> Iterator[str]:
+        """ Yields the seen links, oldest first. """
+        with self._lock:
+            self._expire()
+            return iter(list(self._links))
+
+    def _expire(self):
+        """ Evicts links older than the max age, the lock must be held. """
+        if self.config.max_age is None:
+            return
+        cutoff = self.clock() - self.config.max_age
+        while self._links:
+            link, seen_time = next(iter(self._links.items()))
+            if seen_time > cutoff:
+                return
+            del self._links[link]
+            self._num_expired += 1
@@ -0,0 +1,86 @@
+""" Pool of keep-alive http sessions shared by the news scrappers. """
+
+import threading
+from typing import List
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10
+
+
+class SessionPool:
+    """ Hands out one keep-alive 'requests.Session' per thread.
+
+    Each session mounts an 'HTTPAdapter' whose connection pool keeps TCP and
+    TLS connections open between requests, so repeated fetches to the same
+    host (news site or proxy) skip the connect and handshake round trips.
+    Sessions are thread local as 'requests.Session' is not guaranteed to be
+    thread safe.
+    """
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        adapter: BaseAdapter = None
+    ):
+        """ Initializes an empty pool, sessions are created on first use.
+
+        Params:
+            pool_size: Max number of kept-alive connections per host for
+                each session.
+            adapter: Optional thread safe adapter mounted on every session
+                instead of a pooling 'HTTPAdapter', ex: to replay recorded
+                responses.
+        """
+        self.pool_size = pool_size
+        self.adapter = adapter
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._lock = threading.Lock()
+
+    def get_session(self) -> requests.Session:
+        """ Returns the calling thread's session, creating it if needed. """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._create_session()
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def release_session(self):
+        """ Closes and forgets the calling thread's session, ex: when the
+        thread exits, so its connections are not kept open. """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            return
+        self._local.session = None
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        session.close()
+
+    @property
+    def num_sessions(self) -> int:
+        """ Number of open sessions of the pool. """
+        with self._lock:
+            return len(self._sessions)
+
+    def close(self):
+        """ Closes every session and its pooled connections. """
+        with self._lock:
+            sessions = self._sessions
+            self._sessions = []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+
+    def _create_session(self) -> requests.Session:
+        """ Returns a session with keep-alive connection pooling. """
+        session = requests.Session()
+        adapter = self.adapter or HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
@@ -1,17 +1,51 @@
 """ Functions and classes to scrape a target website's news article data. """
 
-import bs4
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 import requests
-from typing import List, Tuple, NamedTuple, Union, Dict
+from requests.adapters import BaseAdapter
+from typing import List, Tuple, NamedTuple, Dict, Iterator, Set, Optional, Container, Callable
 from datetime import datetime, timedelta
 from news_scanner.logger.logger import logger
-from urllib.parse import urlencode
+from news_scanner.news_scrapper.session_pool import SessionPool, DEFAULT_POOL_SIZE
+from news_scanner.news_scrapper.rate_limiter import HostRateLimiter
+from news_scanner.news_scrapper.resilience import (
+    ResilienceConfig,
+    HostCircuitBreakers,
+    TransientFetchError,
+    CircuitOpenError,
+    RETRY_STATUS_CODES,
+    get_backoff_delay
+)
+from news_scanner.news_scrapper.hedging import HedgeConfig, RequestHedger
+from news_scanner.news_scrapper.html_parser import (
+    get_html_parser,
+    PageSelectors,
+    DEFAULT_PARSER_BACKEND,
+    PageStructureError
+)
+from news_scanner.news_scrapper.parse_pool import ParsePool, ParsePoolConfig
+from news_scanner.news_scrapper.feed_parser import iter_feed_entries, parse_feed_date
+from news_scanner.news_scrapper.catch_up import CatchUpConfig, get_index_page_url
+from news_scanner.news_scrapper.seen_links import SeenLinkStore, SeenLinkConfig
+from news_scanner.news_scrapper.seen_link_index import SeenLinkIndex, SeenLinkIndexConfig
+from news_scanner.news_scrapper.headline_classifier import (
+    HeadlineClassifier,
+    HeadlinePriorityConfig
+)
+from news_scanner.news_scrapper.page_cache import PageCache, PageCacheConfig, CachedPage
+from urllib.parse import urlencode, urlparse
 
 TIME_FORMAT = "%b %d, %Y %I:%M %p %Z"
-
-# TO DO:
-# - Shorten latest link search by setting a cap to the number of links to look back.
-#     - Add as init parameter.
+INDEX_PATH = "/news"
+PROXY_URL = "http://api.scraperapi.com/"
+INDEX_SECTION_START = b'class="market-news__results"'
+INDEX_SECTION_END = b'</section>'
+# errors after which a fetch is retried
+TRANSIENT_ERRORS = (requests.RequestException, TransientFetchError)
+HEDGE_MAX_WORKERS = 64
 
 
 class ScrappedNewsResult(NamedTuple):
@@ -29,91 +63,812 @@ class ScrappedNewsResult(NamedTuple):
     content: str = "content"
 
 
+class HeadlineData(NamedTuple):
+    """ Index page entry of an article that is yet to be scrapped.
+
+    Attrs:
+        headline: Headline of article.
+        link: Link to article.
+        publish_date: Date and time article was published.
+    """
+    headline: str
+    link: str
+    publish_date: datetime
+
+
 class TargetNewsScrapper:
     """ Scrapes and tracks stock news data."""
     def __init__(
         self,
         website_url: str,
         scrapper_api_key: str,
-        proxy_on: bool = False
+        proxy_on: bool = False,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        rate_limiter: HostRateLimiter = None,
+        resilience_config: ResilienceConfig = ResilienceConfig(),
+        hedge_config: HedgeConfig = None,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        max_look_back: int = None,
+        parse_pool_config: ParsePoolConfig = None,
+        parse_pool: ParsePool = None,
+        hedge_executor: ThreadPoolExecutor = None,
+        page_cache_config: PageCacheConfig = None,
+        adapter: BaseAdapter = None,
+        selectors: PageSelectors = PageSelectors(),
+        index_path: str = INDEX_PATH,
+        time_format: str = TIME_FORMAT,
+        feed_url: str = None,
+        catch_up_config: CatchUpConfig = None,
+        seen_link_config: SeenLinkConfig = SeenLinkConfig(),
+        seen_link_index_config: SeenLinkIndexConfig = None,
+        headline_priority_config: HeadlinePriorityConfig = None,
+        on_new_headlines: Callable[[List["HeadlineData"]], None] = None
     ):
+        """ Initializes scrapper state and its http session pool.
+
+        Params:
+            website_url: Base url of the target news site.
+            scrapper_api_key: Api key of the scrapper api proxy.
+            proxy_on: Determines if requests are sent through the proxy.
+            pool_size: Max number of kept-alive connections per host.
+            rate_limiter: Optional limiter every fetch waits on, keyed by the
+                news site or proxy host.
+            resilience_config: Timeouts, retries and circuit breaking of
+                fetches.
+            hedge_config: Enables hedging of article fetches slower than a
+                percentile of recent fetches.
+            parser_backend: Html parser backend of index and article pages,
+                one of "lxml", "strainer" or "html.parser".
+            max_look_back: Max number of index entries read per scan, all
+                entries up to the latest viewed link are read by default.
+            parse_pool_config: Enables parsing article pages in a pool of
+                worker processes instead of the thread fetching them.
+            parse_pool: Optional parse pool shared with other scrappers, used
+                instead of one built from parse_pool_config. It is not
+                closed by the scrapper.
+            hedge_executor: Optional executor of hedges shared with other
+                scrappers. It is not shut down by the scrapper.
+            page_cache_config: Enables an on-disk cache of fetched pages,
+                kept across restarts.
+            adapter: Optional requests adapter used instead of the network,
+                ex: a 'ReplayAdapter' of an http archive.
+            selectors: Css classes locating the scrapped data of the site.
+            index_path: Path of the site's news index page.
+            time_format: Format of the publish times of the index page.
+            feed_url: Enables discovering new articles from an RSS or Atom
+                feed instead of the index page, article bodies are still
+                scrapped from their html pages.
+            catch_up_config: Enables reading later index pages when every
+                entry of the first page is new, their articles are fetched
+                after the first page's.
+            seen_link_config: Max number and age of the viewed links kept.
+            seen_link_index_config: Enables persisting viewed links, so
+                articles seen before a restart are not scrapped again.
+            headline_priority_config: Enables fetching the new articles of a
+                scan from the highest headline score to the lowest instead of
+                latest first.
+            on_new_headlines: Called with the entries of each scan once the
+                index is read, and with the entries caught up on, before
+                their articles are fetched.
+        """
         self.website_url = website_url
+        # page listing the articles, the feed when one is set
+        self.index_url = feed_url or website_url + index_path
+        self.time_format = time_format
+        self.feed_url = feed_url
+        self.catch_up_config = catch_up_config
+        self._catch_up_executor = None
+        # set once the last index page read had no viewed link
+        self._index_gap = False
+        self._index_section_start = f'class="{selectors.index_section_class}"'.encode()
         self.scrapper_api_key = scrapper_api_key
         self.proxy_on = proxy_on
-        self.viewed_links = []
+        self.session_pool = SessionPool(pool_size=pool_size, adapter=adapter)
+        self.rate_limiter = rate_limiter
+        self.resilience_config = resilience_config
+        self.circuit_breakers = HostCircuitBreakers(config=resilience_config)
+        self.hedger = RequestHedger(hedge_config) if hedge_config else None
+        self._hedge_executor = hedge_executor
+        self._owns_hedge_executor = hedge_executor is None
+        self.html_parser = get_html_parser(parser_backend, selectors)
+        self.max_look_back = max_look_back
+        self.parse_pool = parse_pool
+        self._owns_parse_pool = parse_pool is None
+        if parse_pool is None and parse_pool_config is not None:
+            self.parse_pool = ParsePool(
+                config=parse_pool_config,
+                backend=self.html_parser.name,
+                selectors=self.html_parser.selectors
+            )
+        self.page_cache = None
+        if page_cache_config is not None:
+            self.page_cache = PageCache(config=page_cache_config)
+        # set by scrappers fetching concurrently
+        self.concurrency_controller = None
+        self.seen_link_index = None
+        if seen_link_index_config is not None:
+            self.seen_link_index = SeenLinkIndex(config=seen_link_index_config)
+        self.viewed_links = SeenLinkStore(
+            config=seen_link_config, index=self.seen_link_index
+        )
+        self.on_new_headlines = on_new_headlines
+        self.headline_classifier = None
+        if headline_priority_config is not None:
+            self.headline_classifier = HeadlineClassifier(config=headline_priority_config)
         self.num_links_found = 0
         self.num_new_links = 0
 
+        # change detection of the index page between scans
+        self.index_changed = True
+        self._index_etag = None
+        self._index_last_modified = None
+        self._index_digest = None
+        # set when the last index fetch failed, the scan fetches no article
+        self._index_fetch_failed = False
+
+        # articles whose fetch failed transiently, attempted again next scan
+        self._failed_links: Set[str] = set()
+        self._retry_headline_data: Dict[str, HeadlineData] = {}
+        self._scan_attempts: Dict[str, int] = {}
+        self._retry_lock = threading.Lock()
+
     def get_news(self) -> List[ScrappedNewsResult]:
         """ Returns the headline, link and content of a each article.
 
-        Note: [0] of return result is latest link.
+        Note: [0] of return result is latest link, or the highest scored
+            headline when a headline classifier is set. Callers relying on
+            date order must then sort by publish date.
+        """
+        return list(self.iter_news())
+
+    def iter_news(self) -> Iterator[ScrappedNewsResult]:
+        """ Yields each new article as soon as its content is scrapped.
 
+        Note: latest article is yielded first, or the highest scored
+            headline when a headline classifier is set. Entries caught up
+            on from later index pages are yielded after the first page's.
         """
+        self.num_links_found = 0
+        self.num_new_links = 0
         headlines, links, publish_dates = self._get_headline_data()
-        latest_index = _get_latest_link_index(links, self.viewed_links)
-        contents = self._get_article_content(links[0:latest_index])
-
-        results = []
-        for headline, link, publish_date, content in zip(
-            headlines[0:latest_index], links[0:latest_index],
-            publish_dates[0:latest_index], contents
-        ):
-            result = ScrappedNewsResult(
-                headline=headline,
-                link=link,
-                publish_date=publish_date.strftime('%b %d %Y %I:%M %p'),
+        if self._skips_scan():
+            return
+        needs_catch_up = self._needs_catch_up(links)
+        headline_data = self._get_headline_data_to_scrape(
+            headlines, links, publish_dates
+        )
+        self.num_links_found = len(links)
+        yield from self._iter_scrapped_news(headline_data)
+
+        if needs_catch_up:
+            catch_up_data = self._get_catch_up_data_to_scrape(links, publish_dates[0])
+            self.num_links_found += len(catch_up_data)
+            yield from self._iter_scrapped_news(catch_up_data)
+
+    def _iter_scrapped_news(
+        self,
+        headline_data: List[HeadlineData]
+    ) -> Iterator[ScrappedNewsResult]:
+        """ Yields the article of each index entry, one at a time.
+
+        Param:
+            headline_data: Index entries to scrape, in order.
+        """
+        for hl_data in headline_data:
+            content = self._get_article_content([hl_data.link])[0]
+            if self._defer_failed_fetch(hl_data):
+                continue
+            self.viewed_links.add(hl_data.link)
+            self.num_new_links += 1
+            yield ScrappedNewsResult(
+                headline=hl_data.headline,
+                link=hl_data.link,
+                publish_date=hl_data.publish_date.strftime('%b %d %Y %I:%M %p'),
                 content=content
             )
-            results.append(result)
-            self.viewed_links.append(link)
 
-        self.num_links_found = len(links)
-        self.num_new_links = len(results)
+    def warm_up(self) -> int:
+        """ Opens a kept-alive connection to the host scans fetch from, the
+        proxy when it is on, so the next scan skips dns, tcp and tls setup.
+
+        The connection is opened by the calling thread's session. Returns
+        the number of connections opened, failures are logged.
+        """
+        return int(self._warm_up_connection())
+
+    def close(self):
+        """ Closes kept-alive connections held by the scrapper. """
+        if self._hedge_executor is not None and self._owns_hedge_executor:
+            self._hedge_executor.shutdown(wait=False)
+        if self._catch_up_executor is not None:
+            self._catch_up_executor.shutdown(wait=False)
+        if self.parse_pool is not None and self._owns_parse_pool:
+            self.parse_pool.close()
+        if self.page_cache is not None:
+            self.page_cache.close()
+        if self.seen_link_index is not None:
+            self.seen_link_index.close()
+        self.session_pool.close()
+
+    def _get_headline_data_to_scrape(
+        self,
+        headlines: List[str],
+        links: List[str],
+        publish_dates: List[datetime]
+    ) -> List[HeadlineData]:
+        """ Returns the unseen index entries, latest first, followed by entries
+        whose fetch failed transiently in a previous scan. Entries are ordered
+        by headline score instead when a headline classifier is set.
+
+        Params:
+            headlines: Headlines of the index page.
+            links: Links of the index page, links[0] is latest.
+            publish_dates: Publish dates of the index page.
+        """
+        latest_index = _get_latest_link_index(links, self.viewed_links)
+        headline_data = [
+            HeadlineData(headline=headline, link=link, publish_date=publish_date)
+            for headline, link, publish_date in zip(
+                headlines[0:latest_index], links[0:latest_index],
+                publish_dates[0:latest_index]
+            )
+        ]
+        new_links = set(links[0:latest_index])
+        with self._retry_lock:
+            for link, hl_data in self._retry_headline_data.items():
+                if link not in new_links:
+                    headline_data.append(hl_data)
+        return self._prioritize_headline_data(headline_data)
+
+    def _get_catch_up_data_to_scrape(
+        self,
+        links: List[str],
+        latest_publish_date: datetime
+    ) -> List[HeadlineData]:
+        """ Returns the new entries of later index pages, latest first, or by
+        headline score when a headline classifier is set.
+
+        Caught up entries are scrapped after the first page's and scored
+        among themselves, so older backlog never goes ahead of fresh news.
+
+        Params:
+            links: New links of the first index page.
+            latest_publish_date: Publish date of the latest entry.
+        """
+        return self._prioritize_headline_data(
+            self._catch_up(links, latest_publish_date)
+        )
+
+    def _prioritize_headline_data(
+        self,
+        headline_data: List[HeadlineData]
+    ) -> List[HeadlineData]:
+        """ Returns index entries in the order they are scrapped, calling
+        'on_new_headlines' with them.
+
+        Param:
+            headline_data: Index entries to scrape, latest first.
+        """
+        if self.headline_classifier is not None:
+            headline_data = self.headline_classifier.prioritize(headline_data)
+        if self.on_new_headlines is not None and headline_data:
+            self.on_new_headlines(headline_data)
+        return headline_data
+
+    def _skips_scan(self) -> bool:
+        """ Returns whether no article is fetched this scan, as the index
+        fetch failed, or the index is unchanged and no failed fetch is
+        attempted again. """
+        if self._index_fetch_failed:
+            return True
+        return not self.index_changed and not self._has_failed_fetches()
+
+    def _has_failed_fetches(self) -> bool:
+        """ Returns whether articles whose fetch failed transiently are
+        attempted this scan, even when the index is unchanged. """
+        with self._retry_lock:
+            return len(self._retry_headline_data) > 0
+
+    def _defer_failed_fetch(self, hl_data: HeadlineData) -> bool:
+        """ Returns whether a scrapped article is deferred to the next scan.
+
+        An article whose fetch failed transiently is not treated as viewed
+        until it was attempted in max_scan_attempts scans.
+
+        Param:
+            hl_data: Index page entry of the scrapped article.
+        """
+        link = hl_data.link
+        with self._retry_lock:
+            if link not in self._failed_links:
+                self._retry_headline_data.pop(link, None)
+                self._scan_attempts.pop(link, None)
+                return False
+            self._failed_links.discard(link)
+            attempts = self._scan_attempts.get(link, 0) + 1
+            if attempts >= self.resilience_config.max_scan_attempts:
+                self._retry_headline_data.pop(link, None)
+                self._scan_attempts.pop(link, None)
+                return False
+            self._scan_attempts[link] = attempts
+            self._retry_headline_data[link] = hl_data
+            return True
+
+    def _mark_failed_fetch(self, link: str):
+        """ Records that the fetch of an article failed transiently.
+
+        Param:
+            link: url to the article.
+        """
+        with self._retry_lock:
+            self._failed_links.add(link)
+
+    def _get_page_with_retries(
+        self,
+        link: str,
+        headers: Dict[str, str] = None,
+        hedged: bool = False
+    ) -> requests.Response:
+        """ Returns the http response of a webpage, retrying transient failures.
+
+        Retries use jittered exponential backoff. Fetches to a host whose
+        circuit is open raise 'CircuitOpenError' without being sent. Pages
+        in the page cache are returned without being fetched.
+
+        Param:
+            link: url to a webpage.
+            headers: Optional request headers, forwarded by the proxy.
+            hedged: Determines if attempts are hedged when hedging is on.
+        """
+        cached_page = self._get_cached_page(link)
+        if cached_page is not None:
+            return cached_page
+        host = urlparse(link).netloc
+        breaker = self.circuit_breakers.get(host)
+        max_retries = self.resilience_config.max_retries
+        for attempt in range(max_retries + 1):
+            breaker.before_request(host)
+            try:
+                if hedged and self.hedger is not None:
+                    page = self._get_hedged_page(link, headers)
+                else:
+                    page = self._get_page(link, headers)
+                if page.status_code in RETRY_STATUS_CODES:
+                    raise TransientFetchError(page.status_code, link)
+            except TRANSIENT_ERRORS:
+                breaker.record_failure()
+                if attempt == max_retries:
+                    raise
+                time.sleep(get_backoff_delay(attempt, self.resilience_config))
+                continue
+            breaker.record_success()
+            self._cache_page(link, page)
+            return page
+
+    def _get_cached_page(self, link: str) -> Optional[CachedPage]:
+        """ Returns the cached page of link, None if not cached or expired.
+
+        Param:
+            link: url to a webpage.
+        """
+        if self.page_cache is None:
+            return None
+        config = self.page_cache.config
+        ttl = config.index_ttl if self._is_index_page(link) \
+            else config.article_ttl
+        content = self.page_cache.get(link, ttl)
+        return None if content is None else CachedPage(content=content)
+
+    def _cache_page(self, link: str, page):
+        """ Stores a successfully fetched page in the page cache, if one is set.
+
+        Param:
+            link: url to a webpage.
+            page: http response of the webpage.
+        """
+        if self.page_cache is not None and page.status_code == 200:
+            self.page_cache.put(link, page.content)
+
+    def _get_hedged_page(
+        self,
+        link: str,
+        headers: Dict[str, str] = None
+    ) -> requests.Response:
+        """ Returns the response of a fetch, or of its hedge if the fetch
+        failed transiently after the hedge was sent, ex: a connection stuck
+        until its read timeout.
+
+        The fetch runs on the calling thread, so it uses the thread's pooled
+        and warmed session. Only the hedge runs on the hedge executor, sent
+        if the fetch is still running after the hedger's delay and the hedge
+        budget allows.
+
+        Param:
+            link: url to a webpage.
+            headers: Optional request headers, forwarded by the proxy.
+        """
+        hedger = self.hedger
+        delay = hedger.start_request()
+        start = time.perf_counter()
+        if delay is None:
+            page = self._get_page(link, headers)
+            hedger.record_latency(time.perf_counter() - start)
+            return page
+
+        fetch_done = threading.Event()
+        hedge = self._get_hedge_executor().submit(
+            self._send_hedge, link, headers, delay, fetch_done
+        )
+        page = None
+        error = None
+        try:
+            page = self._get_page(link, headers)
+        except TRANSIENT_ERRORS as e:
+            error = e
+        fetch_done.set()
+        if error is not None or page.status_code in RETRY_STATUS_CODES:
+            hedge_page = hedge.result()
+            if hedge_page is not None:
+                hedger.record_hedge_win()
+                hedger.record_latency(time.perf_counter() - start)
+                return hedge_page
+            if error is not None:
+                raise error
+        hedger.record_latency(time.perf_counter() - start)
+        return page
+
+    def _send_hedge(
+        self,
+        link: str,
+        headers: Dict[str, str],
+        delay: float,
+        fetch_done: threading.Event
+    ) -> Optional[requests.Response]:
+        """ Returns the response of a hedge sent once the fetch ran for
+        delay, None if it was not sent or failed.
+
+        Params:
+            link: url to a webpage.
+            headers: Optional request headers, forwarded by the proxy.
+            delay: Seconds the fetch runs before it is hedged.
+            fetch_done: Set once the fetch returned or failed.
+        """
+        if fetch_done.wait(delay) or not self.hedger.acquire_hedge():
+            return None
+        try:
+            page = self._get_page(link, headers, self._get_hedge_proxy_on())
+        except TRANSIENT_ERRORS:
+            return None
+        if page.status_code in RETRY_STATUS_CODES:
+            return None
+        return page
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """ Returns the executor running hedged fetches, creating it if needed. """
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="hedge"
+            )
+        return self._hedge_executor
+
+    def _get_hedge_proxy_on(self) -> bool:
+        """ Returns whether hedges are sent through the proxy. """
+        return self.proxy_on or self.hedger.config.via_proxy
+
+    def _get_page(
+        self,
+        link: str,
+        headers: Dict[str, str] = None,
+        proxy_on: bool = None
+    ) -> requests.Response:
+        """ Returns the http response of a webpage.
+
+        When a rate limiter is set, the fetch first waits for its host's
+        token. When a concurrency controller is set, the fetch then waits for
+        a slot under its limit and reports its latency and status back to it.
+
+        Param:
+            link: url to a webpage.
+            headers: Optional request headers, forwarded by the proxy.
+            proxy_on: Overrides whether the request goes through the proxy.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(self._get_request_url(link, proxy_on))
+        controller = self.concurrency_controller
+        if controller is None:
+            return self._request_page(link, headers, proxy_on)
+        with controller:
+            start = time.perf_counter()
+            status_code = None
+            try:
+                page = self._request_page(link, headers, proxy_on)
+                status_code = page.status_code
+                return page
+            finally:
+                controller.record(time.perf_counter() - start, status_code)
+
+    def _get_request_url(self, link: str, proxy_on: bool = None) -> str:
+        """ Returns the url a request for link is sent to.
+
+        Param:
+            link: url to a webpage.
+            proxy_on: Overrides whether the request goes through the proxy.
+        """
+        if proxy_on is None:
+            proxy_on = self.proxy_on
+        return PROXY_URL if proxy_on else link
 
-        return results
+    def _request_page(
+        self,
+        link: str,
+        headers: Dict[str, str] = None,
+        proxy_on: bool = None
+    ) -> requests.Response:
+        """ Sends the request for a webpage, directly or through the proxy.
 
-    def _get_page_content(self, link: str) -> bs4.BeautifulSoup:
-        """ Returns the html contents of a webpage.
+        Requests reuse the calling thread's pooled keep-alive session.
 
         Param:
             link: url to a webpage.
+            headers: Optional request headers, forwarded by the proxy.
+            proxy_on: Overrides whether the request goes through the proxy.
         """
-        if self.proxy_on:
+        session = self.session_pool.get_session()
+        if proxy_on is None:
+            proxy_on = self.proxy_on
+        if proxy_on:
             params = {'api_key': self.scrapper_api_key, 'url': link}
-            page = requests.get('http://api.scraperapi.com/', params=urlencode(params))
-            html_content = bs4.BeautifulSoup(page.content, features="html.parser")
-        else:
-            page = requests.get(url=link)
-            html_content = bs4.BeautifulSoup(page.content, features="html.parser")
+            if headers:
+                params['keep_headers'] = 'true'
+            return session.get(
+                PROXY_URL, params=urlencode(params), headers=headers,
+                timeout=self._get_timeout()
+            )
+        return session.get(url=link, headers=headers, timeout=self._get_timeout())
+
+    def _warm_up_connection(self) -> bool:
+        """ Returns whether a connection was opened by a request of the
+        calling thread's session to the warm up url. """
+        url = self._get_warm_up_url()
+        try:
+            self.session_pool.get_session().head(url, timeout=self._get_timeout())
+        except requests.RequestException as e:
+            logger.warning(f"Warm up request failed: {e}\n- url: {url}")
+            return False
+        return True
+
+    def _get_warm_up_url(self) -> str:
+        """ Returns the url warm up requests are sent to. """
+        return PROXY_URL if self.proxy_on else self.index_url
 
-        return html_content
+    def _get_timeout(self) -> Tuple[float, float]:
+        """ Returns the connect and read timeouts of a request. """
+        return (
+            self.resilience_config.connect_timeout,
+            self.resilience_config.read_timeout
+        )
 
     def _get_headline_data(self) -> Tuple[List[str], List[str], List[datetime]]:
-        """ Returns parallel lists of headlines, links and publish date.
+        """ Returns parallel lists of headlines, links and publish date of the
+        index entries newer than the latest viewed link.
+
+        Lists are empty when the index page is unchanged since last scan.
+        Later index pages are caught up on once the first page's articles
+        are queued, see '_get_catch_up_data_to_scrape'.
+        A failed index fetch is treated as an unchanged index, so the
+        scanner keeps polling while the host's circuit is open.
 
         Note: could get time tag contents, already converted to CDT
         """
-        link = self.website_url + "/news"
+        self._index_fetch_failed = False
+        try:
+            page = self._get_page_with_retries(
+                self.index_url,
+                headers=self._get_index_request_headers()
+            )
+        except (*TRANSIENT_ERRORS, CircuitOpenError) as e:
+            _log_index_error(e)
+            self.index_changed = False
+            self._index_fetch_failed = True
+            return [], [], []
+        if not self._index_has_changed(page):
+            return [], [], []
+        headline_data = self._parse_headline_data(page.content)
+        self._store_index_page(page)
+        return headline_data
+
+    def _needs_catch_up(self, links: List[str]) -> bool:
+        """ Returns whether later index pages are read after the first.
+
+        Catching up needs a viewed link to reach, so the first scan only
+        reads the first page. Feeds are not paged.
+
+        Param:
+            links: New links of the first index page.
+        """
+        return (
+            self.catch_up_config is not None
+            and self.feed_url is None
+            and self._index_gap
+            and bool(self.viewed_links)
+            and len(links) > 0
+        )
+
+    def _catch_up(self, links: List[str], latest_publish_date: datetime) -> List[HeadlineData]:
+        """ Returns the new entries of later index pages, latest first.
+
+        Params:
+            links: New links of the first index page.
+            latest_publish_date: Publish date of the latest entry.
+        """
+        config = self.catch_up_config
+        catch_up = _CatchUp(self, links, latest_publish_date)
+        executor = self._get_catch_up_executor()
+        for page_numbers in catch_up.iter_page_batches():
+            futures = [
+                executor.submit(
+                    self._get_page_with_retries,
+                    get_index_page_url(self.index_url, page_number, config.page_param)
+                )
+                for page_number in page_numbers
+            ]
+            pages = []
+            for future in futures:
+                try:
+                    pages.append(future.result())
+                except Exception as e:
+                    _log_catch_up_error(e)
+                    pages.append(None)
+            if not catch_up.read_pages(pages):
+                break
+        return catch_up.finish()
+
+    def _get_catch_up_executor(self) -> ThreadPoolExecutor:
+        """ Returns the executor fetching catch up pages, creating it if needed. """
+        if self._catch_up_executor is None:
+            # one more thread than pages fetched at once runs the crawl itself
+            self._catch_up_executor = ThreadPoolExecutor(
+                max_workers=self.catch_up_config.concurrency + 1,
+                thread_name_prefix="catch_up"
+            )
+        return self._catch_up_executor
+
+    def _is_index_page(self, link: str) -> bool:
+        """ Returns whether a link is the index page or a numbered index page.
+
+        Param:
+            link: url to a webpage.
+        """
+        return link == self.index_url or link.startswith(self.index_url + "?")
+
+    def _get_index_request_headers(self) -> Dict[str, str]:
+        """ Returns conditional request headers for the index page. """
+        headers = {}
+        if self._index_etag:
+            headers["If-None-Match"] = self._index_etag
+        if self._index_last_modified:
+            headers["If-Modified-Since"] = self._index_last_modified
+        return headers
+
+    def _index_has_changed(self, page) -> bool:
+        """ Returns whether the index page changed since the last scan.
 
-        page_content = self._get_page_content(link)
-        table = page_content.find('section', attrs={'class': "market-news__results"})
-        articles = table.find_all('article')
+        The server answering 304 or an identical digest of the index section
+        mean nothing changed, so parsing can be skipped. Sets
+        'index_changed', the page is compared against the last index page
+        stored by '_store_index_page'.
+
+        Param:
+            page: http response of the index page.
+        """
+        if page.status_code == 304:
+            self.index_changed = False
+            return False
+
+        digest = _get_index_digest(page.content, self._index_section_start)
+        self.index_changed = digest != self._index_digest
+        return self.index_changed
+
+    def _store_index_page(self, page):
+        """ Stores the validators and digest of an index page for the next
+        scan's change detection.
+
+        Called once the page was parsed, so a page failing to parse is
+        parsed again next scan. Cached pages carry no headers, the stored
+        validators are kept.
+
+        Param:
+            page: http response of the index page.
+        """
+        if not isinstance(page, CachedPage):
+            self._index_etag = page.headers.get("ETag")
+            self._index_last_modified = page.headers.get("Last-Modified")
+        self._index_digest = _get_index_digest(page.content, self._index_section_start)
+
+    def _parse_headline_data(
+        self,
+        content: bytes
+    ) -> Tuple[List[str], List[str], List[datetime]]:
+        """ Returns parallel lists of headlines, links and publish date of the
+        index entries newer than the latest viewed link.
+
+        Param:
+            content: Raw html of the news index page.
+        """
         headlines = []
         links = []
         publish_dates = []
-        for article in articles:
-            a_refs = article.find_all('a')
-            headline = a_refs[1]
-            links.append(self.website_url + headline.get("href"))
-            headlines.append(headline.get_text())
-
-            time_tag = article.find("time")
-            time_str = time_tag.get_text().replace("\t", "").replace("\n", "")
-            publish_dates.append(_to_datetime_cst(time_str))
+        for hl_data in self._iter_new_headline_data(content):
+            headlines.append(hl_data.headline)
+            links.append(hl_data.link)
+            publish_dates.append(hl_data.publish_date)
 
         return headlines, links, publish_dates
 
+    def _iter_new_headline_data(
+        self,
+        content: bytes,
+        scan_links: Container[str] = ()
+    ) -> Iterator[HeadlineData]:
+        """ Yields the index entries newer than the latest viewed link, latest
+        first.
+
+        Reading the index stops at the first viewed link or after
+        max_look_back entries, so publish dates are only parsed for entries
+        that are new. Feeds are expected to list the latest item first.
+
+        Params:
+            content: Raw html of the news index page, or xml of the feed.
+            scan_links: Links read earlier in the scan, not stopping the read
+                when their article was viewed since.
+        """
+        self._index_gap = False
+        if self.feed_url is not None:
+            entries = iter_feed_entries(content)
+        else:
+            entries = self.html_parser.iter_index(content)
+        for num_entries, entry in enumerate(entries):
+            if self.max_look_back is not None and num_entries >= self.max_look_back:
+                return
+            link = self._get_article_link(entry.href)
+            if link in self.viewed_links and link not in scan_links:
+                return
+            publish_date = self._parse_publish_date(entry.time_text)
+            if publish_date is None:
+                logger.warning(f"Skipped feed item without a valid publish date\n"
+                               f"- url: {link}")
+                continue
+            yield HeadlineData(
+                headline=entry.headline,
+                link=link,
+                publish_date=publish_date
+            )
+        self._index_gap = True
+
+    def _parse_publish_date(self, time_text: str) -> Optional[datetime]:
+        """ Returns the publish date of an index entry in cst, None for a
+        feed item without a valid date.
+
+        Param:
+            time_text: Publish time of the entry as listed.
+        """
+        if self.feed_url is not None:
+            return parse_feed_date(time_text)
+        return _to_datetime_cst(
+            time_text.replace("\t", "").replace("\n", ""),
+            self.time_format
+        )
+
+    def _get_article_link(self, href: str) -> str:
+        """ Returns the url of an index entry's link.
+
+        Param:
+            href: Link of the entry, relative to the site or absolute.
+        """
+        if urlparse(href).scheme:
+            return href
+        return self.website_url + href
+
     def _get_article_content(self, links: List[str]) -> List[str]:
         """ Returns article content from each link in links as a list of str.
 
@@ -124,28 +879,172 @@ class TargetNewsScrapper:
         for link in links:
             body = ""
             try:
-                page_content = self._get_page_content(link)
-                article = page_content.find(
-                    'div', attrs={"class": "mdc-article-body"}
-                )
-                paragraphs = article.find_all(
-                    "p", attrs={"class": "mdc-article-paragraph"}
-                )
-                for paragraph in paragraphs:
-                    body += (paragraph.get_text() + " ")
+                page = self._get_page_with_retries(link, hedged=True)
+                body = self._parse_article_content(page.content)
+            except (*TRANSIENT_ERRORS, CircuitOpenError) as e:
+                _log_article_error(e, link)
+                self._mark_failed_fetch(link)
             except Exception as e:
-                print("Error parsing article contents")
-                print(str(e)+f"\n- url: {link}")
-                logger.error(str(e)+f"\n- url: {link}")
+                _log_article_error(e, link)
 
             contents.append(body)
 
         return contents
 
+    def _parse_article_content(self, content: bytes) -> str:
+        """ Returns the paragraphs of an article joined as a str.
+
+        Parsing is handed to the parse pool when one is set, the calling
+        thread waits without holding the GIL.
+
+        Param:
+            content: Raw html of an article page.
+        """
+        if self.parse_pool is not None:
+            return _join_paragraphs(
+                self.parse_pool.parse_article(content, self.html_parser)
+            )
+        return _join_paragraphs(self.html_parser.parse_article(content))
+
+
+class _CatchUp:
+    """ State of one catch up crawl, shared by the threaded and asyncio
+    scrappers which fetch the pages. """
+    def __init__(
+        self,
+        scrapper: TargetNewsScrapper,
+        links: List[str],
+        latest_publish_date: datetime
+    ):
+        """
+        Params:
+            scrapper: Scrapper parsing the pages.
+            links: New links of the first index page.
+            latest_publish_date: Publish date of the latest entry.
+        """
+        self.scrapper = scrapper
+        self.config = scrapper.catch_up_config
+        self.cutoff = latest_publish_date - timedelta(seconds=self.config.max_age)
+        self.max_entries = None
+        if scrapper.max_look_back is not None:
+            self.max_entries = max(scrapper.max_look_back - len(links), 0)
+        self.known_links = set(links)
+        self.headline_data: List[HeadlineData] = []
+        self.num_pages = 0
+
+    def iter_page_batches(self) -> Iterator[range]:
+        """ Yields the numbers of the pages fetched together. """
+        last_page = self.config.max_pages
+        for first_page in range(2, last_page + 1, self.config.concurrency):
+            yield range(first_page, min(first_page + self.config.concurrency, last_page + 1))
+
+    def read_pages(self, pages: list) -> bool:
+        """ Adds the new entries of a batch of pages, in page order, and
+        returns whether the next pages are read.
+
+        Reading stops at a page that failed, has no entries, or has a
+        viewed link, and at an entry older than the cutoff.
+
+        Param:
+            pages: http responses of the pages, None for failed fetches.
+        """
+        for page in pages:
+            if page is None or page.status_code != 200:
+                return False
+            self.num_pages += 1
+            try:
+                # articles of the first page may be viewed while crawling
+                entries = list(self.scrapper._iter_new_headline_data(
+                    page.content, scan_links=self.known_links
+                ))
+            except PageStructureError as e:
+                _log_catch_up_error(e)
+                return False
+            for hl_data in entries:
+                if hl_data.publish_date < self.cutoff:
+                    return False
+                if self.max_entries is not None and \
+                        len(self.headline_data) >= self.max_entries:
+                    return False
+                # entries shift to later pages as articles are published
+                if hl_data.link not in self.known_links:
+                    self.known_links.add(hl_data.link)
+                    self.headline_data.append(hl_data)
+            if not entries or not self.scrapper._index_gap:
+                return False
+        return True
+
+    def finish(self) -> List[HeadlineData]:
+        """ Returns the caught up entries, logging the crawl. """
+        logger.info(f"Caught up on later index pages\n"
+                    f"- num_pages: {self.num_pages}\n"
+                    f"- num_links: {len(self.headline_data)}")
+        return self.headline_data
+
+
+def _log_index_error(error: Exception):
+    """ Reports an index page fetch that failed, the scan is skipped.
+
+    Param:
+        error: Exception raised while fetching the index page.
+    """
+    logger.error(f"Error fetching index page: {error}")
+
+
+def _log_catch_up_error(error: Exception):
+    """ Reports a later index page that could not be fetched or parsed.
+
+    Param:
+        error: Exception raised while reading the page.
+    """
+    logger.error(f"Error reading later index page: {error}")
+
+
+def _get_index_digest(content: bytes, section_start: bytes = INDEX_SECTION_START) -> str:
+    """ Returns a digest of the article list section of the index page.
+
+    The section is located by byte search so no parsing is done. The whole
+    page is hashed if the section is not found.
+
+    Params:
+        content: Raw html of the news index page.
+        section_start: Bytes starting the article list section.
+    """
+    start = content.find(section_start)
+    if start != -1:
+        end = content.find(INDEX_SECTION_END, start)
+        if end != -1:
+            content = content[start:end]
+    return hashlib.sha1(content).hexdigest()
+
+
+def _join_paragraphs(paragraphs: List[str]) -> str:
+    """ Returns the body of an article from its paragraphs.
+
+    Param:
+        paragraphs: Text of each paragraph of the article.
+    """
+    body = ""
+    for paragraph in paragraphs:
+        body += (paragraph + " ")
+    return body
+
+
+def _log_article_error(error: Exception, link: str):
+    """ Reports an article that could not be fetched or parsed.
+
+    Params:
+        error: Exception raised while getting the article.
+        link: url to the article.
+    """
+    print("Error parsing article contents")
+    print(str(error)+f"\n- url: {link}")
+    logger.error(str(error)+f"\n- url: {link}")
+
 
 def _get_latest_link_index(
         links: List[str],
-        viewed_links: Union[List[str], Dict[str, datetime]]
+        viewed_links: Container[str]
 ) -> int:
     """ Returns scrape_results omitting what was read.
 
@@ -0,0 +1,136 @@
+""" Long-lived pool of worker threads shared by every scan of a scrapper. """
+
+import queue
+import threading
+from typing import Callable, List, NamedTuple
+from news_scanner.logger.logger import logger
+
+_STOP = object()
+
+
+class WorkerPoolStats(NamedTuple):
+    """ Snapshot of the utilization of a 'WorkerPool'.
+
+    Attrs:
+        num_workers: Number of running workers.
+        busy_workers: Number of workers running a task.
+        queue_depth: Number of tasks waiting for a worker.
+        tasks_completed: Number of tasks run since the pool was created.
+    """
+    num_workers: int = 0
+    busy_workers: int = 0
+    queue_depth: int = 0
+    tasks_completed: int = 0
+
+
+class WorkerPool:
+    """ Runs submitted tasks on worker threads kept alive between scans.
+
+    Workers are started once and reused, so thread local state such as
+    pooled http sessions lives as long as the pool.
+    """
+    def __init__(
+        self,
+        num_workers: int,
+        name: str = "worker",
+        on_worker_exit: Callable[[], None] = None
+    ):
+        """ Starts num_workers worker threads.
+
+        Params:
+            num_workers: Number of worker threads to start.
+            name: Prefix of the worker thread names.
+            on_worker_exit: Called by each worker thread as it stops, ex: to
+                release its thread local state.
+        """
+        self.name = name
+        self.on_worker_exit = on_worker_exit
+        self._tasks = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._num_workers = 0
+        self._busy_workers = 0
+        self._tasks_completed = 0
+        self._num_started = 0
+        self._is_shutdown = False
+        self.resize(num_workers)
+
+    def submit(self, func: Callable, *args):
+        """ Queues func(*args) to be run by the next free worker.
+
+        Params:
+            func: Task to run, exceptions it raises are logged.
+            args: Arguments passed to func.
+        """
+        if self._is_shutdown:
+            raise RuntimeError("Cannot submit to a shut down worker pool.")
+        self._tasks.put((func, args))
+
+    def resize(self, num_workers: int):
+        """ Starts or stops workers until num_workers are running.
+
+        Stopped workers finish their current task before exiting.
+
+        Params:
+            num_workers: Number of workers to keep running.
+        """
+        with self._lock:
+            while self._num_workers < num_workers:
+                worker = threading.Thread(
+                    target=self._work,
+                    name=f"{self.name}{self._num_started}",
+                    daemon=True
+                )
+                self._num_started += 1
+                self._workers.append(worker)
+                worker.start()
+                self._num_workers += 1
+            while self._num_workers > num_workers:
+                self._tasks.put(_STOP)
+                self._num_workers -= 1
+
+    def stats(self) -> WorkerPoolStats:
+        """ Returns the current utilization of the pool. """
+        with self._lock:
+            return WorkerPoolStats(
+                num_workers=self._num_workers,
+                busy_workers=self._busy_workers,
+                queue_depth=self._tasks.qsize(),
+                tasks_completed=self._tasks_completed
+            )
+
+    def shutdown(self):
+        """ Stops every worker once queued tasks are done and waits for them. """
+        if self._is_shutdown:
+            return
+        self._is_shutdown = True
+        self.resize(0)
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            worker.join()
+
+    def _work(self):
+        """ Runs queued tasks until a stop marker is pulled. """
+        while True:
+            task = self._tasks.get()
+            if task is _STOP:
+                with self._lock:
+                    self._workers.remove(threading.current_thread())
+                if self.on_worker_exit is not None:
+                    try:
+                        self.on_worker_exit()
+                    except Exception as e:
+                        logger.error(f"Worker exit failed: {e}")
+                return
+            func, args = task
+            with self._lock:
+                self._busy_workers += 1
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(f"Worker task failed: {e}")
+            finally:
+                with self._lock:
+                    self._busy_workers -= 1
+                    self._tasks_completed += 1
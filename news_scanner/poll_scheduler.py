@@ -0,0 +1,159 @@
+""" Pacing of scans from market hours and the observed rate of new articles.
+
+Each market session has a base interval between scans, short around the
+regular session and long overnight and on weekends. A high rate of new
+articles over a recent window shortens the interval so each scan finds
+about a set number of new articles. Intervals are bounded by a min and max.
+
+Note: market holidays are treated as regular weekdays.
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime, time as day_time
+from typing import NamedTuple, Callable, Optional
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # python < 3.9
+    from backports.zoneinfo import ZoneInfo
+
+PRE_MARKET = "pre_market"
+REGULAR = "regular"
+AFTER_HOURS = "after_hours"
+OVERNIGHT = "overnight"
+WEEKEND = "weekend"
+MARKET_TIMEZONE = "America/New_York"
+PRE_MARKET_OPEN = day_time(4, 0)
+REGULAR_OPEN = day_time(9, 30)
+REGULAR_CLOSE = day_time(16, 0)
+AFTER_HOURS_CLOSE = day_time(20, 0)
+
+
+class PollScheduleConfig(NamedTuple):
+    """ Intervals between scans.
+
+    Attrs:
+        min_interval: Min seconds between the starts of two scans.
+        max_interval: Max seconds between the starts of two scans.
+        pre_market_interval: Base seconds between scans from 4:00 to 9:30
+            market time.
+        regular_interval: Base seconds between scans from 9:30 to 16:00.
+        after_hours_interval: Base seconds between scans from 16:00 to 20:00.
+        overnight_interval: Base seconds between scans from 20:00 to 4:00.
+        weekend_interval: Base seconds between scans on weekends.
+        rate_window: Seconds of recent scans the new article rate is
+            measured over.
+        target_new_per_scan: Number of new articles a scan should find when
+            the new article rate shortens the interval.
+    """
+    min_interval: float = 5.0
+    max_interval: float = 900.0
+    pre_market_interval: float = 30.0
+    regular_interval: float = 20.0
+    after_hours_interval: float = 60.0
+    overnight_interval: float = 300.0
+    weekend_interval: float = 600.0
+    rate_window: float = 900.0
+    target_new_per_scan: float = 1.0
+
+
+class PollInterval(NamedTuple):
+    """ Interval until the next scan and why it was chosen.
+
+    Attrs:
+        seconds: Seconds between the start of the last scan and the next.
+        session: Market session the interval was chosen in.
+        reason: Explanation of the interval, for logs.
+    """
+    seconds: float
+    session: str
+    reason: str
+
+
+class PollScheduler:
+    """ Chooses the interval between scans, thread safe. """
+    def __init__(
+        self,
+        config: PollScheduleConfig = PollScheduleConfig(),
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Params:
+            config: Intervals between scans.
+            clock: Returns the current unix time in seconds.
+        """
+        self.config = config
+        self.clock = clock
+        self._timezone = ZoneInfo(MARKET_TIMEZONE)
+        self._scans = deque()
+        self._first_scan_recorded = False
+        self._lock = threading.Lock()
+
+    def record_scan(self, num_new_articles: int):
+        """ Records the number of new articles a scan found.
+
+        The first scan reads the backlog of the index page, so it is not
+        counted in the new article rate.
+
+        Params:
+            num_new_articles: Number of new articles found by the scan.
+        """
+        with self._lock:
+            if not self._first_scan_recorded:
+                self._first_scan_recorded = True
+                return
+            self._scans.append((self.clock(), num_new_articles))
+
+    def get_new_article_rate(self) -> float:
+        """ Returns the new articles per second over the rate window. """
+        now = self.clock()
+        with self._lock:
+            while self._scans and self._scans[0][0] < now - self.config.rate_window:
+                self._scans.popleft()
+            num_new_articles = sum(num for _, num in self._scans)
+        return num_new_articles / self.config.rate_window
+
+    def get_session(self, now: Optional[datetime] = None) -> str:
+        """ Returns the market session at a time, the current time by default.
+
+        Params:
+            now: Timezone aware time.
+        """
+        if now is None:
+            now = datetime.fromtimestamp(self.clock(), tz=self._timezone)
+        market_now = now.astimezone(self._timezone)
+        if market_now.weekday() >= 5:
+            return WEEKEND
+        market_time = market_now.time()
+        if PRE_MARKET_OPEN <= market_time < REGULAR_OPEN:
+            return PRE_MARKET
+        if REGULAR_OPEN <= market_time < REGULAR_CLOSE:
+            return REGULAR
+        if REGULAR_CLOSE <= market_time < AFTER_HOURS_CLOSE:
+            return AFTER_HOURS
+        return OVERNIGHT
+
+    def next_interval(self) -> PollInterval:
+        """ Returns the interval between the start of the last scan and the
+        next one.
+
+        The interval is the base interval of the current session, shortened
+        when the new article rate is high enough, then bounded by the min
+        and max interval.
+        """
+        config = self.config
+        session = self.get_session()
+        seconds = getattr(config, f"{session}_interval")
+        reason = f"{session} interval"
+        rate = self.get_new_article_rate()
+        if rate > 0 and config.target_new_per_scan / rate < seconds:
+            seconds = config.target_new_per_scan / rate
+            reason = f"{rate * 60:.2f} new articles/min"
+        if seconds < config.min_interval:
+            seconds = config.min_interval
+            reason += ", raised to min interval"
+        elif seconds > config.max_interval:
+            seconds = config.max_interval
+            reason += ", lowered to max interval"
+        return PollInterval(seconds=seconds, session=session, reason=reason)
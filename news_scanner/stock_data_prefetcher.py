@@ -0,0 +1,158 @@
+""" Speculative lookup of stock data for the tickers named in headlines.
+
+Many headlines name the stock of their article, ex: "(NASDAQ: ABC)". The
+stock data of those tickers is requested in the background as soon as the
+index is parsed, overlapping the td api round trip with the download of
+article bodies. Lookups of tickers confirmed by an article body reuse the
+prefetched data, other tickers are requested as before.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import NamedTuple, List, Dict, Callable, Tuple
+from news_scanner.news_scrapper.article_processor import find_headline_tickers
+from news_scanner.news_scrapper.target_news_scrapper import HeadlineData
+from news_scanner.td_api.td_api_handle import TDApiHandle, StockData
+from news_scanner.logger.logger import logger
+
+
+class StockDataPrefetchConfig(NamedTuple):
+    """ Concurrency and lifetime of prefetched stock data.
+
+    Attrs:
+        max_workers: Max number of prefetch requests sent at once.
+        max_age: Seconds prefetched stock data is reused after it was
+            requested.
+    """
+    max_workers: int = 2
+    max_age: float = 60.0
+
+
+class StockDataPrefetchStats(NamedTuple):
+    """ Tickers prefetched and lookups served by the prefetcher.
+
+    Attrs:
+        num_prefetched: Number of tickers requested from headlines.
+        hits: Number of looked up tickers served from a prefetch.
+        misses: Number of looked up tickers requested after their article
+            was processed.
+    """
+    num_prefetched: int = 0
+    hits: int = 0
+    misses: int = 0
+
+
+class StockDataPrefetcher:
+    """ Requests the stock data of headline tickers ahead of their lookup,
+    thread safe. """
+    def __init__(
+        self,
+        td_api: TDApiHandle,
+        config: StockDataPrefetchConfig = StockDataPrefetchConfig(),
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Params:
+            td_api: Handle stock data is requested from.
+            config: Concurrency and lifetime of prefetched stock data.
+            clock: Returns the current time in seconds.
+        """
+        self.td_api = td_api
+        self.config = config
+        self.clock = clock
+        # ticker -> time requested, pending or completed request
+        self._prefetched: Dict[str, Tuple[float, Future]] = {}
+        self._num_prefetched = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.max_workers, thread_name_prefix="prefetch"
+        )
+
+    def prefetch(self, headline_data: List[HeadlineData]):
+        """ Requests in the background the stock data of the tickers named in
+        headlines, skipping tickers prefetched within the max age.
+
+        Param:
+            headline_data: Index entries of a scan, before their articles are
+                fetched.
+        """
+        tickers = []
+        for hl_data in headline_data:
+            for ticker in find_headline_tickers(hl_data.headline):
+                if ticker not in tickers:
+                    tickers.append(ticker)
+        if not tickers:
+            return
+        now = self.clock()
+        with self._lock:
+            self._evict(now)
+            tickers = [ticker for ticker in tickers if ticker not in self._prefetched]
+            if not tickers:
+                return
+            future = self._executor.submit(self.td_api.get_stock_data, tickers)
+            for ticker in tickers:
+                self._prefetched[ticker] = (now, future)
+            self._num_prefetched += len(tickers)
+        logger.info(f"Prefetching stock data\n- tickers: {tickers}")
+
+    def get_stock_data(self, tickers: List[str]) -> Dict[str, StockData]:
+        """ Returns the stock data of tickers, waiting on their prefetch when
+        one is fresh and requesting the others.
+
+        Param:
+            tickers: Tickers confirmed by processed articles.
+        """
+        now = self.clock()
+        futures = {}
+        with self._lock:
+            self._evict(now)
+            for ticker in tickers:
+                if ticker in self._prefetched:
+                    futures[ticker] = self._prefetched[ticker][1]
+        stock_data = {}
+        for ticker, future in futures.items():
+            try:
+                prefetched = future.result()
+            except Exception as e:
+                logger.error(f"Stock data prefetch failed: {ticker}\n- error: {e}")
+                continue
+            if ticker in prefetched:
+                stock_data[ticker] = prefetched[ticker]
+        missing = [ticker for ticker in tickers if ticker not in stock_data]
+        with self._lock:
+            self._hits += len(tickers) - len(missing)
+            self._misses += len(missing)
+        if missing:
+            stock_data.update(self.td_api.get_stock_data(missing))
+        return stock_data
+
+    def stats(self) -> StockDataPrefetchStats:
+        """ Returns the tickers prefetched and lookups served so far. """
+        with self._lock:
+            return StockDataPrefetchStats(
+                num_prefetched=self._num_prefetched,
+                hits=self._hits,
+                misses=self._misses
+            )
+
+    def close(self):
+        """ Stops the prefetch threads, dropping pending prefetches. """
+        with self._lock:
+            futures = [future for _, future in self._prefetched.values()]
+            self._prefetched.clear()
+        for future in futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _evict(self, now: float):
+        """ Forgets prefetches older than the max age, the lock must be held.
+
+        Param:
+            now: Current time in seconds.
+        """
+        cutoff = now - self.config.max_age
+        for ticker in [t for t, (requested_at, _) in self._prefetched.items() if requested_at < cutoff]:
+            del self._prefetched[ticker]
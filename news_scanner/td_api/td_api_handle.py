@@ -63,6 +63,8 @@ class TDApiHandle:
 
     # millions unit
     MIL_UNIT = 1000000
+    # ticker quoted to warm up the client
+    WARM_UP_TICKER = "SPY"
 
     def __init__(
             self,
@@ -114,6 +116,19 @@ class TDApiHandle:
                 stock_data[ticker] = INVALID_STOCK_DATA
         return stock_data
 
+    def warm_up(self) -> bool:
+        """ Returns whether a quote request succeeded, refreshing an expired
+        access token and opening the api connection before the next lookup.
+        """
+        try:
+            self._get_quotes([self.WARM_UP_TICKER])
+        except Exception as e:
+            td_error_logger.error(json.dumps({
+                "error": f"Warm up failed: {e}"
+            }))
+            return False
+        return True
+
     def _get_fundamentals(self, tickers: List[str]) -> Dict:
         """ Returns list of all fundamental stock data on tickers from td api.
 
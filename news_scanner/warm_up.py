@@ -0,0 +1,65 @@
+""" Schedule of connection warm ups before busy market sessions.
+
+After a quiet period the first scan pays dns resolution and tcp and tls
+setup to the news site, the proxy and the TD api. Warming up shortly
+before a session opens moves that cost ahead of the first burst of news.
+"""
+
+import time
+from datetime import datetime, timedelta, time as day_time
+from typing import NamedTuple, Tuple, Callable
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # python < 3.9
+    from backports.zoneinfo import ZoneInfo
+from news_scanner.poll_scheduler import MARKET_TIMEZONE
+from news_scanner.news_scrapper.dns_cache import DEFAULT_DNS_TTL
+
+
+class WarmUpConfig(NamedTuple):
+    """ Times and extent of warm ups.
+
+    Attrs:
+        times: Market times of day warm ups run at on weekdays.
+        dns_ttl: Seconds dns resolutions are cached for.
+        refresh_td_token: Determines if the TD api client is warmed up,
+            refreshing its access token.
+    """
+    times: Tuple[day_time, ...] = (day_time(3, 55), day_time(9, 25))
+    dns_ttl: float = DEFAULT_DNS_TTL
+    refresh_td_token: bool = True
+
+
+class WarmUpSchedule:
+    """ Tells when a warm up time passed since the last check. """
+    def __init__(
+        self,
+        times: Tuple[day_time, ...],
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Params:
+            times: Market times of day warm ups run at on weekdays.
+            clock: Returns the current unix time in seconds.
+        """
+        self.times = times
+        self.clock = clock
+        self._timezone = ZoneInfo(MARKET_TIMEZONE)
+        self._last_check = clock()
+
+    def is_due(self) -> bool:
+        """ Returns whether a weekday warm up time passed since the last
+        check, several passed times count as one warm up. """
+        now = self.clock()
+        start = datetime.fromtimestamp(self._last_check, tz=self._timezone)
+        end = datetime.fromtimestamp(now, tz=self._timezone)
+        self._last_check = now
+        day = start.date()
+        while day <= end.date():
+            if day.weekday() < 5:
+                for warm_up_time in self.times:
+                    warm_up_at = datetime.combine(day, warm_up_time, tzinfo=self._timezone)
+                    if start < warm_up_at <= end:
+                        return True
+            day += timedelta(days=1)
+        return False
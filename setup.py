@@ -7,6 +7,8 @@ setup(
     packages=["news_scanner"],
     install_requires=[
         "tda-api", "pytest", "pandas", "bs4", "requests", "selenium",
-        "httpx", "twython", "numpy", "python-dotenv", "mock", "responses"
-    ]
+        "httpx", "twython", "numpy", "python-dotenv", "mock", "responses",
+        'backports.zoneinfo; python_version < "3.9"', "tzdata"
+    ],
+    extras_require={"lxml": ["lxml"]}
 )
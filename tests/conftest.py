@@ -0,0 +1,19 @@
+from datetime import datetime
+import pytest
+
+
+class MockClock:
+    """ Clock only moving forward when told to. """
+    def __init__(self):
+        self.now = 0.0
+
+    def set(self, now: datetime):
+        self.now = now.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> MockClock:
+    return MockClock()
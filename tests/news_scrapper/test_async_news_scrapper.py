@@ -0,0 +1,126 @@
+""" Validates the asyncio news scrapper against a mocked transport. """
+
+import datetime
+from typing import List
+import httpx
+from news_scanner.news_scrapper.async_target_news_scrapper import AsyncTargetNewsScrapper
+from news_scanner.news_scrapper.resilience import ResilienceConfig
+
+WEBSITE_URL = "https://website"
+
+
+class MockNewsSite:
+    """ Serves an index page of 'num_articles' and their article pages. """
+    def __init__(self, num_articles: int = 10):
+        self.num_articles = num_articles
+        self.requested_urls: List[str] = []
+
+    def add_articles(self, num_articles: int):
+        self.num_articles += num_articles
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.requested_urls.append(url)
+        if "url" in request.url.params:
+            url = request.url.params["url"]
+        if url == WEBSITE_URL + "/news":
+            return httpx.Response(200, content=self._index_page())
+        article_id = url.split("/l")[-1]
+        return httpx.Response(
+            200,
+            content=f"""
+                <div class="mdc-article-body">
+                    <p class="mdc-article-paragraph">c{article_id}</p>
+                </div>
+            """.encode()
+        )
+
+    def _index_page(self) -> bytes:
+        articles = ""
+        for i in reversed(range(self.num_articles)):
+            publish_date = datetime.datetime(2022, 6, 27) + datetime.timedelta(hours=i)
+            articles += f"""
+                <article>
+                    <a href="not_target">not_target</a>
+                    <a href="/news/l{i}">h{i}</a>
+                    <time>{publish_date.strftime("%b %d, %Y %I:%M %p")} UTC</time>
+                </article>
+            """
+        return f"""
+            <section class="market-news__results">{articles}</section>
+        """.encode()
+
+
+def test_get_news():
+    """ Ensures new articles are scrapped once and tracked across scans. """
+    news_site = MockNewsSite(num_articles=10)
+    scrapper = AsyncTargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        max_concurrency=3,
+        transport=httpx.MockTransport(news_site)
+    )
+
+    results = scrapper.get_news()
+    assert len(results) == 10
+    assert scrapper.num_links_found == 10
+    assert scrapper.num_new_links == 10
+    assert [result.headline for result in results] == [f"h{i}" for i in reversed(range(10))]
+    for result in results:
+        assert result.content == f"c{result.link.split('/l')[-1]} "
+        assert result.link in scrapper.viewed_links
+
+    news_site.add_articles(2)
+    results = scrapper.get_news()
+    assert [result.headline for result in results] == ["h11", "h10"]
+    assert scrapper.num_links_found == 2
+    assert scrapper.num_new_links == 2
+    scrapper.close()
+
+
+def test_get_news_proxy():
+    """ Ensures requests are sent through the proxy when it is on. """
+    news_site = MockNewsSite(num_articles=2)
+    scrapper = AsyncTargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        proxy_on=True,
+        transport=httpx.MockTransport(news_site)
+    )
+    results = scrapper.get_news()
+    assert len(results) == 2
+    assert len(news_site.requested_urls) == 3
+    for url in news_site.requested_urls:
+        assert url.startswith("http://api.scraperapi.com/")
+    scrapper.close()
+
+
+def test_get_news_transient_failure():
+    """ Ensures transient statuses are retried and an article still failing is
+    attempted again next scan instead of being treated as viewed. """
+    news_site = MockNewsSite(num_articles=2)
+    failing_link = WEBSITE_URL + "/news/l1"
+    failures = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == failing_link and failures["count"] < 3:
+            failures["count"] += 1
+            return httpx.Response(503)
+        return news_site(request)
+
+    scrapper = AsyncTargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        transport=httpx.MockTransport(handler),
+        resilience_config=ResilienceConfig(max_retries=2, backoff_base=0.0)
+    )
+    results = scrapper.get_news()
+    assert [result.headline for result in results] == ["h0"]
+    assert failing_link not in scrapper.viewed_links
+
+    # index page changes so the scan is not skipped
+    news_site.add_articles(1)
+    results = scrapper.get_news()
+    assert [result.headline for result in results] == ["h2", "h1"]
+    assert results[1].content == "c1 "
+    scrapper.close()
@@ -0,0 +1,185 @@
+""" Validates catching up on later index pages after a gap in scans. """
+
+import datetime
+import re
+from typing import List
+import httpx
+import responses
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper
+from news_scanner.news_scrapper.multithreaded_target_news_scrapper import MultiThreadedTargetNewsScrapper
+from news_scanner.news_scrapper.async_target_news_scrapper import AsyncTargetNewsScrapper
+from news_scanner.news_scrapper.catch_up import CatchUpConfig, get_index_page_url
+from news_scanner.news_scrapper.headline_classifier import HeadlinePriorityConfig
+
+WEBSITE_URL = "https://website"
+INDEX_URL = WEBSITE_URL + "/news"
+
+
+class PagedNewsSite:
+    """ Serves an index of 'num_articles' split in pages, latest first, and
+    their article pages. Article i is published i hours after midnight. """
+    def __init__(self, num_articles: int, page_size: int = 3):
+        self.num_articles = num_articles
+        self.page_size = page_size
+        self.requested_urls: List[str] = []
+
+    def get(self, url: str) -> bytes:
+        self.requested_urls.append(url)
+        if url == INDEX_URL:
+            return self._index_page(1)
+        if url.startswith(INDEX_URL + "?page="):
+            return self._index_page(int(url.split("=")[-1]))
+        article_id = url.split("/l")[-1]
+        return f"""
+            <div class="mdc-article-body">
+                <p class="mdc-article-paragraph">c{article_id}</p>
+            </div>
+        """.encode()
+
+    def index_requests(self) -> List[str]:
+        return [url for url in self.requested_urls if url.startswith(INDEX_URL + "?")]
+
+    def _index_page(self, page_number: int) -> bytes:
+        latest = self.num_articles - 1 - (page_number - 1) * self.page_size
+        articles = ""
+        for i in range(latest, max(latest - self.page_size, -1), -1):
+            publish_date = datetime.datetime(2022, 6, 27) + datetime.timedelta(hours=i)
+            articles += f"""
+                <article>
+                    <a href="not_target">not_target</a>
+                    <a href="/news/l{i}">h{i}</a>
+                    <time>{publish_date.strftime("%b %d, %Y %I:%M %p")} UTC</time>
+                </article>
+            """
+        return f"""
+            <section class="market-news__results">{articles}</section>
+        """.encode()
+
+
+def _add_site(news_site: PagedNewsSite):
+    responses.add_callback(
+        responses.GET,
+        re.compile(WEBSITE_URL + "/.*"),
+        callback=lambda request: (200, {}, news_site.get(request.url))
+    )
+
+
+def test_get_index_page_url():
+    assert get_index_page_url(INDEX_URL, 2) == INDEX_URL + "?page=2"
+    assert get_index_page_url(INDEX_URL + "?sort=new", 3, "p") == INDEX_URL + "?sort=new&p=3"
+
+
+@responses.activate
+def test_catch_up():
+    """ Ensures later pages are read up to the first viewed link and queued
+    after the first page, and only when the first page has no viewed link. """
+    news_site = PagedNewsSite(num_articles=5)
+    _add_site(news_site)
+    scrapper = MultiThreadedTargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        catch_up_config=CatchUpConfig(max_pages=10, concurrency=2)
+    )
+
+    # first scan only reads the first page
+    assert [result.headline for result in scrapper.get_news()] == ["h4", "h3", "h2"]
+    assert news_site.index_requests() == []
+
+    # first page has a viewed link
+    news_site.num_articles = 6
+    assert [result.headline for result in scrapper.get_news()] == ["h5"]
+    assert news_site.index_requests() == []
+
+    # every entry of the first page is new, h6 to h9 are on pages 2 and 3
+    news_site.num_articles = 13
+    results = scrapper.get_news()
+    assert [result.headline for result in results] == [f"h{i}" for i in range(12, 5, -1)]
+    assert scrapper.num_links_found == 7
+    assert sorted(news_site.index_requests()) == [INDEX_URL + "?page=2", INDEX_URL + "?page=3"]
+    scrapper.close()
+
+
+@responses.activate
+def test_catch_up_after_first_page():
+    """ Ensures the first page's articles are fetched before later pages are
+    read, and caught up entries are prioritized behind them. """
+    news_site = PagedNewsSite(num_articles=3)
+    _add_site(news_site)
+    scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        catch_up_config=CatchUpConfig(concurrency=2),
+        headline_priority_config=HeadlinePriorityConfig(keyword_weights=(("h4", 10.0),))
+    )
+    scrapper.get_news()
+    news_site.num_articles = 10
+    news_site.requested_urls = []
+    results = scrapper.get_news()
+    assert [result.headline for result in results] == [
+        "h9", "h8", "h7", "h4", "h6", "h5", "h3"
+    ]
+    assert news_site.requested_urls[:5] == [
+        INDEX_URL,
+        WEBSITE_URL + "/news/l9",
+        WEBSITE_URL + "/news/l8",
+        WEBSITE_URL + "/news/l7",
+        INDEX_URL + "?page=2"
+    ]
+    scrapper.close()
+
+
+@responses.activate
+def test_catch_up_limits():
+    """ Ensures catching up stops at the max age, max pages and max look
+    back. """
+    news_site = PagedNewsSite(num_articles=20)
+    _add_site(news_site)
+    scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        catch_up_config=CatchUpConfig(max_pages=10, max_age=4 * 60 * 60, concurrency=3)
+    )
+    scrapper.viewed_links.clear()
+    scrapper.viewed_links.add(WEBSITE_URL + "/news/l0")
+    headlines = [result.headline for result in scrapper.get_news()]
+    assert headlines == ["h19", "h18", "h17", "h16", "h15"]
+    assert sorted(news_site.index_requests()) == [
+        INDEX_URL + "?page=2", INDEX_URL + "?page=3", INDEX_URL + "?page=4"
+    ]
+
+    news_site.num_articles += 1
+    scrapper.viewed_links.clear()
+    scrapper.viewed_links.add(WEBSITE_URL + "/news/l0")
+    scrapper.catch_up_config = CatchUpConfig(max_pages=2)
+    assert len(scrapper.get_news()) == 6
+
+    news_site.num_articles += 1
+    scrapper.viewed_links.clear()
+    scrapper.viewed_links.add(WEBSITE_URL + "/news/l0")
+    scrapper.catch_up_config = CatchUpConfig(max_pages=10)
+    scrapper.max_look_back = 4
+    assert len(scrapper.get_news()) == 4
+    scrapper.close()
+
+
+def test_async_catch_up():
+    """ Ensures the asyncio scrapper catches up on later pages. """
+    news_site = PagedNewsSite(num_articles=3)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=news_site.get(str(request.url)))
+
+    scrapper = AsyncTargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        catch_up_config=CatchUpConfig(concurrency=2),
+        transport=httpx.MockTransport(handler)
+    )
+    assert len(scrapper.get_news()) == 3
+
+    news_site.num_articles = 10
+    results = scrapper.get_news()
+    assert [result.headline for result in results] == [f"h{i}" for i in range(9, 2, -1)]
+    assert scrapper.num_new_links == 7
+    assert sorted(news_site.index_requests()) == [INDEX_URL + "?page=2", INDEX_URL + "?page=3"]
+    scrapper.close()
@@ -0,0 +1,93 @@
+""" Validates the adaptive (AIMD) concurrency controller. """
+
+import asyncio
+import threading
+import pytest
+from news_scanner.news_scrapper.concurrency_controller import (
+    AdaptiveConcurrencyController,
+    AsyncConcurrencyLimiter,
+    ConcurrencyConfig
+)
+
+CONFIG = ConcurrencyConfig(
+    floor=2, ceiling=8, initial=4, latency_target=1.0, window=5
+)
+
+
+def test_increase_on_fast_window():
+    """ Ensures the limit grows by a step per healthy window up to the ceiling. """
+    controller = AdaptiveConcurrencyController(CONFIG)
+    for _ in range(CONFIG.window):
+        controller.record(0.1, 200)
+    assert controller.limit == 5
+    for _ in range(CONFIG.window * 10):
+        controller.record(0.1, 200)
+    assert controller.limit == CONFIG.ceiling
+
+
+@pytest.mark.parametrize("status_code", [429, 503, None])
+def test_decrease_on_throttling(status_code):
+    """ Ensures throttling, server errors and failures halve the limit once
+    per round of in-flight fetches. """
+    controller = AdaptiveConcurrencyController(CONFIG)
+    controller.record(0.1, status_code)
+    assert controller.limit == 2
+    # rest of the same round does not collapse the limit further
+    controller.record(0.1, status_code)
+    assert controller.limit == 2
+    assert controller.num_decreases == 1
+
+
+def test_decrease_on_slow_window():
+    """ Ensures a window slower than the latency target lowers the limit. """
+    controller = AdaptiveConcurrencyController(CONFIG)
+    for _ in range(CONFIG.window):
+        controller.record(5.0, 200)
+    assert controller.limit == CONFIG.floor
+
+
+def test_initial_clamped():
+    """ Ensures the initial limit respects the floor and ceiling. """
+    controller = AdaptiveConcurrencyController(
+        ConcurrencyConfig(floor=3, ceiling=6, initial=10)
+    )
+    assert controller.limit == 6
+
+
+def test_acquire_respects_limit():
+    """ Ensures no more fetches than the limit hold the gate at once. """
+    controller = AdaptiveConcurrencyController(CONFIG)
+    max_in_flight = []
+    lock = threading.Lock()
+
+    def fetch():
+        with controller:
+            with lock:
+                max_in_flight.append(controller.in_flight)
+
+    threads = [threading.Thread(target=fetch) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(max_in_flight) <= controller.limit
+    assert controller.in_flight == 0
+
+
+def test_async_limiter_respects_limit():
+    """ Ensures asyncio tasks are gated by the controller's limit. """
+    controller = AdaptiveConcurrencyController(CONFIG)
+    limiter = AsyncConcurrencyLimiter(controller)
+    max_in_flight = []
+
+    async def fetch():
+        async with limiter:
+            max_in_flight.append(limiter.in_flight)
+            await asyncio.sleep(0.001)
+
+    async def fetch_all():
+        await asyncio.gather(*[fetch() for _ in range(20)])
+
+    asyncio.run(fetch_all())
+    assert max(max_in_flight) == controller.limit
+    assert limiter.in_flight == 0
@@ -0,0 +1,35 @@
+""" Validates caching of dns resolutions. """
+
+import socket
+from news_scanner.news_scrapper.dns_cache import DnsCache, DnsCacheStats
+
+
+def test_getaddrinfo(monkeypatch, clock):
+    """ Ensures resolutions are cached until their ttl, failures are not. """
+    calls = []
+
+    def getaddrinfo(host, port, *args):
+        calls.append(host)
+        if host == "unknown":
+            raise socket.gaierror("unknown host")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    cache = DnsCache(ttl=10, clock=clock)
+    cache.install()
+    try:
+        assert socket.getaddrinfo("host", 80)[0][4] == ("127.0.0.1", 80)
+        clock.now = 9
+        socket.getaddrinfo("host", 80)
+        clock.now = 10
+        socket.getaddrinfo("host", 80)
+        for _ in range(2):
+            try:
+                socket.getaddrinfo("unknown", 80)
+            except socket.gaierror:
+                pass
+    finally:
+        cache.uninstall()
+    assert socket.getaddrinfo is getaddrinfo
+    assert calls == ["host", "host", "unknown", "unknown"]
+    assert cache.stats() == DnsCacheStats(hits=1, misses=4, num_entries=1)
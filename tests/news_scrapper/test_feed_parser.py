@@ -0,0 +1,117 @@
+""" Validates discovering articles from RSS and Atom feeds. """
+
+from datetime import datetime
+import pytest
+import responses
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper
+from news_scanner.news_scrapper.html_parser import IndexEntry, PageStructureError
+from news_scanner.news_scrapper.feed_parser import iter_feed_entries, parse_feed_date
+
+WEBSITE_URL = "https://website"
+RSS_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <channel>
+        <title>News</title>
+        <link>https://website/news</link>
+        <item>
+            <title> h2 </title>
+            <link>https://website/news/l2</link>
+            <pubDate>Tue, 09 Nov 2021 02:03:00 +0000</pubDate>
+        </item>
+        <item>
+            <title>no link</title>
+        </item>
+        <item>
+            <title>h1</title>
+            <link>/news/l1</link>
+            <dc:date>2021-11-08T20:00:00Z</dc:date>
+        </item>
+    </channel>
+</rss>
+"""
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <title>News</title>
+    <entry>
+        <title>h1</title>
+        <link rel="self" href="https://website/feed/l1"/>
+        <link href="https://website/news/l1"/>
+        <updated>2021-11-09T03:03:00+01:00</updated>
+    </entry>
+</feed>
+"""
+
+
+def test_iter_feed_entries():
+    """ Ensures rss and atom items are read, skipping items without links. """
+    assert list(iter_feed_entries(RSS_FEED)) == [
+        IndexEntry("https://website/news/l2", "h2", "Tue, 09 Nov 2021 02:03:00 +0000"),
+        IndexEntry("/news/l1", "h1", "2021-11-08T20:00:00Z"),
+    ]
+    assert list(iter_feed_entries(ATOM_FEED)) == [
+        IndexEntry("https://website/news/l1", "h1", "2021-11-09T03:03:00+01:00"),
+    ]
+    with pytest.raises(PageStructureError):
+        list(iter_feed_entries(b"<html><body>not a feed"))
+
+
+@pytest.mark.parametrize("time_text", [
+    "Tue, 09 Nov 2021 02:03:00 +0000",
+    "Mon, 08 Nov 2021 20:03:00 CST",
+    "2021-11-09T02:03:00Z",
+    "2021-11-09T03:03:00+01:00",
+    "2021-11-09T02:03:00",
+])
+def test_parse_feed_date(time_text):
+    assert parse_feed_date(time_text) == datetime(2021, 11, 8, 20, 3)
+
+
+@pytest.mark.parametrize("time_text", ["", "yesterday"])
+def test_parse_feed_date_invalid(time_text):
+    assert parse_feed_date(time_text) is None
+
+
+@responses.activate
+def test_scrapper_feed_url():
+    """ Ensures new articles are discovered from the feed until the first
+    viewed link. """
+    responses.get(url=WEBSITE_URL + "/feed", body=RSS_FEED)
+    scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        feed_url=WEBSITE_URL + "/feed"
+    )
+    headlines, links, publish_dates = scrapper._get_headline_data()
+    assert headlines == ["h2", "h1"]
+    assert links == [WEBSITE_URL + "/news/l2", WEBSITE_URL + "/news/l1"]
+    assert publish_dates == [datetime(2021, 11, 8, 20, 3), datetime(2021, 11, 8, 14, 0)]
+
+    scrapper.viewed_links = [WEBSITE_URL + "/news/l1"]
+    assert scrapper._parse_headline_data(RSS_FEED)[1] == [WEBSITE_URL + "/news/l2"]
+    scrapper.close()
+
+
+@responses.activate
+def test_scrapper_feed_undated_item():
+    """ Ensures undated and badly dated feed items are skipped instead of
+    failing the scan. """
+    responses.get(url=WEBSITE_URL + "/feed", body=b"""<?xml version="1.0"?>
+<rss version="2.0">
+    <channel>
+        <item><title>h3</title><link>/news/l3</link></item>
+        <item><title>h2</title><link>/news/l2</link><pubDate>soon</pubDate></item>
+        <item>
+            <title>h1</title>
+            <link>/news/l1</link>
+            <pubDate>Tue, 09 Nov 2021 02:03:00 +0000</pubDate>
+        </item>
+    </channel>
+</rss>
+""")
+    scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        feed_url=WEBSITE_URL + "/feed"
+    )
+    assert scrapper._get_headline_data()[1] == [WEBSITE_URL + "/news/l1"]
+    scrapper.close()
@@ -0,0 +1,69 @@
+""" Validates scoring headlines to order article fetches. """
+
+from datetime import datetime, timedelta
+import httpx
+from news_scanner.news_scrapper.headline_classifier import HeadlineClassifier, HeadlinePriorityConfig
+from news_scanner.news_scrapper.target_news_scrapper import HeadlineData
+from news_scanner.news_scrapper.async_target_news_scrapper import AsyncTargetNewsScrapper
+from tests.news_scrapper.test_async_news_scrapper import WEBSITE_URL
+
+LATEST = datetime(2022, 6, 27, 12)
+
+
+def test_score():
+    """ Ensures keywords, tickers and recency add to the score. """
+    classifier = HeadlineClassifier(config=HeadlinePriorityConfig(recency_half_life=60))
+    assert classifier.score("Quarterly update", LATEST, LATEST) == 1.0
+    assert classifier.score("Quarterly update", LATEST - timedelta(minutes=2), LATEST) == 0.25
+    assert classifier.score("ABC Receives FDA Approval", LATEST, LATEST) == 6.0
+    assert classifier.score("Merger of (NASDAQ: ABC) and $XYZ", LATEST, LATEST) == 6.0
+    assert classifier.score("Merger of [NYSE:ABC]", LATEST, LATEST) == 6.0
+
+
+def test_prioritize():
+    """ Ensures entries are ordered by score, ties keeping their order. """
+    classifier = HeadlineClassifier()
+    headline_data = [
+        HeadlineData("Routine update", "l0", LATEST),
+        HeadlineData("Another update", "l1", LATEST),
+        HeadlineData("(NYSE: ABC) to acquire XYZ", "l2", LATEST - timedelta(hours=1)),
+    ]
+    assert [hl_data.link for hl_data in classifier.prioritize(headline_data)] == \
+        ["l2", "l0", "l1"]
+    assert classifier.prioritize([]) == []
+
+
+def test_scrapper_fetch_order():
+    """ Ensures articles are fetched by the score of their headline. """
+    headlines = ["Routine update", "XYZ announces merger", "FDA approval for (NASDAQ: ABC)"]
+    requested_urls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if url == WEBSITE_URL + "/news":
+            articles = "".join(
+                f"""
+                <article>
+                    <a href="not_target">not_target</a>
+                    <a href="/news/l{i}">{headline}</a>
+                    <time>Jun 27, 2022 {i + 9}:00 AM UTC</time>
+                </article>
+                """
+                for i, headline in enumerate(headlines)
+            )
+            return httpx.Response(
+                200, content=f'<section class="market-news__results">{articles}</section>'.encode()
+            )
+        requested_urls.append(url)
+        return httpx.Response(200, content=b'<div class="mdc-article-body"></div>')
+
+    scrapper = AsyncTargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        max_concurrency=1,
+        headline_priority_config=HeadlinePriorityConfig(),
+        transport=httpx.MockTransport(handler)
+    )
+    assert len(scrapper.get_news()) == 3
+    assert requested_urls == [WEBSITE_URL + f"/news/l{i}" for i in (2, 1, 0)]
+    scrapper.close()
@@ -0,0 +1,153 @@
+""" Validates hedging of slow article fetches. """
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+import httpx
+import requests
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper
+from news_scanner.news_scrapper.async_target_news_scrapper import AsyncTargetNewsScrapper
+from news_scanner.news_scrapper.hedging import HedgeConfig, HedgeStats, RequestHedger
+
+WEBSITE_URL = "https://website"
+SLOW_LATENCY = 1.0
+
+
+def _warm_up(hedger: RequestHedger, latency: float = 0.01):
+    """ Records enough latencies for the hedger to start hedging. """
+    for _ in range(hedger.config.min_samples):
+        hedger.start_request()
+        hedger.record_latency(latency)
+
+
+def test_hedge_delay():
+    """ Ensures no hedging before min_samples, then the percentile delay. """
+    hedger = RequestHedger(HedgeConfig(percentile=90, min_samples=10, min_delay=0.0))
+    assert hedger.start_request() is None
+    for latency in range(1, 11):
+        hedger.record_latency(latency)
+    assert hedger.start_request() == 9
+
+    hedger = RequestHedger(HedgeConfig(min_samples=1, min_delay=0.5))
+    hedger.record_latency(0.1)
+    assert hedger.start_request() == 0.5
+
+
+def test_hedge_budget():
+    """ Ensures hedges are capped to max_hedge_ratio of the fetches. """
+    hedger = RequestHedger(HedgeConfig(max_hedge_ratio=0.1))
+    for _ in range(20):
+        hedger.start_request()
+    assert hedger.acquire_hedge()
+    assert hedger.acquire_hedge()
+    assert not hedger.acquire_hedge()
+    hedger.record_hedge_win()
+    assert hedger.stats() == HedgeStats(
+        num_requests=20, num_hedges=2, num_hedge_wins=1, hedge_ratio=0.1
+    )
+
+
+def test_get_hedged_page():
+    """ Ensures the fetch runs on the calling thread and a stuck fetch is
+    answered by its hedge through the proxy. """
+    news_scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="key",
+        hedge_config=HedgeConfig(min_samples=5, max_hedge_ratio=1.0, via_proxy=True)
+    )
+    _warm_up(news_scrapper.hedger)
+    direct_threads = []
+
+    def get_page(link, headers=None, proxy_on=None):
+        if not proxy_on:
+            direct_threads.append(threading.current_thread())
+            time.sleep(SLOW_LATENCY)
+            raise requests.ReadTimeout()
+        return MagicMock(status_code=200, content=b"proxy")
+    news_scrapper._get_page = get_page
+
+    assert news_scrapper._get_hedged_page(WEBSITE_URL + "/news/l_0").content == b"proxy"
+    assert direct_threads == [threading.current_thread()]
+    stats = news_scrapper.hedger.stats()
+    assert stats.num_hedges == 1
+    assert stats.num_hedge_wins == 1
+    news_scrapper.close()
+
+
+def test_get_hedged_page_fetch_wins():
+    """ Ensures a fetch answering before the delay is not hedged, and a slow
+    fetch answering is used over its hedge. """
+    news_scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="key",
+        hedge_config=HedgeConfig(min_samples=5, max_hedge_ratio=1.0, min_delay=0.05)
+    )
+    _warm_up(news_scrapper.hedger)
+    calls = []
+
+    def get_page(link, headers=None, proxy_on=None):
+        calls.append(threading.current_thread())
+        if len(calls) > 1:
+            time.sleep(0.2)
+        return MagicMock(status_code=200, content=b"page")
+    news_scrapper._get_page = get_page
+
+    assert news_scrapper._get_hedged_page(WEBSITE_URL + "/news/l_0").content == b"page"
+    assert news_scrapper.hedger.stats().num_hedges == 0
+    assert news_scrapper._get_hedged_page(WEBSITE_URL + "/news/l_1").content == b"page"
+    assert news_scrapper.hedger.stats().num_hedge_wins == 0
+    assert calls[:2] == [threading.current_thread()] * 2
+    news_scrapper.close()
+
+
+def test_get_hedged_page_over_budget():
+    """ Ensures a slow fetch is waited for once the hedge budget is spent. """
+    news_scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="key",
+        hedge_config=HedgeConfig(min_samples=5, max_hedge_ratio=0.0)
+    )
+    _warm_up(news_scrapper.hedger)
+    num_calls = []
+
+    def get_page(link, headers=None, proxy_on=None):
+        num_calls.append(link)
+        time.sleep(0.1)
+        return MagicMock(status_code=200, content=b"direct")
+    news_scrapper._get_page = get_page
+
+    assert news_scrapper._get_hedged_page(WEBSITE_URL + "/news/l_0").content == b"direct"
+    assert len(num_calls) == 1
+    assert news_scrapper.hedger.stats().num_hedges == 0
+    news_scrapper.close()
+
+
+def test_async_get_hedged_page():
+    """ Ensures the asyncio scrapper hedges a slow fetch and cancels the loser. """
+    num_requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        num_requests.append(request.url)
+        if len(num_requests) == 1:
+            await asyncio.sleep(SLOW_LATENCY)
+            return httpx.Response(200, content=b"slow")
+        return httpx.Response(200, content=b"fast")
+
+    news_scrapper = AsyncTargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="key",
+        transport=httpx.MockTransport(handler),
+        hedge_config=HedgeConfig(min_samples=5, max_hedge_ratio=1.0)
+    )
+    _warm_up(news_scrapper.hedger)
+
+    start = time.perf_counter()
+    page = news_scrapper._loop.run_until_complete(
+        news_scrapper._async_get_hedged_page(WEBSITE_URL + "/news/l_0")
+    )
+    assert page.content == b"fast"
+    assert time.perf_counter() - start < SLOW_LATENCY
+    assert len(num_requests) == 2
+    assert news_scrapper.hedger.stats().num_hedge_wins == 1
+    news_scrapper.close()
@@ -0,0 +1,105 @@
+""" Validates every html parser backend extracts the same data. """
+
+import pytest
+from news_scanner.news_scrapper import html_parser
+from news_scanner.news_scrapper.html_parser import (
+    HtmlParser,
+    IndexEntry,
+    PageStructureError,
+    SoupParser,
+    get_html_parser,
+    PARSER_BACKENDS
+)
+
+INDEX_PAGE = """
+    <html>
+        <nav><section class="menu"><article><a href="/x">x</a></article></section></nav>
+        <section class="market-news__results results">
+            <article>
+                <a href="not_target">not_target</a>
+                <a href="/news/l1">Ford &amp; GM <b>rally</b></a>
+                <time>
+                    Nov 9, 2021 2:03 AM UTC</time>
+            </article>
+            <article>
+                <a href="not_target"><img src="logo.png"></a>
+                <a href="/news/l0">Café chain (NASDAQ:CAFE) opens</a>
+                <time>Nov 8, 2021 11:59 PM UTC</time>
+            </article>
+        </section>
+    </html>
+""".encode()
+ARTICLE_PAGE = """
+    <html>
+        <body>
+            <p class="mdc-article-paragraph">outside the body</p>
+            <div class="mdc-article-body">
+                <p class="mdc-article-paragraph">First <a href="#">paragraph</a>.</p>
+                <p>no class</p>
+                <div><p class="mdc-article-paragraph lead">Nested — p&eacute;.</p></div>
+            </div>
+        </body>
+    </html>
+""".encode()
+
+
+@pytest.mark.parametrize("backend", list(PARSER_BACKENDS))
+def test_iter_index(backend):
+    """ Ensures index entries are extracted from the index section only. """
+    parser = get_html_parser(backend)
+    entries = list(parser.iter_index(INDEX_PAGE))
+    assert entries == [
+        IndexEntry(
+            href="/news/l1",
+            headline="Ford & GM rally",
+            time_text="\n                    Nov 9, 2021 2:03 AM UTC"
+        ),
+        IndexEntry(
+            href="/news/l0",
+            headline="Café chain (NASDAQ:CAFE) opens",
+            time_text="Nov 8, 2021 11:59 PM UTC"
+        ),
+    ]
+
+
+@pytest.mark.parametrize("backend", list(PARSER_BACKENDS))
+def test_parse_article(backend):
+    """ Ensures only classed paragraphs of the article body are extracted. """
+    parser = get_html_parser(backend)
+    assert parser.parse_article(ARTICLE_PAGE) == [
+        "First paragraph.",
+        "Nested — pé.",
+    ]
+
+
+@pytest.mark.parametrize("backend", list(PARSER_BACKENDS))
+def test_missing_section(backend):
+    """ Ensures pages lacking the scrapped section raise. """
+    parser = get_html_parser(backend)
+    with pytest.raises(PageStructureError):
+        list(parser.iter_index(b"<html><section></section></html>"))
+    with pytest.raises(PageStructureError):
+        parser.parse_article(b"<html><p>p</p></html>")
+
+
+def test_get_html_parser():
+    """ Ensures unknown backends raise and lxml falls back when missing. """
+    with pytest.raises(ValueError):
+        get_html_parser("unknown")
+
+    lxml = html_parser.lxml
+    html_parser.lxml = None
+    try:
+        assert isinstance(get_html_parser("lxml"), SoupParser)
+    finally:
+        html_parser.lxml = lxml
+
+
+def test_incomplete_backend():
+    """ Ensures a backend missing a method fails when created. """
+    class IndexOnlyParser(HtmlParser):
+        def iter_index(self, content):
+            return iter(())
+
+    with pytest.raises(TypeError):
+        IndexOnlyParser()
@@ -0,0 +1,135 @@
+""" Validates recording and replaying http responses. """
+
+import time
+import httpx
+import pytest
+import responses
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper
+from news_scanner.news_scrapper.multithreaded_target_news_scrapper import MultiThreadedTargetNewsScrapper
+from news_scanner.news_scrapper.async_target_news_scrapper import AsyncTargetNewsScrapper
+from news_scanner.news_scrapper.http_archive import (
+    HttpArchive,
+    HttpArchiveConfig,
+    ArchivedResponse,
+    RecordingAdapter,
+    RecordingTransport,
+    ReplayAdapter,
+    ReplayTransport,
+    get_archive_key,
+    open_http_archive,
+    RECORD
+)
+
+WEBSITE_URL = "https://website"
+INDEX_PAGE = b"""
+    <section class="market-news__results">
+        <article>
+            <a href="not_target">not_target</a>
+            <a href="/news/l1">h1</a>
+            <time>Nov 9, 2021 2:03 AM UTC</time>
+        </article>
+    </section>
+"""
+ARTICLE_PAGE = b"""
+    <div class="mdc-article-body"><p class="mdc-article-paragraph">p1</p></div>
+"""
+
+
+def _record_scan(tmp_path) -> HttpArchive:
+    """ Returns the archive of a scan recorded against mocked responses. """
+    archive = HttpArchive()
+    with responses.RequestsMock() as mock:
+        mock.get(url=WEBSITE_URL + "/news", body=INDEX_PAGE, headers={"ETag": "v1"})
+        mock.get(url=WEBSITE_URL + "/news/l1", body=ARTICLE_PAGE)
+        scrapper = TargetNewsScrapper(
+            website_url=WEBSITE_URL,
+            scrapper_api_key="scrapper_api_key",
+            adapter=RecordingAdapter(archive)
+        )
+        assert len(scrapper.get_news()) == 1
+        scrapper.close()
+    archive.save(tmp_path / "archive.json.gz")
+    return HttpArchive.load(tmp_path / "archive.json.gz")
+
+
+def test_record_and_replay(tmp_path):
+    """ Ensures a recorded scan replays the same results without the network. """
+    archive = _record_scan(tmp_path)
+    assert len(archive) == 2
+    assert archive.replay(WEBSITE_URL + "/news").headers["ETag"] == "v1"
+    archive.rewind()
+
+    for scrapper_class in [TargetNewsScrapper, MultiThreadedTargetNewsScrapper]:
+        scrapper = scrapper_class(
+            website_url=WEBSITE_URL,
+            scrapper_api_key="scrapper_api_key",
+            adapter=ReplayAdapter(archive, latency_scale=0)
+        )
+        results = scrapper.get_news()
+        assert [result.content for result in results] == ["p1 "]
+        scrapper.close()
+        archive.rewind()
+
+
+def test_replay_order_and_missing_url():
+    """ Ensures responses of a url replay in order, then the last repeats. """
+    archive = HttpArchive([
+        ArchivedResponse("url", 200, {}, b"first", 0.0),
+        ArchivedResponse("url", 304, {}, b"", 0.0),
+    ])
+    assert [archive.replay("url").status_code for _ in range(3)] == [200, 304, 304]
+    assert archive.replay("missing") is None
+
+
+def test_replay_latency():
+    """ Ensures recorded latency is scaled and slept on replay. """
+    archive = HttpArchive([ArchivedResponse(WEBSITE_URL, 200, {}, b"page", 0.2)])
+    adapter = ReplayAdapter(archive, latency_scale=0.5)
+    scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL, scrapper_api_key="key", adapter=adapter
+    )
+    start = time.perf_counter()
+    assert scrapper._get_page(WEBSITE_URL).content == b"page"
+    assert 0.1 <= time.perf_counter() - start < 0.2
+    assert scrapper._get_page(WEBSITE_URL + "/missing").status_code == 404
+    scrapper.close()
+
+
+def test_get_archive_key():
+    """ Ensures proxied requests are archived under their target url. """
+    assert get_archive_key(
+        "http://api.scraperapi.com/?api_key=secret&url=https%3A%2F%2Fwebsite%2Fnews"
+    ) == "https://website/news"
+    assert get_archive_key("https://website/news?page=2") == "https://website/news?page=2"
+    assert get_archive_key("https://website") == "https://website/"
+
+
+def test_async_record_and_replay():
+    """ Ensures the httpx transports record and replay the asyncio scrapper. """
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/news":
+            return httpx.Response(200, content=INDEX_PAGE)
+        return httpx.Response(200, content=ARTICLE_PAGE)
+
+    archive = HttpArchive()
+    for transport in [
+        RecordingTransport(archive, httpx.MockTransport(handler)),
+        ReplayTransport(archive, latency_scale=0)
+    ]:
+        scrapper = AsyncTargetNewsScrapper(
+            website_url=WEBSITE_URL,
+            scrapper_api_key="scrapper_api_key",
+            transport=transport
+        )
+        results = scrapper.get_news()
+        assert [result.content for result in results] == ["p1 "]
+        scrapper.close()
+    assert len(archive) == 2
+
+
+def test_open_http_archive(tmp_path):
+    """ Ensures unknown modes raise. """
+    archive, _, _ = open_http_archive(HttpArchiveConfig(tmp_path / "a", mode=RECORD))
+    assert len(archive) == 0
+    with pytest.raises(ValueError):
+        open_http_archive(HttpArchiveConfig(tmp_path / "a", mode="unknown"))
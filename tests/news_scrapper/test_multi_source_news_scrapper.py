@@ -0,0 +1,126 @@
+""" Validates scanning several news sources concurrently. """
+
+import responses
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper, ScrappedNewsResult
+from news_scanner.news_scrapper.multithreaded_target_news_scrapper import MultiThreadedTargetNewsScrapper
+from news_scanner.news_scrapper.html_parser import PageSelectors
+from news_scanner.news_scrapper.multi_source_news_scrapper import (
+    MultiSourceNewsScrapper,
+    NewsSource
+)
+
+SITE_A = NewsSource(name="a", website_url="https://site-a")
+SITE_B = NewsSource(
+    name="b",
+    website_url="https://site-b",
+    index_path="/press-releases",
+    selectors=PageSelectors(
+        index_section_class="releases",
+        article_body_class="release-body",
+        paragraph_class="release-text",
+        headline_link_position=0
+    ),
+    time_format="%Y-%m-%d %H:%M"
+)
+INDEX_A = b"""
+    <section class="market-news__results">
+        <article>
+            <a href="not_target">not_target</a>
+            <a href="/news/a1">a1</a>
+            <time>Nov 9, 2021 2:03 AM UTC</time>
+        </article>
+    </section>
+"""
+INDEX_B = b"""
+    <section class="releases wide">
+        <article>
+            <a href="https://cdn.site-b/b2">b2</a>
+            <time>2021-11-09 09:00</time>
+        </article>
+        <article>
+            <a href="/press-releases/b1">b1</a>
+            <time>2021-11-08 09:00</time>
+        </article>
+    </section>
+"""
+
+
+def _make_scrapper(source: NewsSource, scrapper_class=TargetNewsScrapper) -> TargetNewsScrapper:
+    return scrapper_class(
+        website_url=source.website_url,
+        scrapper_api_key="scrapper_api_key",
+        selectors=source.selectors,
+        index_path=source.index_path,
+        time_format=source.time_format
+    )
+
+
+def _mock_sites():
+    responses.get(url="https://site-a/news", body=INDEX_A)
+    responses.get(
+        url="https://site-a/news/a1",
+        body=b'<div class="mdc-article-body"><p class="mdc-article-paragraph">a1 body</p></div>'
+    )
+    responses.get(url="https://site-b/press-releases", body=INDEX_B)
+    for link in ["https://cdn.site-b/b2", "https://site-b/press-releases/b1"]:
+        responses.get(
+            url=link,
+            body=b'<div class="release-body"><p class="release-text">'
+                 + link.encode() + b'</p></div>'
+        )
+
+
+@responses.activate
+def test_get_news():
+    """ Ensures articles of every source are merged latest first, each source
+    tracking its own viewed links. """
+    _mock_sites()
+    scrapper = MultiSourceNewsScrapper({
+        SITE_A.name: _make_scrapper(SITE_A),
+        SITE_B.name: _make_scrapper(SITE_B, MultiThreadedTargetNewsScrapper),
+    })
+    results = scrapper.get_news()
+    assert [result.link for result in results] == [
+        "https://cdn.site-b/b2",
+        "https://site-a/news/a1",
+        "https://site-b/press-releases/b1",
+    ]
+    assert results[0].content == "https://cdn.site-b/b2 "
+    assert scrapper.index_changed
+    assert (scrapper.num_links_found, scrapper.num_new_links) == (3, 3)
+    assert list(scrapper.scrappers["a"].viewed_links) == ["https://site-a/news/a1"]
+
+    assert scrapper.get_news() == []
+    assert not scrapper.index_changed
+    scrapper.close()
+
+
+class FailingScrapper:
+    """ Scrapper whose scans raise, with the tracking attributes of one. """
+    index_changed = False
+    num_links_found = 0
+    num_new_links = 0
+    html_parser = None
+    rate_limiter = None
+
+    def iter_news(self):
+        raise ConnectionError("down")
+
+    def close(self):
+        pass
+
+
+class MockScrapper(FailingScrapper):
+    """ Scrapper yielding one article. """
+    def iter_news(self):
+        yield ScrappedNewsResult(link="l1")
+
+
+def test_iter_news_failing_source():
+    """ Ensures a failing source does not stop other sources. """
+    scrapper = MultiSourceNewsScrapper({
+        "mock": MockScrapper(),
+        "failing": FailingScrapper(),
+    })
+    assert [result.link for result in scrapper.iter_news()] == ["l1"]
+    scrapper.close()
@@ -2,6 +2,8 @@ from news_scanner.news_scrapper.multithreaded_target_news_scrapper import MultiT
 from news_scanner.news_scrapper.target_news_scrapper import ScrappedNewsResult
 from typing import List
 import datetime
+import threading
+import time
 from unittest.mock import patch
 import pytest
 
@@ -131,7 +133,117 @@ def test_get_news(new_content):
             assert result.link in scrapper.viewed_links
 
 
+def test_iter_news():
+    """ Ensures each new article is yielded once and tracked. """
+    global DATA_OFFSET
+    global RESULTS_TRACKER
+    DATA_OFFSET = 0
+    RESULTS_TRACKER = ResultsTracker()
+
+    scrapper = MultiThreadedTargetNewsScrapper(
+        website_url="website_url",
+        scrapper_api_key="scrapper_api_key",
+    )
+    with patch.object(scrapper, "_get_headline_data", new=generate_mock_headlines):
+        with patch.object(scrapper, "_get_article_content", new=create_mock_article_content):
+            results = list(scrapper.iter_news())
+
+    assert sorted(results) == sorted(RESULTS_TRACKER.results[0])
+    assert scrapper.num_new_links == len(results)
+    assert scrapper.num_links_found == len(results)
+    for result in results:
+        assert result.link in scrapper.viewed_links
+
+
+@pytest.mark.parametrize(
+    "num_links, max_threads, expected_num_threads",
+    [
+        (0, None, 5),
+        (3, None, 5),
+        (50, None, 5),
+        (12, 20, 5),
+        (50, 20, 10),
+        (200, 20, 20),
+    ]
+)
+def test_get_num_threads(num_links, max_threads, expected_num_threads):
+    """ Ensures bursts of new links grow the threads up to max_threads. """
+    scrapper = MultiThreadedTargetNewsScrapper(
+        website_url="website_url",
+        scrapper_api_key="scrapper_api_key",
+        num_threads=5,
+        max_threads=max_threads,
+        links_per_thread=5
+    )
+    assert scrapper._get_num_threads(num_links) == expected_num_threads
 
 
+def test_slow_article_does_not_block_others():
+    """ Ensures idle threads pull the remaining links while one is slow. """
+    global DATA_OFFSET
+    global RESULTS_TRACKER
+    DATA_OFFSET = 0
+    RESULTS_TRACKER = ResultsTracker()
+    slow_link = "l49"
+    release_slow_link = threading.Event()
 
+    def get_article_content(links):
+        if links[0] == slow_link:
+            assert release_slow_link.wait(timeout=5)
+        return create_mock_article_content(links)
 
+    scrapper = MultiThreadedTargetNewsScrapper(
+        website_url="website_url",
+        scrapper_api_key="scrapper_api_key",
+        num_threads=2
+    )
+    with patch.object(scrapper, "_get_headline_data", new=generate_mock_headlines):
+        with patch.object(scrapper, "_get_article_content", new=get_article_content):
+            results = []
+            for result in scrapper.iter_news():
+                results.append(result)
+                if len(results) == 49:
+                    release_slow_link.set()
+
+    assert len(results) == 50
+    assert results[-1].link == slow_link
+
+
+def test_sessions_bounded_across_resizes():
+    """ Ensures workers stopped after a burst close their session, so the
+    number of sessions stays bounded by max_threads. """
+    num_scans = [0]
+    burst_barrier = threading.Barrier(8)
+
+    def get_headline_data():
+        num_scans[0] += 1
+        num_links = 8 if num_scans[0] % 2 else 1
+        links = [f"l{num_scans[0]}_{i}" for i in range(num_links)]
+        publish_dates = [datetime.datetime(2022, 6, 27)] * num_links
+        return links, links, publish_dates
+
+    def get_article_content(links):
+        scrapper.session_pool.get_session()
+        if num_scans[0] % 2:
+            # every thread of a burst takes a link
+            burst_barrier.wait(timeout=5)
+        return create_mock_article_content(links)
+
+    scrapper = MultiThreadedTargetNewsScrapper(
+        website_url="website_url",
+        scrapper_api_key="scrapper_api_key",
+        num_threads=2,
+        max_threads=8,
+        links_per_thread=1
+    )
+    with patch.object(scrapper, "_get_headline_data", new=get_headline_data):
+        with patch.object(scrapper, "_get_article_content", new=get_article_content):
+            for _ in range(6):
+                assert len(scrapper.get_news()) in (1, 8)
+                for _ in range(50):
+                    if scrapper.session_pool.num_sessions <= 8:
+                        break
+                    time.sleep(0.1)
+                assert scrapper.session_pool.num_sessions <= 8
+    scrapper.close()
+    assert scrapper.session_pool.num_sessions == 0
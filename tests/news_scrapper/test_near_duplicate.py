@@ -0,0 +1,75 @@
+""" Validates near duplicate detection with SimHash fingerprints. """
+
+import datetime
+from news_scanner.news_scrapper.target_news_scrapper import ScrappedNewsResult
+from news_scanner.news_scrapper.near_duplicate import (
+    NearDuplicateConfig,
+    NearDuplicateIndex,
+    NearDuplicateStats,
+    simhash,
+    hamming_distance
+)
+
+RELEASE = (
+    "Acme Corp (NASDAQ:ABC) today announced record quarterly revenue of ten "
+    "million dollars, up forty percent from the same quarter last year. The "
+    "growth was driven by strong demand for its flagship widget product line "
+    "and the expansion of its distribution network across North America."
+)
+REPUBLISHED = "NEW YORK, June 27, 2022 -- " + RELEASE + " About Acme Corp."
+OTHER = (
+    "Widget Inc (NYSE:WID) said its board approved a share buyback of up to "
+    "fifty million dollars over the next two years, funded from cash on hand."
+)
+
+
+def _result(content: str, link: str) -> ScrappedNewsResult:
+    return ScrappedNewsResult(
+        headline="headline",
+        link=link,
+        publish_date=datetime.datetime(2022, 6, 27),
+        content=content
+    )
+
+
+def test_simhash():
+    """ Ensures similar texts have close fingerprints, unlike different ones. """
+    fingerprint = simhash(RELEASE)
+    assert fingerprint == simhash(RELEASE.upper())
+    assert 0 <= fingerprint < 2 ** 64
+    assert hamming_distance(fingerprint, simhash(REPUBLISHED)) < \
+        hamming_distance(fingerprint, simhash(OTHER))
+    assert hamming_distance(fingerprint, simhash(OTHER)) > 10
+    assert simhash("") is None
+    assert simhash("one") is not None
+
+
+def test_check():
+    """ Ensures near duplicates return the link of the first copy. """
+    index = NearDuplicateIndex(NearDuplicateConfig(max_distance=10))
+    assert index.check(RELEASE, "l1") is None
+    assert index.check(OTHER, "l2") is None
+    assert index.check(REPUBLISHED, "l3") == "l1"
+    assert index.check("", "l4") is None
+    assert index.stats() == NearDuplicateStats(num_checked=3, num_duplicates=1)
+
+
+def test_max_entries():
+    """ Ensures the oldest fingerprints are dropped past max_entries. """
+    index = NearDuplicateIndex(NearDuplicateConfig(max_distance=0, max_entries=1))
+    assert index.check(RELEASE, "l1") is None
+    assert index.check(OTHER, "l2") is None
+    assert index.check(RELEASE, "l3") is None
+    assert index.check(RELEASE, "l4") == "l3"
+
+
+def test_should_skip():
+    """ Ensures near duplicates are only skipped when configured to. """
+    index = NearDuplicateIndex(NearDuplicateConfig(max_distance=10))
+    assert not index.should_skip(_result(RELEASE, "l1"))
+    assert index.should_skip(_result(REPUBLISHED, "l2"))
+
+    index = NearDuplicateIndex(NearDuplicateConfig(max_distance=10, skip_duplicates=False))
+    assert not index.should_skip(_result(RELEASE, "l1"))
+    assert not index.should_skip(_result(REPUBLISHED, "l2"))
+    assert index.stats().num_duplicates == 1
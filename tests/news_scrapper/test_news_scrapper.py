@@ -1,4 +1,8 @@
+import pytest
+import responses
+from unittest.mock import patch
 from news_scanner.news_scrapper import target_news_scrapper as msns
+from news_scanner.news_scrapper.html_parser import PageStructureError
 
 
 def test_to_datetime():
@@ -14,3 +18,130 @@ def test_get_latest_link_index():
     links = ["linka", "linkb", "link1", "link2"]
     latest_index = msns._get_latest_link_index(links, viewed_links)
     assert latest_index is 2
+
+
+INDEX_PAGE = b"""
+    <html>
+        <section class="market-news__results">
+            <article>
+                <a href="not_target">not_target</a>
+                <a href="/news/l1">h1</a>
+                <time>Nov 9, 2021 2:03 AM UTC</time>
+            </article>
+        </section>
+    </html>
+"""
+
+
+def test_get_index_digest():
+    """ Ensures only the article list section of the index page is hashed. """
+    digest = msns._get_index_digest(INDEX_PAGE)
+    changed_outside_section = INDEX_PAGE.replace(b"<html>", b"<html><nav>ad</nav>")
+    changed_inside_section = INDEX_PAGE.replace(b"h1", b"h2")
+    assert msns._get_index_digest(changed_outside_section) == digest
+    assert msns._get_index_digest(changed_inside_section) != digest
+
+
+@responses.activate
+def test_get_headline_data_conditional_get():
+    """ Ensures validators are sent and a 304 skips parsing the index. """
+    website_url = "https://website"
+    responses.get(
+        url=website_url + "/news",
+        body=INDEX_PAGE,
+        headers={"ETag": "\"v1\""}
+    )
+    responses.get(url=website_url + "/news", status=304)
+    scrapper = msns.TargetNewsScrapper(
+        website_url=website_url,
+        scrapper_api_key="scrapper_api_key"
+    )
+
+    headlines, links, _ = scrapper._get_headline_data()
+    assert scrapper.index_changed
+    assert headlines == ["h1"]
+    assert links == [website_url + "/news/l1"]
+
+    assert scrapper._get_headline_data() == ([], [], [])
+    assert not scrapper.index_changed
+    assert "If-None-Match" not in responses.calls[0].request.headers
+    assert responses.calls[1].request.headers["If-None-Match"] == "\"v1\""
+
+
+@responses.activate
+def test_get_headline_data_unchanged_digest():
+    """ Ensures an identical index section is detected without validators. """
+    website_url = "https://website"
+    responses.get(url=website_url + "/news", body=INDEX_PAGE)
+    scrapper = msns.TargetNewsScrapper(
+        website_url=website_url,
+        scrapper_api_key="scrapper_api_key"
+    )
+
+    assert len(scrapper._get_headline_data()[0]) == 1
+    assert scrapper.index_changed
+    assert scrapper._get_headline_data() == ([], [], [])
+    assert not scrapper.index_changed
+
+
+@responses.activate
+def test_get_headline_data_parse_error():
+    """ Ensures an index page failing to parse is parsed again next scan,
+    its validators and digest are not stored. """
+    website_url = "https://website"
+    broken_page = INDEX_PAGE.replace(b"market-news__results", b"moved")
+    for _ in range(2):
+        responses.get(url=website_url + "/news", body=broken_page, headers={"ETag": "\"v1\""})
+    responses.get(url=website_url + "/news", body=INDEX_PAGE, headers={"ETag": "\"v2\""})
+    scrapper = msns.TargetNewsScrapper(
+        website_url=website_url,
+        scrapper_api_key="scrapper_api_key"
+    )
+
+    for _ in range(2):
+        with pytest.raises(PageStructureError):
+            scrapper._get_headline_data()
+    assert scrapper._get_headline_data()[0] == ["h1"]
+    assert "If-None-Match" not in responses.calls[1].request.headers
+    assert "If-None-Match" not in responses.calls[2].request.headers
+
+
+LONG_INDEX_PAGE = (
+    "<html><section class=\"market-news__results\">" + "".join(
+        "<article>"
+        "<a href=\"not_target\">not_target</a>"
+        f"<a href=\"/news/l{i}\">h{i}</a>"
+        f"<time>Nov 9, 2021 {i}:03 AM UTC</time>"
+        "</article>"
+        for i in reversed(range(1, 11))
+    ) + "</section></html>"
+).encode()
+
+
+@pytest.mark.parametrize(
+    "viewed_links, max_look_back, expected_links",
+    [
+        ([], None, [f"/news/l{i}" for i in reversed(range(1, 11))]),
+        (["/news/l7"], None, ["/news/l10", "/news/l9", "/news/l8"]),
+        ([], 2, ["/news/l10", "/news/l9"]),
+        (["/news/l9"], 5, ["/news/l10"]),
+    ]
+)
+def test_parse_headline_data_stops_early(viewed_links, max_look_back, expected_links):
+    """ Ensures the index is read up to the first viewed link or the look-back
+    cap and dates are only parsed for new entries. """
+    website_url = "https://website"
+    scrapper = msns.TargetNewsScrapper(
+        website_url=website_url,
+        scrapper_api_key="scrapper_api_key",
+        max_look_back=max_look_back
+    )
+    scrapper.viewed_links = [website_url + link for link in viewed_links]
+
+    with patch.object(msns, "_to_datetime_cst", wraps=msns._to_datetime_cst) as to_datetime:
+        headlines, links, publish_dates = scrapper._parse_headline_data(LONG_INDEX_PAGE)
+
+    assert links == [website_url + link for link in expected_links]
+    assert headlines == [link.replace("/news/l", "h") for link in expected_links]
+    assert to_datetime.call_count == len(expected_links)
+    assert publish_dates == sorted(publish_dates, reverse=True)
@@ -0,0 +1,114 @@
+""" Validates the on-disk page cache. """
+
+import responses
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper
+from news_scanner.news_scrapper.page_cache import (
+    PageCache,
+    PageCacheConfig,
+    PageCacheStats,
+    CachedPage
+)
+
+WEBSITE_URL = "https://website"
+
+
+def test_get_put(tmp_path, clock):
+    """ Ensures pages are served until their ttl and counted as hits or misses. """
+    cache = PageCache(PageCacheConfig(cache_dir=tmp_path), clock=clock)
+    assert cache.get("url", ttl=10) is None
+    cache.put("url", b"page" * 100)
+    clock.now = 10
+    assert cache.get("url", ttl=10) == b"page" * 100
+    clock.now = 11
+    assert cache.get("url", ttl=10) is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.num_pages) == (1, 2, 1)
+    assert 0 < stats.size_bytes < 400
+    cache.close()
+
+
+def test_content_addressed(tmp_path):
+    """ Ensures identical pages share a blob and replaced blobs are deleted. """
+    cache = PageCache(PageCacheConfig(cache_dir=tmp_path))
+    cache.put("url1", b"page")
+    cache.put("url2", b"page")
+    assert len(list((tmp_path / "blobs").iterdir())) == 1
+
+    cache.put("url1", b"new page")
+    cache.put("url2", b"new page")
+    assert len(list((tmp_path / "blobs").iterdir())) == 1
+    assert cache.get("url2", ttl=10) == b"new page"
+    cache.close()
+
+
+def test_lru_eviction(tmp_path, clock):
+    """ Ensures least recently read pages are evicted past max_bytes. """
+    config = PageCacheConfig(cache_dir=tmp_path, compression_level=0)
+    cache = PageCache(config, clock=clock)
+    for i in range(3):
+        clock.now = i
+        cache.put(f"url{i}", bytes([i]) * 100)
+    blob_size = cache.stats().size_bytes // 3
+    cache.close()
+
+    cache = PageCache(config._replace(max_bytes=blob_size * 3), clock=clock)
+    clock.now = 3
+    assert cache.get("url0", ttl=10) is not None
+    cache.put("url3", b"3" * 100)
+    assert cache.get("url1", ttl=10) is None
+    assert cache.get("url0", ttl=10) is not None
+    assert cache.stats().evictions == 1
+    assert cache.stats().num_pages == 3
+    cache.close()
+
+
+def test_unreadable_blob(tmp_path):
+    """ Ensures a corrupt blob is dropped and counted as a miss. """
+    cache = PageCache(PageCacheConfig(cache_dir=tmp_path))
+    cache.put("url", b"page")
+    for blob in (tmp_path / "blobs").iterdir():
+        blob.write_bytes(b"corrupt")
+    assert cache.get("url", ttl=10) is None
+    assert cache.stats() == PageCacheStats(misses=1)
+    cache.close()
+
+
+@responses.activate
+def test_scrapper_page_cache(tmp_path):
+    """ Ensures a restarted scrapper reads cached articles, not the network. """
+    link = WEBSITE_URL + "/news/l1"
+    responses.get(
+        url=link,
+        body=b"<div class=\"mdc-article-body\"><p class=\"mdc-article-paragraph\">p1</p></div>"
+    )
+    config = PageCacheConfig(cache_dir=tmp_path)
+    for _ in range(2):
+        scrapper = TargetNewsScrapper(
+            website_url=WEBSITE_URL,
+            scrapper_api_key="scrapper_api_key",
+            page_cache_config=config
+        )
+        assert scrapper._get_article_content([link]) == ["p1 "]
+        scrapper.close()
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_cached_index_keeps_validators(tmp_path):
+    """ Ensures serving the index page from the cache keeps its ETag. """
+    responses.get(url=WEBSITE_URL + "/news", body=b"index", headers={"ETag": "v1"})
+    scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        page_cache_config=PageCacheConfig(cache_dir=tmp_path)
+    )
+    page = scrapper._get_page_with_retries(scrapper.index_url)
+    assert scrapper._index_has_changed(page)
+    scrapper._store_index_page(page)
+    page = scrapper._get_page_with_retries(scrapper.index_url)
+    assert isinstance(page, CachedPage)
+    assert not scrapper._index_has_changed(page)
+    assert scrapper._get_index_request_headers() == {"If-None-Match": "v1"}
+    assert len(responses.calls) == 1
+    scrapper.close()
@@ -0,0 +1,107 @@
+""" Validates parsing article pages in worker processes. """
+
+import time
+import responses
+from news_scanner.news_scrapper.html_parser import PageSelectors, get_html_parser
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper
+from news_scanner.news_scrapper.parse_pool import (
+    ParsePool,
+    ParsePoolConfig,
+    _slice_article_region
+)
+
+ARTICLE_PAGE = b"""
+    <html>
+        <head><style>.mdc-article-body { margin: 0 }</style></head>
+        <body>
+            <nav><div class="menu"><a href="#">menu</a></div></nav>
+            <div class="mdc-article-body">
+                <p class="mdc-article-paragraph">p1</p>
+                <p class="mdc-article-paragraph">p2</p>
+            </div>
+        </body>
+    </html>
+"""
+
+
+def test_slice_article_region():
+    """ Ensures the page is cut at the div opening the article body. """
+    payload = _slice_article_region(ARTICLE_PAGE, PageSelectors())
+    assert payload.startswith(b"<div class=\"mdc-article-body\">")
+    assert _slice_article_region(b"<html><p>p</p></html>", PageSelectors()) == \
+        b"<html><p>p</p></html>"
+    for backend in ["html.parser", "lxml"]:
+        parser = get_html_parser(backend)
+        assert parser.parse_article(payload) == parser.parse_article(ARTICLE_PAGE)
+
+
+def test_parse_article():
+    """ Ensures workers parse pages and oversized pages are parsed in process. """
+    parse_pool = ParsePool(ParsePoolConfig(num_workers=2, max_payload_bytes=1000))
+    futures = [parse_pool.submit_article(ARTICLE_PAGE) for _ in range(4)]
+    assert [future.result() for future in futures] == [["p1", "p2"]] * 4
+    assert parse_pool.num_parsed_in_process == 0
+
+    large_page = ARTICLE_PAGE.replace(b"p2", b"p2" * 1000)
+    assert parse_pool.parse_article(large_page) == ["p1", "p2" * 1000]
+    assert parse_pool.num_parsed_in_process == 1
+    parse_pool.close()
+
+
+def test_parse_article_site_parser():
+    """ Ensures a shared pool parses pages with the parser of their site. """
+    parse_pool = ParsePool(ParsePoolConfig(num_workers=1))
+    parser = get_html_parser(
+        "html.parser", PageSelectors(article_body_class="body", paragraph_class="par")
+    )
+    page = b'<div class="body"><p class="par">q1</p></div>'
+    assert parse_pool.parse_article(page, parser) == ["q1"]
+    assert parse_pool.parse_article(ARTICLE_PAGE) == ["p1", "p2"]
+    parse_pool.close()
+
+
+def test_broken_pool_replaced():
+    """ Ensures pages are parsed in process when a worker dies and the broken
+    pool is replaced. """
+    parse_pool = ParsePool(ParsePoolConfig(num_workers=1))
+    assert parse_pool.parse_article(ARTICLE_PAGE) == ["p1", "p2"]
+    broken_executor = parse_pool._executor
+    for process in list(broken_executor._processes.values()):
+        process.kill()
+        process.join()
+
+    assert parse_pool.parse_article(ARTICLE_PAGE) == ["p1", "p2"]
+    for _ in range(100):
+        if parse_pool.num_restarts:
+            break
+        time.sleep(0.05)
+    assert parse_pool.num_restarts == 1
+    assert parse_pool._executor is not broken_executor
+    num_parsed_in_process = parse_pool.num_parsed_in_process
+    assert parse_pool.parse_article(ARTICLE_PAGE) == ["p1", "p2"]
+    assert parse_pool.num_parsed_in_process == num_parsed_in_process
+    parse_pool.close()
+
+
+def test_close_cancels_pending():
+    """ Ensures closing cancels the parses not started yet. """
+    parse_pool = ParsePool(ParsePoolConfig(num_workers=1))
+    futures = [parse_pool.submit_article(ARTICLE_PAGE) for _ in range(50)]
+    parse_pool.close()
+    assert all(future.done() for future in futures)
+    assert any(future.cancelled() for future in futures)
+    assert parse_pool._pending == set()
+
+
+@responses.activate
+def test_get_article_content():
+    """ Ensures a scrapper with a parse pool returns the same article body. """
+    link = "https://website/news/l1"
+    responses.get(url=link, body=ARTICLE_PAGE)
+    scrapper = TargetNewsScrapper(
+        website_url="https://website",
+        scrapper_api_key="scrapper_api_key",
+        parse_pool_config=ParsePoolConfig(num_workers=1)
+    )
+    assert scrapper._get_article_content([link]) == ["p1 p2 "]
+    scrapper.close()
@@ -0,0 +1,45 @@
+""" Validates the per host token bucket rate limiter. """
+
+import pytest
+from news_scanner.news_scrapper.rate_limiter import (
+    HostRateLimiter,
+    RateLimitConfig,
+    RateLimiterStats,
+    TokenBucket
+)
+
+
+def test_token_bucket_burst_then_rate(clock):
+    """ Ensures a burst is served at once and the rest at the sustained rate. """
+    bucket = TokenBucket(RateLimitConfig(rate=2.0, burst=3), clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    # refilled tokens pay back reservations before a new burst
+    clock.now = 10.0
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_host_rate_limiter_keys_per_host(clock):
+    """ Ensures each host, including the proxy, has its own bucket and config. """
+    rate_limiter = HostRateLimiter(
+        default_config=RateLimitConfig(rate=1.0, burst=1),
+        host_configs={"api.scraperapi.com": RateLimitConfig(rate=1.0, burst=2)},
+        clock=clock
+    )
+    assert rate_limiter.reserve("https://website/news/l1") == 0.0
+    assert rate_limiter.reserve("https://website/news/l2") == pytest.approx(1.0)
+    assert rate_limiter.reserve("http://api.scraperapi.com/") == 0.0
+    assert rate_limiter.reserve("http://api.scraperapi.com/") == 0.0
+    assert rate_limiter.reserve("http://api.scraperapi.com/") == pytest.approx(1.0)
+
+    assert rate_limiter.stats() == {
+        "website": RateLimiterStats(
+            num_requests=2, num_waited=1, total_wait=1.0, max_wait=1.0
+        ),
+        "api.scraperapi.com": RateLimiterStats(
+            num_requests=3, num_waited=1, total_wait=1.0, max_wait=1.0
+        ),
+    }
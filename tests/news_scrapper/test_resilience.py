@@ -0,0 +1,238 @@
+""" Validates retries, backoff and circuit breaking of fetches. """
+
+import httpx
+import pytest
+import requests
+import responses
+from news_scanner.news_scrapper.target_news_scrapper import (
+    TargetNewsScrapper,
+    HeadlineData
+)
+from news_scanner.news_scrapper.multithreaded_target_news_scrapper import MultiThreadedTargetNewsScrapper
+from news_scanner.news_scrapper.async_target_news_scrapper import AsyncTargetNewsScrapper
+from news_scanner.news_scrapper.resilience import (
+    ResilienceConfig,
+    CircuitBreaker,
+    CircuitOpenError,
+    TransientFetchError,
+    get_backoff_delay,
+    CLOSED,
+    OPEN,
+    HALF_OPEN
+)
+
+WEBSITE_URL = "https://website"
+NO_BACKOFF_CONFIG = ResilienceConfig(
+    max_retries=2, backoff_base=0.0, failure_threshold=3, max_scan_attempts=2
+)
+ARTICLE_PAGE = """
+    <div class="mdc-article-body">
+        <p class="mdc-article-paragraph">p1</p>
+    </div>
+"""
+
+
+@pytest.mark.parametrize(
+    "attempt, rand, expected",
+    [
+        (0, 1.0, 0.5),
+        (2, 1.0, 2.0),
+        (10, 1.0, 8.0),
+        (2, 0.5, 1.0),
+    ]
+)
+def test_get_backoff_delay(attempt, rand, expected):
+    """ Ensures backoff doubles per attempt, is capped and jittered. """
+    config = ResilienceConfig(backoff_base=0.5, backoff_max=8.0)
+    assert get_backoff_delay(attempt, config, rand=lambda: rand) == expected
+
+
+def test_circuit_breaker(clock):
+    """ Ensures the circuit opens, fails fast, then lets a trial through. """
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.now = 10.0
+    breaker.before_request()
+    assert breaker.state == HALF_OPEN
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 20.0
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+@responses.activate
+def test_get_page_with_retries():
+    """ Ensures transient statuses are retried until a response succeeds. """
+    url = WEBSITE_URL + "/news/l1"
+    responses.get(url=url, status=503)
+    responses.get(url=url, body=requests.ConnectionError("reset"))
+    responses.get(url=url, body=ARTICLE_PAGE)
+    scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        resilience_config=NO_BACKOFF_CONFIG
+    )
+    assert scrapper._get_article_content([url]) == ["p1 "]
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_get_page_with_retries_circuit_open():
+    """ Ensures a host failing repeatedly fails fast without requests. """
+    url = WEBSITE_URL + "/news/l1"
+    responses.get(url=url, status=503)
+    scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        resilience_config=NO_BACKOFF_CONFIG
+    )
+    with pytest.raises(TransientFetchError):
+        scrapper._get_page_with_retries(url)
+    assert len(responses.calls) == 3
+    with pytest.raises(CircuitOpenError):
+        scrapper._get_page_with_retries(url)
+    assert len(responses.calls) == 3
+
+
+def test_failed_fetch_attempted_next_scan():
+    """ Ensures an article failing transiently is not treated as viewed and is
+    attempted again next scan, until max_scan_attempts. """
+    scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        resilience_config=NO_BACKOFF_CONFIG
+    )
+    failed = HeadlineData(headline="h1", link="l1", publish_date=None)
+    scrapper.viewed_links.add("l0")
+
+    scrapper._mark_failed_fetch("l1")
+    assert scrapper._defer_failed_fetch(failed)
+    # l1 is older than the viewed l0 but still scrapped next scan
+    headline_data = scrapper._get_headline_data_to_scrape(
+        ["h2", "h0", "h1"], ["l2", "l0", "l1"], [None, None, None]
+    )
+    assert [hl_data.link for hl_data in headline_data] == ["l2", "l1"]
+
+    # given up on after max_scan_attempts
+    scrapper._mark_failed_fetch("l1")
+    assert not scrapper._defer_failed_fetch(failed)
+    headline_data = scrapper._get_headline_data_to_scrape(
+        ["h0"], ["l0"], [None]
+    )
+    assert headline_data == []
+
+
+INDEX_PAGE = """
+    <section class="market-news__results">
+        <article>
+            <a href="not_target">not_target</a>
+            <a href="/news/l0">h0</a>
+            <time>Jun 27, 2022 09:00 AM UTC</time>
+        </article>
+    </section>
+"""
+
+
+@pytest.mark.parametrize("scrapper_class", [TargetNewsScrapper, MultiThreadedTargetNewsScrapper])
+@responses.activate
+def test_failed_fetch_attempted_unchanged_index(scrapper_class):
+    """ Ensures an article failing transiently is attempted again next scan
+    while the index is unchanged. """
+    responses.get(url=WEBSITE_URL + "/news", body=INDEX_PAGE)
+    responses.get(url=WEBSITE_URL + "/news/l0", status=503)
+    responses.get(url=WEBSITE_URL + "/news/l0", body=ARTICLE_PAGE)
+    scrapper = scrapper_class(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        resilience_config=NO_BACKOFF_CONFIG._replace(max_retries=0, failure_threshold=10)
+    )
+    assert list(scrapper.iter_news()) == []
+    results = list(scrapper.iter_news())
+    assert not scrapper.index_changed
+    assert [result.link for result in results] == [WEBSITE_URL + "/news/l0"]
+    assert WEBSITE_URL + "/news/l0" in scrapper.viewed_links
+
+    # nothing left to attempt
+    assert list(scrapper.iter_news()) == []
+    assert len(responses.calls) == 5
+    scrapper.close()
+
+
+@pytest.mark.parametrize("scrapper_class", [TargetNewsScrapper, MultiThreadedTargetNewsScrapper])
+@responses.activate
+def test_index_circuit_open(scrapper_class):
+    """ Ensures failing articles opening the host's circuit make the next
+    scan's index fetch an unchanged index instead of an error. """
+    responses.get(url=WEBSITE_URL + "/news", body=INDEX_PAGE)
+    responses.get(url=WEBSITE_URL + "/news/l0", status=503)
+    scrapper = scrapper_class(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        resilience_config=NO_BACKOFF_CONFIG
+    )
+    assert list(scrapper.iter_news()) == []
+    assert len(responses.calls) == 4
+    assert list(scrapper.iter_news()) == []
+    assert not scrapper.index_changed
+    assert len(responses.calls) == 4
+    scrapper.close()
+
+
+def test_async_index_circuit_open():
+    """ Ensures the asyncio scrapper treats an index fetch failing on an open
+    circuit as an unchanged index. """
+    urls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        urls.append(str(request.url))
+        if str(request.url) == WEBSITE_URL + "/news":
+            return httpx.Response(200, content=INDEX_PAGE.encode())
+        return httpx.Response(503)
+
+    scrapper = AsyncTargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        resilience_config=NO_BACKOFF_CONFIG,
+        transport=httpx.MockTransport(handler)
+    )
+    assert scrapper.get_news() == []
+    assert scrapper.get_news() == []
+    assert not scrapper.index_changed
+    assert len(urls) == 4
+    scrapper.close()
+
+
+def test_async_failed_fetch_attempted_unchanged_index():
+    """ Ensures the asyncio scrapper attempts a failed article again while
+    the index is unchanged. """
+    num_article_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == WEBSITE_URL + "/news":
+            return httpx.Response(200, content=INDEX_PAGE.encode())
+        num_article_requests.append(str(request.url))
+        if len(num_article_requests) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, content=ARTICLE_PAGE.encode())
+
+    scrapper = AsyncTargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        resilience_config=NO_BACKOFF_CONFIG._replace(max_retries=0, failure_threshold=10),
+        transport=httpx.MockTransport(handler)
+    )
+    assert scrapper.get_news() == []
+    assert [result.headline for result in scrapper.get_news()] == ["h0"]
+    assert not scrapper.index_changed
+    assert scrapper.get_news() == []
+    assert len(num_article_requests) == 2
+    scrapper.close()
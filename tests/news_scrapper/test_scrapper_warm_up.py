@@ -0,0 +1,60 @@
+""" Validates warming up the connections of each scrapper. """
+
+import httpx
+import responses
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper, PROXY_URL
+from news_scanner.news_scrapper.multithreaded_target_news_scrapper import MultiThreadedTargetNewsScrapper
+from news_scanner.news_scrapper.async_target_news_scrapper import AsyncTargetNewsScrapper
+
+WEBSITE_URL = "https://website"
+
+
+@responses.activate
+def test_warm_up():
+    """ Ensures a warm up request is sent per worker session, to the proxy
+    when it is on. """
+    responses.head(url=WEBSITE_URL + "/news")
+    responses.head(url=PROXY_URL)
+    scrapper = TargetNewsScrapper(website_url=WEBSITE_URL, scrapper_api_key="key")
+    assert scrapper.warm_up() == 1
+    scrapper.close()
+
+    scrapper = MultiThreadedTargetNewsScrapper(
+        website_url=WEBSITE_URL, scrapper_api_key="key", num_threads=3, proxy_on=True
+    )
+    assert scrapper.warm_up() == 3
+    assert scrapper.session_pool.num_sessions == 3
+    assert [call.request.url for call in responses.calls] == \
+        [WEBSITE_URL + "/news"] + [PROXY_URL] * 3
+    scrapper.close()
+
+
+@responses.activate
+def test_warm_up_failure():
+    """ Ensures failed warm up requests are not counted nor raised. """
+    scrapper = TargetNewsScrapper(website_url=WEBSITE_URL, scrapper_api_key="key")
+    assert scrapper.warm_up() == 0
+    scrapper.close()
+
+
+def test_async_warm_up():
+    """ Ensures concurrent warm up requests are sent up to the pool size. """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            raise httpx.ConnectError("refused")
+        return httpx.Response(200)
+
+    scrapper = AsyncTargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="key",
+        max_concurrency=8,
+        pool_size=4,
+        transport=httpx.MockTransport(handler)
+    )
+    assert scrapper.warm_up() == 3
+    assert [(request.method, str(request.url)) for request in requests] == \
+        [("HEAD", WEBSITE_URL + "/news")] * 4
+    scrapper.close()
@@ -0,0 +1,110 @@
+""" Validates the persistent index of seen links. """
+
+import httpx
+from news_scanner.news_scrapper.seen_link_index import (
+    SeenLinkIndex,
+    SeenLinkIndexConfig,
+    SeenLinkIndexStats,
+    BloomFilter,
+    hash_link
+)
+from news_scanner.news_scrapper.seen_links import SeenLinkStore, SeenLinkConfig
+from news_scanner.news_scrapper.async_target_news_scrapper import AsyncTargetNewsScrapper
+from tests.news_scrapper.test_async_news_scrapper import MockNewsSite, WEBSITE_URL
+
+
+def test_bloom_filter():
+    """ Ensures added hashes are always found and few others are. """
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom_filter.add(hash_link(f"l{i}"))
+    assert all(hash_link(f"l{i}") in bloom_filter for i in range(1000))
+    num_false_positives = sum(hash_link(f"x{i}") in bloom_filter for i in range(10000))
+    assert num_false_positives < 300
+
+
+def test_index_persists(tmp_path, clock):
+    """ Ensures links are kept across reopening and pruned past their age. """
+    config = SeenLinkIndexConfig(index_dir=tmp_path, max_age=100, bloom_capacity=100)
+    index = SeenLinkIndex(config=config, clock=clock)
+    index.add("l0")
+    clock.now += 60
+    index.add("l1")
+    index.add("l1")
+    assert "l0" in index
+    assert "l2" not in index
+    assert len(index) == 2
+    index.close()
+
+    clock.now += 60
+    index = SeenLinkIndex(config=config, clock=clock)
+    assert "l0" not in index
+    assert "l1" in index
+    assert index.stats() == SeenLinkIndexStats(
+        num_links=1, num_lookups=2, num_bloom_skips=0, num_pruned=1
+    )
+    index.close()
+
+
+def test_store_index(tmp_path):
+    """ Ensures the store looks up links evicted from memory in the index. """
+    index = SeenLinkIndex(config=SeenLinkIndexConfig(index_dir=tmp_path))
+    store = SeenLinkStore(config=SeenLinkConfig(max_entries=1), index=index)
+    assert not store
+    store.add("l0")
+    store.add("l1")
+    assert list(store) == ["l1"]
+    assert "l0" in store
+
+    store = SeenLinkStore(index=index)
+    assert len(store) == 0
+    assert store
+    index.close()
+
+
+def test_scrapper_restart(tmp_path):
+    """ Ensures articles scrapped before a restart are not scrapped again. """
+    news_site = MockNewsSite(num_articles=5)
+    config = SeenLinkIndexConfig(index_dir=tmp_path, bloom_capacity=1000)
+
+    def get_scrapper() -> AsyncTargetNewsScrapper:
+        return AsyncTargetNewsScrapper(
+            website_url=WEBSITE_URL,
+            scrapper_api_key="scrapper_api_key",
+            seen_link_index_config=config,
+            transport=httpx.MockTransport(news_site)
+        )
+
+    scrapper = get_scrapper()
+    assert len(scrapper.get_news()) == 5
+    scrapper.close()
+
+    news_site.add_articles(1)
+    scrapper = get_scrapper()
+    assert [result.headline for result in scrapper.get_news()] == ["h5"]
+    assert scrapper.seen_link_index.stats().num_links == 6
+    scrapper.close()
+
+
+def test_bloom_filter_reload(tmp_path, clock):
+    """ Ensures the saved bloom filter is reloaded with the links added after
+    it was saved. """
+    config = SeenLinkIndexConfig(index_dir=tmp_path, bloom_capacity=100)
+    index = SeenLinkIndex(config=config, clock=clock)
+    index.add("l0")
+    index.close()
+
+    clock.now += 1
+    index = SeenLinkIndex(config=config, clock=clock)
+    index.add("l1")
+    # not closed, the bloom filter saved by the first close misses l1
+    index = SeenLinkIndex(config=config, clock=clock)
+    assert "l0" in index
+    assert "l1" in index
+    index.close()
+
+    index = SeenLinkIndex(config=config._replace(bloom_capacity=1000), clock=clock)
+    assert "l0" in index
+    assert "l1" in index
+    assert index.stats().num_bloom_skips == 0
+    index.close()
@@ -0,0 +1,48 @@
+""" Validates the bounded store of seen links. """
+
+from news_scanner.news_scrapper.seen_links import SeenLinkStore, SeenLinkConfig, SeenLinkStats
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper
+
+
+def test_max_entries():
+    """ Ensures the oldest links are evicted past the max number of entries. """
+    store = SeenLinkStore(config=SeenLinkConfig(max_entries=3, max_age=None))
+    for i in range(5):
+        store.add(f"l{i}")
+    store.add("l4")
+    assert list(store) == ["l2", "l3", "l4"]
+    assert "l1" not in store
+    assert "l2" in store
+    assert store.stats() == SeenLinkStats(num_entries=3, num_added=5, num_evicted=2)
+
+
+def test_max_age(clock):
+    """ Ensures links are evicted once older than the max age, a link seen
+    again keeping its first time. """
+    store = SeenLinkStore(config=SeenLinkConfig(max_entries=None, max_age=10), clock=clock)
+    store.add("l0")
+    clock.now = 6
+    store.add("l1")
+    store.add("l0")
+    clock.now = 10
+    assert "l0" not in store
+    assert len(store) == 1
+    clock.now = 16
+    assert list(store) == []
+    assert store.stats() == SeenLinkStats(num_entries=0, num_added=2, num_expired=2)
+
+    store.add("l0")
+    store.clear()
+    assert len(store) == 0
+
+
+def test_scrapper_seen_link_config():
+    scrapper = TargetNewsScrapper(
+        website_url="https://website",
+        scrapper_api_key="scrapper_api_key",
+        seen_link_config=SeenLinkConfig(max_entries=1)
+    )
+    scrapper.viewed_links.add("l0")
+    scrapper.viewed_links.add("l1")
+    assert list(scrapper.viewed_links) == ["l1"]
+    scrapper.close()
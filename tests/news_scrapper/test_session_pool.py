@@ -0,0 +1,52 @@
+""" Validates the keep-alive 'SessionPool'. """
+
+import threading
+from news_scanner.news_scrapper.session_pool import SessionPool
+
+
+def test_get_session_reused_per_thread():
+    """ Ensures a thread reuses its session and other threads get their own. """
+    session_pool = SessionPool(pool_size=3)
+    session = session_pool.get_session()
+    assert session_pool.get_session() is session
+
+    other_sessions = []
+    thread = threading.Thread(
+        target=lambda: other_sessions.append(session_pool.get_session())
+    )
+    thread.start()
+    thread.join()
+    assert other_sessions[0] is not session
+    assert session_pool.num_sessions == 2
+
+
+def test_session_adapter_pool_size():
+    """ Ensures sessions mount adapters with the configured pool size. """
+    session_pool = SessionPool(pool_size=7)
+    adapter = session_pool.get_session().get_adapter("https://website")
+    assert adapter._pool_maxsize == 7
+
+
+def test_close():
+    """ Ensures closing the pool drops its sessions. """
+    session_pool = SessionPool()
+    session = session_pool.get_session()
+    session_pool.close()
+    assert session_pool.num_sessions == 0
+    assert session_pool.get_session() is not session
+
+
+def test_release_session():
+    """ Ensures releasing drops only the calling thread's session. """
+    session_pool = SessionPool()
+    session = session_pool.get_session()
+    thread = threading.Thread(target=lambda: (
+        session_pool.get_session(), session_pool.release_session()
+    ))
+    thread.start()
+    thread.join()
+    assert session_pool.num_sessions == 1
+    session_pool.release_session()
+    session_pool.release_session()
+    assert session_pool.num_sessions == 0
+    assert session_pool.get_session() is not session
@@ -0,0 +1,78 @@
+""" Validates the long-lived 'WorkerPool'. """
+
+import threading
+import pytest
+from news_scanner.news_scrapper.worker_pool import WorkerPool, WorkerPoolStats
+
+
+def test_submit_reuses_workers():
+    """ Ensures tasks of several rounds run on the same worker threads. """
+    worker_pool = WorkerPool(num_workers=3)
+    thread_names = set()
+    lock = threading.Lock()
+
+    def task(done: threading.Semaphore):
+        with lock:
+            thread_names.add(threading.current_thread().name)
+        done.release()
+
+    for _ in range(3):
+        done = threading.Semaphore(0)
+        for _ in range(10):
+            worker_pool.submit(task, done)
+        for _ in range(10):
+            assert done.acquire(timeout=5)
+    worker_pool.shutdown()
+    assert thread_names <= {"worker0", "worker1", "worker2"}
+    assert worker_pool.stats().tasks_completed == 30
+
+
+def test_stats():
+    """ Ensures busy workers and queue depth are reported. """
+    worker_pool = WorkerPool(num_workers=2)
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def task():
+        started.release()
+        release.wait(timeout=5)
+
+    for _ in range(5):
+        worker_pool.submit(task)
+    started.acquire(timeout=5)
+    started.acquire(timeout=5)
+    assert worker_pool.stats() == WorkerPoolStats(
+        num_workers=2, busy_workers=2, queue_depth=3, tasks_completed=0
+    )
+    release.set()
+    worker_pool.shutdown()
+    assert worker_pool.stats() == WorkerPoolStats(
+        num_workers=0, busy_workers=0, queue_depth=0, tasks_completed=5
+    )
+
+
+def test_resize():
+    """ Ensures workers can be added and removed. """
+    worker_pool = WorkerPool(num_workers=1)
+    worker_pool.resize(4)
+    assert worker_pool.stats().num_workers == 4
+    worker_pool.resize(2)
+    assert worker_pool.stats().num_workers == 2
+    worker_pool.shutdown()
+    assert worker_pool.stats().num_workers == 0
+
+
+def test_task_error_does_not_stop_worker():
+    """ Ensures a failing task is logged and the worker keeps running. """
+    worker_pool = WorkerPool(num_workers=1)
+    done = threading.Event()
+
+    def failing_task():
+        raise ValueError("failed")
+
+    worker_pool.submit(failing_task)
+    worker_pool.submit(done.set)
+    assert done.wait(timeout=5)
+    worker_pool.shutdown()
+    with pytest.raises(RuntimeError):
+        worker_pool.submit(done.set)
@@ -0,0 +1,104 @@
+""" Validates the 'StreamingNewsPipeline' stages. """
+
+import threading
+import datetime
+from unittest.mock import MagicMock
+import pytest
+from news_scanner.news_pipeline import StreamingNewsPipeline
+from news_scanner.news_scrapper.target_news_scrapper import ScrappedNewsResult
+from news_scanner.news_scrapper.filter.article_filter import ArticleFilter, FilterCriteria
+from news_scanner.news_scrapper.near_duplicate import NearDuplicateConfig, NearDuplicateIndex
+from news_scanner.td_api.td_api_handle import StockData
+
+
+class MockScrapper:
+    """ Yields articles, pausing before the last one until released. """
+    def __init__(self, contents):
+        self.contents = contents
+        self.release_last = threading.Event()
+
+    def iter_news(self):
+        for i, content in enumerate(self.contents):
+            if i == len(self.contents) - 1:
+                assert self.release_last.wait(timeout=5)
+            yield ScrappedNewsResult(
+                headline=f"h{i}",
+                link=f"l{i}",
+                publish_date=datetime.datetime(2022, 6, 27),
+                content=content
+            )
+
+
+def mock_get_stock_data(tickers):
+    return {
+        ticker: StockData(market_cap=1, shares_outstanding=1, last_price=100 if ticker == "BIG" else 1)
+        for ticker in tickers
+    }
+
+
+def test_run():
+    """ Ensures reports are published before the scrapper is done. """
+    news_scrapper = MockScrapper([
+        "a (NASDAQ:ABC) b",
+        "no ticker",
+        "a (NYSE:BIG) b",
+        "a (NASDAQ:XYZ) b",
+    ])
+    published = []
+
+    def publish(news_report):
+        published.append(news_report)
+        # first accepted article is out while the last one is still pending
+        news_scrapper.release_last.set()
+
+    pipeline = StreamingNewsPipeline(
+        news_scrapper=news_scrapper,
+        td_api=MagicMock(get_stock_data=mock_get_stock_data),
+        article_filter=ArticleFilter(FilterCriteria(last_price=20)),
+        publish=publish,
+        queue_size=1
+    )
+    news_results, news_reports = pipeline.run()
+
+    assert len(news_results) == 4
+    assert [report.nameData.ticker for report in news_reports] == ["ABC", "XYZ"]
+    assert news_reports == published
+    assert pipeline.num_processed == 3
+
+
+def test_run_stage_error():
+    """ Ensures an error raised by a stage is re-raised without blocking. """
+    news_scrapper = MockScrapper(["a (NASDAQ:ABC) b"] * 20)
+    news_scrapper.release_last.set()
+    pipeline = StreamingNewsPipeline(
+        news_scrapper=news_scrapper,
+        td_api=MagicMock(get_stock_data=MagicMock(side_effect=KeyError("td"))),
+        article_filter=ArticleFilter(),
+        publish=lambda news_report: None,
+        queue_size=1
+    )
+    with pytest.raises(KeyError):
+        pipeline.run()
+
+
+def test_run_near_duplicates():
+    """ Ensures near duplicates are skipped before the stock lookup. """
+    release = ("Acme Corp (NASDAQ:ABC) announced record quarterly revenue of "
+               "ten million dollars, up forty percent from last year, driven "
+               "by strong demand for its flagship widget product line.")
+    news_scrapper = MockScrapper([release, "NEW YORK -- " + release])
+    news_scrapper.release_last.set()
+    get_stock_data = MagicMock(side_effect=mock_get_stock_data)
+    pipeline = StreamingNewsPipeline(
+        news_scrapper=news_scrapper,
+        td_api=MagicMock(get_stock_data=get_stock_data),
+        article_filter=ArticleFilter(),
+        publish=lambda news_report: None,
+        near_duplicate_index=NearDuplicateIndex(NearDuplicateConfig(max_distance=10))
+    )
+    news_results, news_reports = pipeline.run()
+
+    assert len(news_results) == 2
+    assert [report.scrappedNewsResults.link for report in news_reports] == ["l0"]
+    assert get_stock_data.call_count == 1
+    assert pipeline.num_processed == 1
@@ -0,0 +1,61 @@
+""" Validates running the 'NewsScanner' with warm ups and several sources. """
+
+import socket
+from unittest.mock import MagicMock, patch
+from news_scanner.news_scanner import NewsScanner
+from news_scanner.warm_up import WarmUpConfig
+from news_scanner.news_scrapper.hedging import HedgeConfig
+from news_scanner.news_scrapper.parse_pool import ParsePoolConfig
+from news_scanner.news_scrapper.multi_source_news_scrapper import NewsSource
+
+
+@patch("news_scanner.news_scanner.TDApiHandle")
+def test_run_warm_up_unpaced(_):
+    """ Ensures warm ups due run between unpaced scans, and the dns cache is
+    only installed while running. """
+    getaddrinfo = socket.getaddrinfo
+    scanner = NewsScanner(
+        config=MagicMock(website_url="https://website", scrapper_api_key="key"),
+        warm_up_config=WarmUpConfig(),
+        keep_alive=3
+    )
+    assert socket.getaddrinfo == getaddrinfo
+
+    installed = []
+    scanner.scan_news = lambda: installed.append(socket.getaddrinfo == scanner.dns_cache.getaddrinfo)
+    scanner.warm_up = MagicMock()
+    scanner.warm_up_schedule = MagicMock()
+    scanner.warm_up_schedule.is_due.side_effect = [False, True, False]
+    scanner.run()
+    assert installed == [True] * 3
+    scanner.warm_up.assert_called_once()
+    assert socket.getaddrinfo == getaddrinfo
+
+
+@patch("news_scanner.news_scanner.TDApiHandle")
+def test_sources_share_pools(_):
+    """ Ensures every source scrapes with one parse pool and hedge executor,
+    closed by the scanner rather than the scrappers. """
+    scanner = NewsScanner(
+        config=MagicMock(website_url="https://website", scrapper_api_key="key"),
+        news_sources=[
+            NewsSource(name="a", website_url="https://a"),
+            NewsSource(name="b", website_url="https://b")
+        ],
+        parse_pool_config=ParsePoolConfig(num_workers=1),
+        hedge_config=HedgeConfig(),
+        multithreaded_on=True,
+        keep_alive=1
+    )
+    scrappers = list(scanner.scrappers.values())
+    assert scrappers[0].parse_pool is scrappers[1].parse_pool is scanner.parse_pool
+    assert scrappers[0]._get_hedge_executor() is scrappers[1]._get_hedge_executor() \
+        is scanner.hedge_executor
+
+    scrappers[0].close()
+    assert scanner.parse_pool.parse_article(
+        b'<div class="mdc-article-body"><p class="mdc-article-paragraph">p1</p></div>'
+    ) == ["p1"]
+    scanner.scan_news = MagicMock()
+    scanner.run()
+    assert scanner.hedge_executor._shutdown
@@ -0,0 +1,70 @@
+""" Validates pacing of scans by market session and new article rate. """
+
+from datetime import datetime
+import pytest
+from news_scanner.poll_scheduler import (
+    PollScheduler,
+    PollScheduleConfig,
+    PRE_MARKET,
+    REGULAR,
+    AFTER_HOURS,
+    OVERNIGHT,
+    WEEKEND,
+    ZoneInfo
+)
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+@pytest.mark.parametrize("now, expected_session", [
+    (datetime(2022, 6, 27, 3, 59, tzinfo=NEW_YORK), OVERNIGHT),
+    (datetime(2022, 6, 27, 4, 0, tzinfo=NEW_YORK), PRE_MARKET),
+    (datetime(2022, 6, 27, 9, 30, tzinfo=NEW_YORK), REGULAR),
+    (datetime(2022, 6, 27, 16, 0, tzinfo=NEW_YORK), AFTER_HOURS),
+    (datetime(2022, 6, 27, 20, 0, tzinfo=NEW_YORK), OVERNIGHT),
+    (datetime(2022, 6, 25, 12, 0, tzinfo=NEW_YORK), WEEKEND),
+    # 13:45 utc is 9:45 in new york during daylight saving time
+    (datetime(2022, 6, 27, 13, 45, tzinfo=ZoneInfo("UTC")), REGULAR),
+])
+def test_get_session(now, expected_session):
+    assert PollScheduler().get_session(now) == expected_session
+
+
+def test_next_interval_session(clock):
+    """ Ensures the base interval of the current session is used without new
+    articles. """
+    clock.set(datetime(2022, 6, 25, 12, 0, tzinfo=NEW_YORK))
+    scheduler = PollScheduler(clock=clock)
+    interval = scheduler.next_interval()
+    assert (interval.seconds, interval.session) == (600.0, WEEKEND)
+    assert interval.reason == "weekend interval"
+
+    scheduler = PollScheduler(PollScheduleConfig(max_interval=100), clock=clock)
+    assert scheduler.next_interval().seconds == 100
+    assert scheduler.next_interval().reason == "weekend interval, lowered to max interval"
+
+
+def test_next_interval_rate(clock):
+    """ Ensures a high new article rate shortens the interval, without
+    counting the first scan's backlog or scans outside the rate window. """
+    clock.set(datetime(2022, 6, 27, 10, 0, tzinfo=NEW_YORK))
+    config = PollScheduleConfig(rate_window=600, target_new_per_scan=2)
+    scheduler = PollScheduler(config, clock=clock)
+    scheduler.record_scan(50)
+    assert scheduler.next_interval().seconds == 20.0
+
+    scheduler.record_scan(30)
+    clock.now += 60
+    scheduler.record_scan(45)
+    interval = scheduler.next_interval()
+    assert interval.seconds == 16.0
+    assert interval.reason == "7.50 new articles/min"
+
+    scheduler.record_scan(600)
+    interval = scheduler.next_interval()
+    assert interval.seconds == 5.0
+    assert interval.reason.endswith("raised to min interval")
+
+    clock.now += 601
+    assert scheduler.get_new_article_rate() == 0
+    assert scheduler.next_interval().seconds == 20.0
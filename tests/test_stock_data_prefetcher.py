@@ -0,0 +1,121 @@
+""" Validates prefetching stock data of the tickers named in headlines. """
+
+import datetime
+import threading
+from unittest.mock import MagicMock
+import responses
+from news_scanner.stock_data_prefetcher import (
+    StockDataPrefetcher,
+    StockDataPrefetchConfig,
+    StockDataPrefetchStats
+)
+from news_scanner.news_scrapper.article_processor import find_headline_tickers
+from news_scanner.news_scrapper.target_news_scrapper import TargetNewsScrapper, HeadlineData
+from news_scanner.td_api.td_api_handle import StockData
+
+PUBLISH_DATE = datetime.datetime(2022, 6, 27)
+WEBSITE_URL = "https://website"
+INDEX_PAGE = b"""
+    <section class="market-news__results">
+        <article>
+            <a href="not_target">not_target</a>
+            <a href="/news/l0">(NASDAQ: ABC) merger</a>
+            <time>Jun 27, 2022 09:00 AM UTC</time>
+        </article>
+    </section>
+"""
+
+
+def mock_get_stock_data(tickers):
+    return {ticker: StockData(market_cap=len(ticker)) for ticker in tickers}
+
+
+def test_find_headline_tickers():
+    assert find_headline_tickers("ABC Receives FDA Approval (NASDAQ: ABC)") == ["ABC"]
+    assert find_headline_tickers("[NYSE:XYZ] to acquire (NASDAQ:ABC), (NASDAQ:ABC)") == \
+        ["XYZ", "ABC"]
+    assert find_headline_tickers("(OTC: ABC) update") == []
+
+
+def test_prefetch(clock):
+    """ Ensures headline tickers are requested once ahead of their lookup,
+    and other tickers are requested on lookup. """
+    td_api = MagicMock()
+    requested = threading.Event()
+
+    def get_stock_data(tickers):
+        requested.set()
+        return mock_get_stock_data(tickers)
+
+    td_api.get_stock_data.side_effect = get_stock_data
+    prefetcher = StockDataPrefetcher(
+        td_api=td_api, config=StockDataPrefetchConfig(max_age=10), clock=clock
+    )
+    prefetcher.prefetch([
+        HeadlineData("(NASDAQ: ABC) merger", "l0", PUBLISH_DATE),
+        HeadlineData("Routine update", "l1", PUBLISH_DATE),
+        HeadlineData("(NYSE: XY) and (NASDAQ: ABC)", "l2", PUBLISH_DATE),
+    ])
+    assert requested.wait(timeout=5)
+    prefetcher.prefetch([HeadlineData("(NASDAQ: ABC) merger", "l0", PUBLISH_DATE)])
+
+    assert prefetcher.get_stock_data(["ABC", "QQQQ"]) == {
+        "ABC": StockData(market_cap=3), "QQQQ": StockData(market_cap=4)
+    }
+    assert [call.args for call in td_api.get_stock_data.call_args_list] == \
+        [(["ABC", "XY"],), (["QQQQ"],)]
+    assert prefetcher.stats() == StockDataPrefetchStats(num_prefetched=2, hits=1, misses=1)
+
+    # prefetches older than the max age are requested again
+    clock.now = 11
+    prefetcher.get_stock_data(["XY"])
+    assert td_api.get_stock_data.call_args.args == (["XY"],)
+    prefetcher.close()
+
+
+def test_prefetch_error():
+    """ Ensures a failed prefetch falls back to requesting the ticker. """
+    td_api = MagicMock()
+    td_api.get_stock_data.side_effect = [AssertionError("bad status"), mock_get_stock_data(["ABC"])]
+    prefetcher = StockDataPrefetcher(td_api=td_api)
+    prefetcher.prefetch([HeadlineData("(NASDAQ: ABC) merger", "l0", PUBLISH_DATE)])
+    assert prefetcher.get_stock_data(["ABC"]) == {"ABC": StockData(market_cap=3)}
+    assert prefetcher.stats().misses == 1
+    prefetcher.close()
+
+
+@responses.activate
+def test_scrapper_on_new_headlines():
+    """ Ensures the new entries of a scan are passed on before their articles
+    are fetched. """
+    responses.get(url=WEBSITE_URL + "/news", body=INDEX_PAGE)
+    num_fetched = []
+
+    def on_new_headlines(headline_data):
+        num_fetched.append(len(responses.calls))
+        assert [hl_data.headline for hl_data in headline_data] == ["(NASDAQ: ABC) merger"]
+
+    scrapper = TargetNewsScrapper(
+        website_url=WEBSITE_URL,
+        scrapper_api_key="scrapper_api_key",
+        on_new_headlines=on_new_headlines
+    )
+    responses.get(url=WEBSITE_URL + "/news/l0", body=b"")
+    assert len(scrapper.get_news()) == 1
+    assert num_fetched == [1]
+    scrapper.close()
+
+
+def test_close_cancels_pending():
+    """ Ensures closing drops prefetches not started yet. """
+    release = threading.Event()
+    td_api = MagicMock()
+    td_api.get_stock_data.side_effect = lambda tickers: release.wait(timeout=5) and {}
+    prefetcher = StockDataPrefetcher(td_api=td_api, config=StockDataPrefetchConfig(max_workers=1))
+    prefetcher.prefetch([HeadlineData("(NASDAQ: ABC) merger", "l0", PUBLISH_DATE)])
+    prefetcher.prefetch([HeadlineData("(NASDAQ: XYZ) merger", "l1", PUBLISH_DATE)])
+    pending = prefetcher._prefetched["XYZ"][1]
+    prefetcher.close()
+    release.set()
+    assert pending.cancelled()
+    assert td_api.get_stock_data.call_count <= 1
@@ -0,0 +1,23 @@
+""" Validates the schedule of connection warm ups. """
+
+from datetime import datetime, time as day_time
+from news_scanner.warm_up import WarmUpSchedule, ZoneInfo
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def test_is_due(clock):
+    """ Ensures a warm up is due once per passed weekday warm up time. """
+    clock.set(datetime(2022, 6, 24, 9, 0, tzinfo=NEW_YORK))
+    schedule = WarmUpSchedule((day_time(9, 25),), clock=clock)
+    assert not schedule.is_due()
+    clock.set(datetime(2022, 6, 24, 9, 25, tzinfo=NEW_YORK))
+    assert schedule.is_due()
+    assert not schedule.is_due()
+
+    # saturday and sunday are skipped
+    clock.set(datetime(2022, 6, 27, 9, 0, tzinfo=NEW_YORK))
+    assert not schedule.is_due()
+    # a long wait passing the time still warms up
+    clock.set(datetime(2022, 6, 28, 12, 0, tzinfo=NEW_YORK))
+    assert schedule.is_due()